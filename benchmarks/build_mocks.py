@@ -0,0 +1,238 @@
+"""
+Pulumi mocks for the module build benchmarks.
+
+Every resource registration and invoke is counted, and answered with just enough plausible data for a module to go
+through its ``build`` the way it would against a real SysEnv.
+"""
+import base64
+import hashlib
+import json
+import uuid
+from collections import Counter
+from typing import Callable
+
+from pulumi.runtime import Mocks, MockCallArgs, MockResourceArgs
+
+from build_scenarios import SCALED_BUCKETS, SCALED_CLUSTERS, SCALED_QUEUES, SCALED_STREAMS, SYSENV_DIR
+
+ACCOUNT_ID = "123456789012"
+REGION = "us-west-2"
+AVAILABILITY_ZONES = [f"{REGION}{zone}" for zone in "abc"]
+SUBNET_PURPOSES = {"public": True, "private": False, "pods": False}
+"""Subnets returned for every VPC, one per availability zone: purpose -> whether the subnet is public"""
+
+TAG_PREFIX = "oh:"
+"""Tag prefix of the benchmark SysEnv (``tag_namespace`` in ``sysenvs/Thunder.common.yaml``)"""
+
+
+def _get_cluster_exports(name: str, index: int) -> dict:
+    return {
+        "name": name,
+        "endpoint": f"https://{name}.k8s.benchmark:6443",
+        "service_cidr": f"10.{100 + index}.0.0/21",
+        "coredns_clusterip": f"10.{100 + index}.0.10",
+        "cluster_domain": f"{name}.oh",
+        "bootstrap_role_arn": f"arn:aws:iam::{ACCOUNT_ID}:role/{name}-bootstrap",
+        "admin_kubeconfig": "",
+        "is_admin_cert_expired": False,
+        "iam_kubeconfig": "",
+    }
+
+
+STACK_OUTPUTS = {
+    "seed": {"seed": "benchmark-seed"},
+    # clusters without a name are named after their SysEnv
+    "s3": [{"friendly_name": name, "bucket": f"oh-benchmark-{name}"} for name in SCALED_BUCKETS],
+    "kinesis": {
+        "streams": [
+            {"name": name, "arn": f"arn:aws:kinesis:{REGION}:{ACCOUNT_ID}:stream/{name}"} for name in SCALED_STREAMS
+        ]
+    },
+    "sqs": {"queues": [{"name": name, "arn": f"arn:aws:sqs:{REGION}:{ACCOUNT_ID}:{name}"} for name in SCALED_QUEUES]},
+    "k8s-controllers": [_get_cluster_exports(name, i) for i, name in enumerate([SYSENV_DIR.name, *SCALED_CLUSTERS])],
+}
+"""Outputs of the stacks that modules reference with ``get_stack_output``"""
+
+
+def _get_subnet(args: dict) -> dict:
+    subnet_id = args["id"]
+    _, purpose, zone = subnet_id.split("-")
+    return {
+        "id": subnet_id,
+        "arn": f"arn:aws:ec2:{REGION}:{ACCOUNT_ID}:subnet/{subnet_id}",
+        "availabilityZone": f"{REGION}{zone}",
+        "cidrBlock": "10.24.0.0/21",
+        "mapPublicIpOnLaunch": SUBNET_PURPOSES[purpose],
+        "tags": {f"{TAG_PREFIX}role": purpose},
+        "vpcId": args.get("vpcId", "vpc-benchmark"),
+    }
+
+
+def _get_managed_prefix_list(args: dict) -> dict:
+    return {
+        "id": "pl-benchmark",
+        "arn": f"arn:aws:ec2:{REGION}:{ACCOUNT_ID}:prefix-list/pl-benchmark",
+        "entries": [{"cidr": "10.24.0.0/18", "description": "benchmark"}],
+        "version": 1,
+    }
+
+
+INVOKE_RESULTS: dict[str, Callable[[dict], dict]] = {
+    "getCallerIdentity": lambda args: {"accountId": ACCOUNT_ID, "arn": f"arn:aws:iam::{ACCOUNT_ID}:root", "id": "id"},
+    "getPartition": lambda args: {"partition": "aws", "dnsSuffix": "amazonaws.com", "id": "aws"},
+    "getRegion": lambda args: {"name": REGION, "id": REGION},
+    "getAvailabilityZones": lambda args: {"names": AVAILABILITY_ZONES, "zoneIds": AVAILABILITY_ZONES},
+    "getVpc": lambda args: {"id": "vpc-benchmark", "cidrBlock": "10.24.0.0/18", "arn": "arn:vpc/vpc-benchmark"},
+    "getSubnetIds": lambda args: {
+        "ids": [f"subnet-{purpose}-{zone[-1]}" for purpose in SUBNET_PURPOSES for zone in AVAILABILITY_ZONES]
+    },
+    "getSubnet": _get_subnet,
+    "getRouteTables": lambda args: {"ids": [f"rtb-{zone[-1]}" for zone in AVAILABILITY_ZONES]},
+    "getSecurityGroups": lambda args: {"ids": ["sg-benchmark"], "vpcIds": ["vpc-benchmark"]},
+    "getManagedPrefixList": _get_managed_prefix_list,
+    "getAmi": lambda args: {"id": "ami-benchmark", "imageId": "ami-benchmark", "name": "benchmark"},
+    "getZone": lambda args: {"id": "Z0BENCHMARK", "zoneId": "Z0BENCHMARK", "name": args.get("name", "example.com")},
+    "getRole": lambda args: {"arn": f"arn:aws:iam::{ACCOUNT_ID}:role/{args['name']}", "name": args["name"]},
+    "getServiceAccount": lambda args: {"arn": "arn:aws:iam::797873946194:root", "id": "797873946194"},
+    "getParameter": lambda args: {"name": args["name"], "value": "benchmark", "type": "SecureString"},
+    "getOrganization": lambda args: {"arn": f"arn:aws:organizations::{ACCOUNT_ID}:organization/o-benchmark"},
+    # charts render to nothing: what matters is that they are rendered, and what waits for them
+    "template": lambda args: {"result": []},
+}
+"""Invoke results by function name (``aws:ec2/getVpc:getVpc`` -> ``getVpc``)"""
+
+
+def _get_certificate_outputs(inputs: dict) -> dict:
+    domains = [inputs["domainName"], *inputs.get("subjectAlternativeNames", [])]
+    return {
+        "domainValidationOptions": [
+            {
+                "domainName": domain,
+                "resourceRecordName": f"_validation.{domain.removeprefix('*.')}",
+                "resourceRecordType": "CNAME",
+                "resourceRecordValue": "_validation.acm-validations.aws",
+            }
+            for domain in dict.fromkeys(domains)
+        ]
+    }
+
+
+def _get_digest(name: str, size: int) -> bytes:
+    """Bytes that stand in for random data, the same for every run of a resource"""
+    return hashlib.sha256(name.encode()).digest()[:size]
+
+
+def _get_pem(label: str, name: str) -> str:
+    body = base64.b64encode(_get_digest(name, 32) * 8).decode()
+    return f"-----BEGIN {label}-----\n{body}\n-----END {label}-----\n"
+
+
+def _get_random_id_outputs(name: str, inputs: dict) -> dict:
+    digest = _get_digest(name, int(inputs.get("byteLength", 8)))
+    return {
+        "b64Std": base64.b64encode(digest).decode(),
+        "b64Url": base64.urlsafe_b64encode(digest).decode().rstrip("="),
+        "dec": str(int.from_bytes(digest, "big")),
+        "hex": digest.hex(),
+    }
+
+
+def _get_random_string_outputs(name: str, inputs: dict) -> dict:
+    return {"result": _get_digest(name, 32).hex()[: int(inputs.get("length", 16))]}
+
+
+def _get_private_key_outputs(name: str, inputs: dict) -> dict:
+    return {
+        "privateKeyPem": _get_pem(f"{inputs.get('algorithm', 'RSA')} PRIVATE KEY", name),
+        "publicKeyPem": _get_pem("PUBLIC KEY", name),
+        "publicKeyOpenssh": f"ssh-rsa {base64.b64encode(_get_digest(name, 32)).decode()}\n",
+        "publicKeyFingerprintMd5": ":".join(f"{b:02x}" for b in _get_digest(name, 16)),
+    }
+
+
+def _get_cert_outputs(name: str, inputs: dict) -> dict:
+    return {
+        "certPem": _get_pem("CERTIFICATE", name),
+        "validityStartTime": "2022-01-01T00:00:00Z",
+        "validityEndTime": "2032-01-01T00:00:00Z",
+        "readyForRenewal": False,
+    }
+
+
+def _get_endpoint(name: str, service: str) -> str:
+    return f"{name}.{_get_digest(name, 4).hex()}.{REGION}.{service}.amazonaws.com"
+
+
+RESOURCE_OUTPUTS: dict[str, Callable[[str, dict], dict]] = {
+    "aws:acm/certificate:Certificate": lambda name, inputs: _get_certificate_outputs(inputs),
+    "aws:docdb/cluster:Cluster": lambda name, inputs: {
+        "endpoint": _get_endpoint(name, "docdb"),
+        "readerEndpoint": _get_endpoint(f"{name}-ro", "docdb"),
+        "port": inputs.get("port", 27017),
+    },
+    "aws:elasticache/replicationGroup:ReplicationGroup": lambda name, inputs: {
+        "primaryEndpointAddress": _get_endpoint(name, "cache"),
+        "port": inputs.get("port", 6379),
+        "memberClusters": [f"{name}-00{i}" for i in range(1, int(inputs.get("numberCacheClusters", 1)) + 1)],
+        "authToken": inputs.get("authToken"),
+    },
+    "aws:lb/loadBalancer:LoadBalancer": lambda name, inputs: {
+        "dnsName": _get_endpoint(name, "elb"),
+        "zoneId": "Z0BENCHMARKELB",
+    },
+    "aws:rds/instance:Instance": lambda name, inputs: {
+        "address": _get_endpoint(name, "rds"),
+        "endpoint": f"{_get_endpoint(name, 'rds')}:{inputs.get('port', 5432)}",
+        "port": inputs.get("port", 5432),
+    },
+    "random:index/randomId:RandomId": _get_random_id_outputs,
+    "random:index/randomPassword:RandomPassword": _get_random_string_outputs,
+    "random:index/randomString:RandomString": _get_random_string_outputs,
+    "random:index/randomUuid:RandomUuid": lambda name, inputs: {"result": str(uuid.UUID(bytes=_get_digest(name, 16)))},
+    "tls:index/privateKey:PrivateKey": _get_private_key_outputs,
+    "tls:index/selfSignedCert:SelfSignedCert": _get_cert_outputs,
+    "tls:index/locallySignedCert:LocallySignedCert": _get_cert_outputs,
+    "tls:index/certRequest:CertRequest": lambda name, inputs: {"certRequestPem": _get_pem("CERTIFICATE REQUEST", name)},
+}
+"""Outputs computed by the provider that modules read back, by resource type: ``(name, inputs) -> outputs``"""
+
+
+class BuildMocks(Mocks):
+    """Mocks that count what a module build asks of the engine"""
+
+    def __init__(self):
+        self.resources = Counter()
+        """Custom resources registered, by type"""
+
+        self.components = Counter()
+        """Component resources registered, by type"""
+
+        self.invokes = Counter()
+        """Invokes made, by token"""
+
+    def new_resource(self, args: MockResourceArgs) -> tuple[str, dict]:
+        (self.resources if args.custom else self.components)[args.typ] += 1
+
+        outputs = {
+            # the provider returns policy documents as JSON, whatever they were given as
+            key: json.dumps(value) if key.lower().endswith("policy") and isinstance(value, dict) else value
+            for key, value in args.inputs.items()
+        }
+        outputs.setdefault("name", args.name)
+        outputs["arn"] = f"arn:benchmark:{args.typ}:{args.name}"
+        if args.typ in RESOURCE_OUTPUTS:
+            outputs.update(RESOURCE_OUTPUTS[args.typ](args.name, args.inputs))
+        if args.typ == "pulumi:pulumi:StackReference":
+            stack = args.inputs["name"]
+            outputs["outputs"] = {stack: STACK_OUTPUTS.get(stack, {})}
+
+        return f"{args.name}-id", outputs
+
+    def call(self, args: MockCallArgs) -> dict:
+        self.invokes[args.token] += 1
+
+        function_name = args.token.rpartition(":")[2]
+        if function_name in INVOKE_RESULTS:
+            return INVOKE_RESULTS[function_name](args.args)
+
+        return {}
@@ -0,0 +1,149 @@
+"""
+Configurations the module build benchmarks run with.
+
+The representative scenarios are the stack configurations of the example SysEnv. The scaled scenarios are synthetic
+configurations, sized like a large organization, for the modules whose build grows with their configuration.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+REPO_ROOT = Path(__file__).absolute().parent.parent
+
+SYSENV_DIR = REPO_ROOT / "sysenvs" / "aws" / "oh-aws-us-west-2-sandbox-dev"
+"""The example SysEnv: its Thunder.common.yaml files are used by every scenario"""
+
+SYSENV_PROVIDER = "aws"
+
+SCALED_CLUSTERS = [f"cluster{i}" for i in range(10)]
+"""Kubernetes clusters of the scaled scenarios"""
+
+SCALED_BUCKETS = [f"bucket{i}" for i in range(20)]
+SCALED_STREAMS = [f"stream{i}" for i in range(10)]
+SCALED_QUEUES = [f"queue{i}" for i in range(10)]
+"""S3 buckets, Kinesis streams and SQS queues that the roles of the scaled scenarios are granted"""
+
+SECRET_VALUE = "benchmark-secret"
+"""Stands in for encrypted configuration values, which can't be decrypted without the stack's key"""
+
+
+@dataclass
+class Scenario:
+    name: str
+    """Name of the scenario, unique across the suite"""
+
+    provider: str
+    """Provider of the module"""
+
+    stack: str
+    """Name of the stack, which is also the name of the module"""
+
+    config: dict[str, Any]
+    """Pulumi configuration, keyed by ``{namespace}:{key}`` like in ``Pulumi.{stack}.yaml``"""
+
+
+def _strip_secrets(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"secure"}:
+            return SECRET_VALUE
+        return {k: _strip_secrets(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_strip_secrets(v) for v in value]
+    return value
+
+
+def _get_provider(config: dict[str, Any]) -> str:
+    if config.get("thunder:shared") in (True, "true"):
+        return "shared"
+
+    return config.get("thunder:provider", SYSENV_PROVIDER)
+
+
+def get_stack_scenarios() -> list[Scenario]:
+    """Get a scenario for each stack configuration of the example SysEnv"""
+    scenarios = []
+    for path in sorted((SYSENV_DIR / "stacks").glob("Pulumi.*.yaml")):
+        stack = path.name.removeprefix("Pulumi.").removesuffix(".yaml")
+        config = _strip_secrets(yaml.safe_load(path.read_text()).get("config") or {})
+        scenarios.append(Scenario(stack, _get_provider(config), stack, config))
+
+    return scenarios
+
+
+def _dynamodb_tables(count: int) -> dict[str, Any]:
+    return {
+        "dynamodb:tables": [
+            {"name": f"table{i}", "hash_key": "id", "attributes": [{"name": "id", "type": "NUMBER"}]}
+            for i in range(count)
+        ]
+    }
+
+
+def _transitgateway_peers(count: int) -> dict[str, Any]:
+    sysenvs = [f"oh-aws-us-west-2-peer{i}" for i in range(count)]
+    return {
+        "transitgateway:connections": [
+            {"sysenv": sysenv, "profile": sysenv, "allowed_sysenvs": sysenvs} for sysenv in sysenvs
+        ]
+    }
+
+
+def _k8s_clusters() -> dict[str, Any]:
+    return {
+        "ami:name_prefix_override": "oh-kubernetes-1.22",
+        "k8s-controllers:clusters": [
+            {"name": cluster, "service_cidr": f"10.{100 + i}.0.0/21", "instance_type": "c6a.xlarge"}
+            for i, cluster in enumerate(SCALED_CLUSTERS)
+        ],
+    }
+
+
+def _k8s_nodegroups(nodegroups_per_cluster: int) -> dict[str, Any]:
+    return {
+        "ami:name_prefix_override": "oh-kubernetes-1.22",
+        "k8s-agents:agents": [
+            {
+                "cluster": cluster,
+                "enable_glb": False,
+                "nodegroups": [
+                    {"name": f"group{j}", "min_size": 1, "max_size": 10, "labels": ["general"]}
+                    for j in range(nodegroups_per_cluster)
+                ],
+            }
+            for cluster in SCALED_CLUSTERS
+        ],
+    }
+
+
+def _iam_roles(count: int) -> dict[str, Any]:
+    return {
+        "iam-roles:roles": [
+            {
+                "name": f"role{i}",
+                "description": None,
+                "buckets": SCALED_BUCKETS,
+                "kinesis": SCALED_STREAMS,
+                "sqs": SCALED_QUEUES,
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def get_scaled_scenarios() -> list[Scenario]:
+    """Get the synthetic scenarios"""
+    region = {"aws:region": "us-west-2"}
+    return [
+        Scenario("dynamodb@500-tables", "aws", "dynamodb", {**region, **_dynamodb_tables(500)}),
+        Scenario("transitgateway@20-peers", "aws", "transitgateway", {**region, **_transitgateway_peers(20)}),
+        Scenario("k8s-controllers@10-clusters", "aws", "k8s-controllers", {**region, **_k8s_clusters()}),
+        Scenario("iam-roles@40-grants", "aws", "iam-roles", {**region, **_iam_roles(10)}),
+        Scenario("k8s-agents@50-nodegroups", "aws", "k8s-agents", {**region, **_k8s_nodegroups(5)}),
+    ]
+
+
+def get_scenarios() -> dict[str, Scenario]:
+    """Get every scenario of the suite, by name"""
+    return {scenario.name: scenario for scenario in get_stack_scenarios() + get_scaled_scenarios()}
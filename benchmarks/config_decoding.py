@@ -0,0 +1,121 @@
+"""
+Benchmark of the stack config decoding, against dacite.
+
+For each scenario (see ``build_scenarios.py``), the Pulumi configuration is loaded like the language host does, read
+back with ``get_raw_stack_config``, and mapped to the module's config dataclass by ``decode_config`` and by
+``dacite.from_dict`` in strict mode, which Thunder used before. Both must produce the same config.
+
+The time to read the raw config, and the median time of each decoder, are reported in milliseconds. The first decode
+of a dataclass also compiles its converter, and is reported separately.
+
+Modules whose provider SDK isn't installed are reported as skipped.
+
+Usage::
+
+    python benchmarks/config_decoding.py [--only 'k8s-*'] [--runs 20]
+"""
+import argparse
+import json
+import sys
+from enum import Enum
+from fnmatch import fnmatch
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable
+
+from build_scenarios import Scenario, get_scenarios
+
+
+def _time(func: Callable[[], Any], runs: int) -> tuple[float, Any]:
+    """
+    :return: Median time of the runs in milliseconds, and what the last run returned
+    """
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        result = func()
+        times.append((perf_counter() - start) * 1000)
+
+    return median(times), result
+
+
+def measure(scenario: Scenario, runs: int) -> dict[str, Any]:
+    """
+    Decode the config of a scenario with both decoders
+
+    :param scenario: The scenario
+    :param runs: Runs of each decoder
+    :return: Result of the scenario
+    """
+    import pulumi
+    from dacite import Config, from_dict
+
+    from infra_thunder.lib.config import ConfigDecodeError, decode_config
+    from infra_thunder.lib.config.mapper import get_raw_stack_config
+    from infra_thunder.module_manager import module_manager
+
+    try:
+        config_cls = module_manager.get_module(scenario.provider, scenario.stack).Module.get_config_type()
+    except ImportError as e:
+        return {"status": "skipped", "reason": f"{type(e).__name__}: {e}"}
+
+    # Pulumi hands the program every value as a string
+    pulumi.runtime.set_all_config(
+        {key: value if isinstance(value, str) else json.dumps(value) for key, value in scenario.config.items()}
+    )
+    read_ms, raw_config = _time(lambda: get_raw_stack_config(scenario.stack), runs)
+
+    start = perf_counter()
+    try:
+        decode_config(config_cls, raw_config)
+    except ConfigDecodeError as e:
+        return {"status": "error", "reason": e.errors[0]}
+    first_ms = (perf_counter() - start) * 1000
+
+    thunder_ms, config = _time(lambda: decode_config(config_cls, raw_config), runs)
+    dacite_config = Config(cast=[Enum], strict=True)
+    dacite_ms, expected = _time(lambda: from_dict(data_class=config_cls, data=raw_config, config=dacite_config), runs)
+
+    if config != expected:
+        return {"status": "error", "reason": "the configs decoded by Thunder and dacite differ"}
+
+    return {
+        "status": "ok",
+        "read_ms": read_ms,
+        "first_ms": first_ms,
+        "thunder_ms": thunder_ms,
+        "dacite_ms": dacite_ms,
+    }
+
+
+def _format_result(name: str, result: dict[str, Any]) -> str:
+    if result["status"] != "ok":
+        return f"{name:<32} {result['status']}: {result['reason']}"
+
+    return (
+        f"{name:<32} {result['read_ms']:>8.3f} {result['first_ms']:>8.3f} {result['thunder_ms']:>8.3f}"
+        f" {result['dacite_ms']:>8.3f} {result['dacite_ms'] / result['thunder_ms']:>7.1f}x"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Only run the scenarios matching this pattern (repeatable)")
+    parser.add_argument("--runs", type=int, default=20, help="Runs of each decoder per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<32} {'read ms':>8} {'first ms':>8} {'thunder':>8} {'dacite':>8} {'speedup':>8}")
+    failed = False
+    for name, scenario in get_scenarios().items():
+        if args.only and not any(fnmatch(name, pattern) for pattern in args.only):
+            continue
+
+        result = measure(scenario, args.runs)
+        failed |= result["status"] == "error"
+        print(_format_result(name, result), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
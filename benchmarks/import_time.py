@@ -0,0 +1,85 @@
+"""
+Import-time gate for the Thunder entrypoints.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``, from a directory outside of any SysEnv,
+so nothing can lean on a Pulumi engine or a Thunder.common.yaml being around. The gate fails if a module can't be
+imported there, or if its cumulative import time goes over its budget.
+
+Usage::
+
+    python benchmarks/import_time.py [--runs 5] [--scale 1.0]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from statistics import median
+
+REPO_ROOT = Path(__file__).absolute().parent.parent
+
+# cumulative import time budgets, in milliseconds
+BUDGETS_MS = {
+    "infra_thunder": 50,
+    "infra_thunder.launcher": 350,
+    "infra_thunder.lib.cli": 350,
+}
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \| (?P<module>\S+)$")
+
+
+def measure(module: str, cwd: str) -> float:
+    """
+    Import a module in a fresh interpreter
+
+    :param module: The module to import
+    :param cwd: Directory to run the interpreter in
+    :return: Cumulative import time of the module, in milliseconds
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"`import {module}` failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    for line in reversed(result.stderr.splitlines()):
+        match = IMPORT_TIME_LINE.match(line)
+        if match and match["module"] == module:
+            return int(match["cumulative"]) / 1000
+
+    raise RuntimeError(f"`import {module}` didn't report an import time")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Imports per module; the median is compared to the budget")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, for slower machines")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as cwd:
+        for module, budget in BUDGETS_MS.items():
+            budget *= args.scale
+            try:
+                elapsed = median(measure(module, cwd) for _ in range(args.runs))
+            except RuntimeError as e:
+                print(f"FAIL {module}: {e}")
+                failed = True
+                continue
+
+            status = "ok  " if elapsed <= budget else "FAIL"
+            failed |= elapsed > budget
+            print(f"{status} {module}: {elapsed:.1f} ms (budget {budget:.0f} ms)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Offline benchmarks of every module's ``build``, under Pulumi mocks.
+
+Each scenario (see ``build_scenarios.py``) runs in a fresh interpreter: the module is looked up and run exactly like
+the launcher does, against mocks that answer every resource registration and invoke without a cloud account or a
+Pulumi engine. The wall time of the import and of the build, the peak RSS of the interpreter, and the number of
+resources registered and invokes made are recorded, with a digest of the URNs of the resources.
+
+Modules whose provider SDK isn't installed are reported as skipped.
+
+Results can be written to a JSON file, and compared to a previous one: a scenario regresses when its build is slower
+or its peak RSS higher than the baseline by more than the tolerance, or when it makes more invokes. A change of the URNs
+is reported too: a refactoring that renames or reparents a resource would replace it.
+
+Usage::
+
+    python benchmarks/module_builds.py [--only 'k8s-*'] [--runs 3] [--output results.json]
+    python benchmarks/module_builds.py --baseline results.json [--tolerance 0.25]
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+from fnmatch import fnmatch
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Optional
+
+from build_scenarios import REPO_ROOT, SYSENV_DIR, Scenario, get_scenarios
+
+BUILD_RESULT_KEYS = ("build_s", "import_s", "peak_rss_mb")
+"""Measurements that vary between runs, and are reported as the median of all runs"""
+
+
+def _record_urns(monitor) -> set[str]:
+    """Record the URN of every resource registered with the mock monitor"""
+    urns = set()
+    make_urn = monitor.make_urn
+
+    def record_urn(parent: str, type_: str, name: str) -> str:
+        urn = make_urn(parent, type_, name)
+        urns.add(urn)
+        return urn
+
+    monitor.make_urn = record_urn
+    return urns
+
+
+def run_scenario(provider: str, stack: str) -> dict[str, Any]:
+    """
+    Run a module under mocks, in this interpreter. The Pulumi configuration is read from ``PULUMI_CONFIG``.
+
+    :param provider: Provider of the module
+    :param stack: Name of the stack
+    :return: Result of the scenario
+    """
+    # Thunder.common.yaml files are found relative to the entrypoint, so run as if launched from the SysEnv
+    sys.modules["__main__"].__file__ = str(SYSENV_DIR / "thunder.py")
+
+    import pulumi
+    from pulumi.runtime.stack import run_pulumi_func
+    from pulumi.runtime.sync_await import _sync_await
+
+    from build_mocks import BuildMocks
+    from infra_thunder.module_manager import module_manager
+
+    # the language host loads the stack configuration like this before running a program
+    pulumi.runtime.set_all_config(pulumi.runtime.get_config_env())
+    mocks = BuildMocks()
+    pulumi.runtime.set_mocks(mocks, project="benchmark", stack=stack, preview=False)
+    urns = _record_urns(pulumi.runtime.settings.get_monitor())
+
+    start = perf_counter()
+    try:
+        lazy_module = module_manager.get_module(provider, stack)
+        lazy_module.Module
+    except ImportError as e:
+        return {"status": "skipped", "reason": f"{type(e).__name__}: {e}"}
+    import_s = perf_counter() - start
+
+    start = perf_counter()
+    _sync_await(run_pulumi_func(lambda: lazy_module.run(stack)))
+    build_s = perf_counter() - start
+
+    return {
+        "status": "ok",
+        "import_s": round(import_s, 4),
+        "build_s": round(build_s, 4),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "resources": sum(mocks.resources.values()),
+        "components": sum(mocks.components.values()),
+        "invokes": sum(mocks.invokes.values()),
+        "resources_by_type": dict(sorted(mocks.resources.items())),
+        "invokes_by_token": dict(sorted(mocks.invokes.items())),
+        "urns_digest": hashlib.sha256("\n".join(sorted(urns)).encode()).hexdigest()[:16],
+    }
+
+
+def _get_pulumi_config(scenario: Scenario) -> str:
+    # Pulumi hands the program every value as a string, and Thunder parses the JSON ones
+    return json.dumps(
+        {key: value if isinstance(value, str) else json.dumps(value) for key, value in scenario.config.items()}
+    )
+
+
+def measure(scenario: Scenario, cache_dir: str) -> dict[str, Any]:
+    """
+    Run a scenario in a fresh interpreter
+
+    :param scenario: The scenario
+    :param cache_dir: Directory for the Thunder caches, kept out of the SysEnv
+    :return: Result of the scenario
+    """
+    with tempfile.NamedTemporaryFile("r", suffix=".json") as result_file:
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+            PULUMI_CONFIG=_get_pulumi_config(scenario),
+            THUNDER_CACHE_DIR=cache_dir,
+            # every invoke has to reach the mocks to be counted
+            THUNDER_INVOKE_CACHE="off",
+            # charts are rendered by the mocks, they mustn't be downloaded
+            THUNDER_CHART_CACHE="off",
+            # there are no API servers to wait for
+            THUNDER_KUBE_WAIT="off",
+        )
+        process = subprocess.run(
+            [sys.executable, __file__, "--run", scenario.provider, scenario.stack, result_file.name],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            error = (process.stderr.strip().splitlines() or ["no output"])[-1]
+            return {"status": "error", "reason": error}
+
+        return json.load(result_file)
+
+
+def measure_runs(scenario: Scenario, runs: int, cache_dir: str) -> dict[str, Any]:
+    """Run a scenario several times, and keep the median of the measurements that vary between runs"""
+    results = [measure(scenario, cache_dir) for _ in range(runs)]
+    if any(result["status"] != "ok" for result in results):
+        return next(result for result in results if result["status"] != "ok")
+
+    return {**results[0], **{key: median(result[key] for result in results) for key in BUILD_RESULT_KEYS}}
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Compare results to a baseline
+
+    :param results: Results by scenario
+    :param baseline: Baseline results by scenario
+    :param tolerance: Relative increase of build time and peak RSS tolerated, e.g. 0.25 for 25%
+    :return: Descriptions of the regressions
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if result["status"] == "ok" and before and before["status"] == "ok":
+            regressions += _compare_scenario(name, result, before, tolerance)
+
+    return regressions
+
+
+def _compare_scenario(name: str, result: dict[str, Any], before: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for key in ("build_s", "peak_rss_mb"):
+        if result[key] > before[key] * (1 + tolerance):
+            regressions.append(f"{name}: {key} went from {before[key]} to {result[key]}")
+    if result["invokes"] > before["invokes"]:
+        regressions.append(f"{name}: invokes went from {before['invokes']} to {result['invokes']}")
+    # baselines recorded before URNs were
+    if before.get("urns_digest", result["urns_digest"]) != result["urns_digest"]:
+        regressions.append(f"{name}: the URNs of the resources changed")
+
+    return regressions
+
+
+def _format_result(name: str, result: dict[str, Any]) -> str:
+    if result["status"] != "ok":
+        return f"{name:<32} {result['status']}: {result['reason']}"
+
+    return (
+        f"{name:<32} {result['build_s']:>8.3f} {result['import_s']:>8.3f} {result['peak_rss_mb']:>8.1f}"
+        f" {result['resources']:>9} {result['invokes']:>7}"
+    )
+
+
+def _load_baseline(path: Optional[str]) -> dict[str, dict]:
+    if not path:
+        return {}
+
+    return json.loads(Path(path).read_text())["scenarios"]
+
+
+def main() -> int:
+    if sys.argv[1:2] == ["--run"]:
+        _, _, provider, stack, result_path = sys.argv
+        Path(result_path).write_text(json.dumps(run_scenario(provider, stack)))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Only run the scenarios matching this pattern (repeatable)")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per scenario; measurements are the median")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare the results to this JSON file, and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Relative slowdown tolerated by --baseline")
+    args = parser.parse_args()
+
+    baseline = _load_baseline(args.baseline)
+    scenarios = [
+        scenario
+        for name, scenario in get_scenarios().items()
+        if not args.only or any(fnmatch(name, pattern) for pattern in args.only)
+    ]
+
+    print(f"{'scenario':<32} {'build s':>8} {'import s':>8} {'rss MB':>8} {'resources':>9} {'invokes':>7}")
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for scenario in scenarios:
+            results[scenario.name] = measure_runs(scenario, args.runs, cache_dir)
+            print(_format_result(scenario.name, results[scenario.name]), flush=True)
+
+    if args.output:
+        output = {"python": platform.python_version(), "runs": args.runs, "scenarios": results}
+        Path(args.output).write_text(json.dumps(output, indent=2) + "\n")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    failed = any(result["status"] == "error" for result in results.values())
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,14 @@ from pulumi import Config
 from pulumi_aws import GetAmiFilterArgs, GetAmiResult
 from pulumi_aws.ec2 import get_ami as ec2_get_ami
 
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from ..config import thunder_env
+from ..invoke_cache import cached_invoke, AMI_TTL
 
 
+@memoize
+@profiled("lookup")
 def get_ami(name_prefix: str) -> GetAmiResult:
     """
     Retrieve an AMI ID by name prefix
@@ -29,7 +34,9 @@ def get_ami(name_prefix: str) -> GetAmiResult:
     id_override = ami_config.get("id_override")
     prefix = ami_config.get("name_prefix_override") or name_prefix
 
-    return ec2_get_ami(
+    return cached_invoke(
+        ec2_get_ami,
+        ttl=AMI_TTL,
         owners=[thunder_env.get("ami_owner", "self")],
         most_recent=True,
         filters=[
@@ -4,6 +4,7 @@ from pulumi import ResourceOptions, Config
 from pulumi_aws import get_caller_identity, get_partition
 
 from infra_thunder.lib.base import BaseModule, ConfigType
+from infra_thunder.lib.invoke_cache import cached_invoke, ACCOUNT_TTL
 
 
 class AWSModule(BaseModule, ABC):
@@ -17,5 +18,5 @@ class AWSModule(BaseModule, ABC):
         super().__init__(name, config, opts)
 
         self.region = Config(self.provider).require("region")
-        self.aws_account_id = get_caller_identity().account_id
-        self.partition = get_partition().partition
+        self.aws_account_id = cached_invoke(get_caller_identity, ttl=ACCOUNT_TTL).account_id
+        self.partition = cached_invoke(get_partition, ttl=ACCOUNT_TTL).partition
@@ -1 +1 @@
-from .get_stream import get_stream
+from .get_stream import get_stream, get_streams
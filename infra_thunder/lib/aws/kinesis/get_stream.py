@@ -1,7 +1,13 @@
+from typing import Iterable, Optional
+
 from pulumi import Output
 
-from infra_thunder.lib.stack import find_entity_in_stack_output
+from infra_thunder.lib.stack import find_entity_in_stack_output, find_entities_in_stack_output
 
 
 def get_stream(name) -> Output[dict]:
     return find_entity_in_stack_output("kinesis", "streams", name)
+
+
+def get_streams(names: Iterable[str]) -> Output[dict[str, Optional[dict]]]:
+    return find_entities_in_stack_output("kinesis", "streams", names)
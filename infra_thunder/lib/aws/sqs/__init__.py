@@ -1 +1 @@
-from .get_queue import get_queue
+from .get_queue import get_queue, get_queues
@@ -1,9 +1,11 @@
 from pulumi_azure_native import authorization
 
-from infra_thunder.lib.utils import run_once
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
-@run_once
+@memoize
+@profiled("lookup")
 def get_client_config() -> authorization.AwaitableGetClientConfigResult:
     """Access the current configuration of the native Azure provider.
 
@@ -4,8 +4,12 @@ from pulumi_azure_native import network
 
 from infra_thunder.lib.azure.resources import get_resourcegroup
 from infra_thunder.lib.config import get_public_sysenv_domain
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
+@memoize
+@profiled("lookup")
 def get_sysenv_zone(
     resource_group_name: Optional[str] = None,
 ) -> network.AwaitableGetZoneResult:
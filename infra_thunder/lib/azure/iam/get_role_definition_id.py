@@ -1,4 +1,3 @@
-from functools import lru_cache
 from typing import Optional, Union
 
 from azure.core.credentials import AccessToken
@@ -7,7 +6,8 @@ from pulumi import Output
 from pulumi_azure_native import authorization
 
 from infra_thunder.lib.azure.client import get_subscription_id
-from infra_thunder.lib.utils import run_once
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize, run_once
 
 
 class _TokenCredential:
@@ -25,7 +25,8 @@ def _get_auth_manager_client() -> AuthorizationManagementClient:
     return AuthorizationManagementClient(_TokenCredential(client_token.token), get_subscription_id())
 
 
-@lru_cache
+@memoize
+@profiled("lookup")
 def get_role_definition_id(name: str, scope: Optional[Union[str, Output[str]]] = None) -> Output[str]:
     """Get an Azure role definition ID by name
 
@@ -1,10 +1,11 @@
-from functools import lru_cache
 from typing import Optional
 
 from pulumi_azure_native import compute
 from pulumi_azure_native.compute import GetGalleryImageResult
 
 from infra_thunder.lib.config import thunder_env, get_sysenv
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
 def _get_config(gallery_name: Optional[str] = None, resource_group_name: Optional[str] = None):
@@ -39,6 +40,8 @@ def _get_config(gallery_name: Optional[str] = None, resource_group_name: Optiona
     return gallery_resourcegroup_, gallery_name_
 
 
+@memoize
+@profiled("lookup")
 def get_gallery(gallery_name: Optional[str] = None, resource_group_name: Optional[str] = None):
     resource_group_name_, gallery_name_ = _get_config(gallery_name, resource_group_name)
 
@@ -48,6 +51,8 @@ def get_gallery(gallery_name: Optional[str] = None, resource_group_name: Optiona
     )
 
 
+@memoize
+@profiled("lookup")
 def get_image_version(
     gallery_image_name: str,
     gallery_image_version_name: str,
@@ -64,7 +69,8 @@ def get_image_version(
     )
 
 
-@lru_cache
+@memoize
+@profiled("lookup")
 def get_image(
     gallery_image_name: str,
     gallery_name: Optional[str] = None,
@@ -3,8 +3,12 @@ from typing import Optional
 from pulumi_azure_native.keyvault import get_secret, AwaitableGetSecretResult
 
 from infra_thunder.lib.azure.resources import get_resourcegroup
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
+@memoize
+@profiled("lookup")
 def get_sysenv_secret(secret_name: str, resource_group_name: Optional[str] = None) -> AwaitableGetSecretResult:
     """
     Get details about a secret from the sysenv key vault.
@@ -1,12 +1,14 @@
-from functools import lru_cache
 from typing import Optional
 
 from pulumi_azure_native.keyvault import get_vault, AwaitableGetVaultResult
 
 from infra_thunder.lib.azure.resources import get_resourcegroup
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
-@lru_cache
+@memoize
+@profiled("lookup")
 def get_sysenv_vault(
     resource_group_name: Optional[str] = None,
 ) -> AwaitableGetVaultResult:
@@ -6,9 +6,13 @@ from pulumi_azure_native.managedidentity import (
 )
 
 from infra_thunder.lib.azure.resources import get_resourcegroup
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from .constants import VAULT_SECRETS_READER_IDENTITY
 
 
+@memoize
+@profiled("lookup")
 def get_sysenv_vault_reader_identity(
     resource_group_name: Optional[str] = None,
 ) -> AwaitableGetUserAssignedIdentityResult:
@@ -2,9 +2,13 @@ from typing import Optional
 
 from pulumi_azure_native import network
 
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from ..resources import get_resourcegroup
 
 
+@memoize
+@profiled("lookup")
 def get_route_table(route_table_name: Optional[str] = None, resource_group_name: Optional[str] = None):
     # avoid call to get_resourcegroup if resource_group_name is set
     resource_group_name_ = resource_group_name or get_resourcegroup().name
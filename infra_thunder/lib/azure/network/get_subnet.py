@@ -1,14 +1,16 @@
-from functools import lru_cache
 from typing import Optional
 
 from pulumi_azure_native import network
 
 from infra_thunder.lib.azure.resources import get_resourcegroup
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from .constants import SubnetPurpose, SubnetDelegation
 from .get_vnet import get_vnet
 
 
-@lru_cache
+@memoize
+@profiled("lookup")
 def get_subnet(
     purpose: SubnetPurpose,
     delegation: Optional[SubnetDelegation] = None,
@@ -2,9 +2,13 @@ from typing import Optional
 
 from pulumi_azure_native import network
 
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from ..resources import get_resourcegroup
 
 
+@memoize
+@profiled("lookup")
 def get_vnet(
     resource_group_name: Optional[str] = None,
 ) -> network.AwaitableGetVirtualNetworkResult:
@@ -3,8 +3,12 @@ from typing import Optional
 from pulumi_azure_native import resources
 
 from infra_thunder.lib.config import get_sysenv
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
+@memoize
+@profiled("lookup")
 def get_resourcegroup(
     sysenv: Optional[str] = None,
 ) -> resources.AwaitableGetResourceGroupResult:
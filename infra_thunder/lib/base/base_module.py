@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import Type, get_type_hints
 
-from pulumi import ComponentResource, ResourceOptions
+from pulumi import ComponentResource, ResourceOptions, log
 
 from infra_thunder.lib.base.types import ConfigType, ExportsType
-from infra_thunder.lib.utils import outputs_from_exports, run_once
+from infra_thunder.lib.profiling import profile_span, start_profiling
+from infra_thunder.lib.utils import get_memoize_stats, memoize, outputs_from_exports
 
 
 class BaseModule(ComponentResource, ABC):
@@ -18,6 +19,9 @@ class BaseModule(ComponentResource, ABC):
         """Name of the provider"""
 
     def __init__(self, name: str, config: ConfigType, opts: ResourceOptions = None):
+        # before the component is constructed, so the resources it parents are counted
+        start_profiling()
+
         super().__init__(
             f"pkg:thunder:{self.provider}:{self.__class__.__name__.lower()}",
             name,
@@ -28,7 +32,8 @@ class BaseModule(ComponentResource, ABC):
         self._config = config
 
     @classmethod
-    @run_once
+    # cached per module class, not once for every module
+    @memoize
     def get_config_type(cls) -> Type[ConfigType]:
         try:
             return get_type_hints(cls.build)["config"]
@@ -40,10 +45,15 @@ class BaseModule(ComponentResource, ABC):
 
         :return: An exports object
         """
-        exports = self.build(self._config)
+        with profile_span("build", f"{self.provider}:{self.__class__.__name__}"):
+            exports = self.build(self._config)
 
         self.register_outputs(outputs_from_exports(exports))
 
+        for name, stats in get_memoize_stats().items():
+            if stats.hits:
+                log.debug(f"memoized `{name}`: {stats.hits} hits, {stats.misses} misses")
+
         return exports
 
     @abstractmethod
@@ -0,0 +1,18 @@
+from infra_thunder.lib.utils import lazy_exports
+from .constants import CHART_CACHE_DIR_ENV, CHART_CACHE_ENV, CHART_CACHE_NAME, DEFAULT_PREFETCH_JOBS
+
+# downloading and extracting charts needs urllib and tarfile, which the CLI shouldn't import until it fetches charts
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "ChartCache": ".chart_cache",
+        "ChartCacheException": ".chart_cache",
+        "ChartCacheMode": ".chart_cache",
+        "ChartReference": ".chart_cache",
+        "get_chart_cache_dir": ".chart_cache",
+        "get_chart_cache_mode": ".chart_cache",
+        "get_chart_digest": ".chart_cache",
+        "get_local_chart": ".chart_cache",
+        "find_pinned_charts": ".pinned_charts",
+    },
+)
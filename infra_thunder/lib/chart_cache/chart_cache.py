@@ -0,0 +1,281 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from functools import cache
+from pathlib import Path, PurePosixPath
+from typing import Optional
+from urllib.parse import urljoin
+from urllib.request import urlopen
+
+import yaml
+
+from infra_thunder.lib.utils import get_cache_dir
+from .constants import CHART_CACHE_DIR_ENV, CHART_CACHE_ENV, CHART_CACHE_NAME, DOWNLOAD_TIMEOUT, REPO_INDEX_FILE
+
+logger = logging.getLogger(__name__)
+
+# the indexes of some repositories are tens of megabytes, the C loader parses them much faster
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class ChartCacheMode(Enum):
+    ON = "on"
+    """Render charts from the cache, downloading the missing ones (default)"""
+
+    OFFLINE = "offline"
+    """Render charts from the cache, failing when one is missing"""
+
+    OFF = "off"
+    """Let Helm fetch every chart from its repository"""
+
+
+class ChartCacheException(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ChartReference:
+    """A pinned chart version in a Helm chart repository"""
+
+    repo: str
+    """URL of the chart repository"""
+
+    chart: str
+    """Name of the chart"""
+
+    version: str
+    """Version of the chart"""
+
+    def __str__(self):
+        return f"{self.chart}@{self.version} ({self.repo})"
+
+    @property
+    def key(self) -> str:
+        """Hex digest identifying the reference in the cache"""
+        document = json.dumps([self.repo.rstrip("/"), self.chart, self.version])
+        return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def get_chart_cache_mode() -> ChartCacheMode:
+    """
+    Read the chart cache mode from the `THUNDER_CHART_CACHE` environment variable
+
+    :return: ChartCacheMode
+    """
+    value = os.getenv(CHART_CACHE_ENV) or ChartCacheMode.ON.value
+    try:
+        return ChartCacheMode(value.lower())
+    except ValueError:
+        raise ValueError(f"`{CHART_CACHE_ENV}` must be one of {[mode.value for mode in ChartCacheMode]}, got `{value}`")
+
+
+def get_chart_cache_dir() -> Optional[Path]:
+    """
+    Find the chart cache directory: `THUNDER_CHART_CACHE_DIR`, or ``.thunder-cache/charts``
+
+    :return: Path to the chart cache directory, or None if no location could be determined
+    """
+    if override := os.getenv(CHART_CACHE_DIR_ENV):
+        return Path(override).absolute()
+
+    return get_cache_dir(CHART_CACHE_NAME)
+
+
+def _download(url: str) -> bytes:
+    with urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def _extract(archive: bytes, destination: Path) -> None:
+    """Extract a chart archive, refusing members that would land outside of the destination"""
+    with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as tar:
+        for member in tar.getmembers():
+            path = PurePosixPath(member.name)
+            if path.is_absolute() or ".." in path.parts or not (member.isfile() or member.isdir()):
+                raise ChartCacheException(f"refusing to extract `{member.name}` from chart archive")
+        tar.extractall(destination)
+
+
+class ChartCache:
+    """
+    Content-addressed store of Helm chart archives, and of the charts extracted from them.
+
+    - ``refs/{key}.json`` maps a (repo, chart, version) reference to the SHA-256 digest of its archive
+    - ``blobs/{digest}.tgz`` is the archive as downloaded from the repository
+    - ``charts/{digest}/{chart}`` is the extracted chart, which ``helm template`` renders like any local chart
+
+    Archives are verified against the digest listed in the repository index before they are stored, and entries are
+    written to a temporary path and renamed, so concurrent programs never see a partial chart.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._indexes: dict[str, dict] = {}
+        self._index_locks: dict[str, threading.Lock] = {}
+
+    def _get_repo_index(self, repo: str) -> dict:
+        """Download the index of a chart repository, once per repository"""
+        with self._index_locks.setdefault(repo, threading.Lock()):
+            if repo not in self._indexes:
+                index_url = urljoin(f"{repo.rstrip('/')}/", REPO_INDEX_FILE)
+                self._indexes[repo] = yaml.load(_download(index_url), Loader=_YamlLoader) or {}
+
+            return self._indexes[repo]
+
+    def _get_ref_path(self, ref: ChartReference) -> Path:
+        return self.path / "refs" / f"{ref.key}.json"
+
+    def _get_blob_path(self, digest: str) -> Path:
+        return self.path / "blobs" / f"{digest}.tgz"
+
+    def _get_chart_path(self, ref: ChartReference, digest: str) -> Path:
+        return self.path / "charts" / digest / ref.chart
+
+    def _read_digest(self, ref: ChartReference) -> Optional[str]:
+        try:
+            return json.loads(self._get_ref_path(ref).read_text())["digest"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            logger.debug("discarding unreadable chart cache entry for %s: %s", ref, e)
+            return None
+
+    def _write_atomically(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def _unpack(self, ref: ChartReference, digest: str) -> Optional[Path]:
+        """Extract a stored archive, unless it already is. Returns None if the archive is missing or corrupt."""
+        chart_path = self._get_chart_path(ref, digest)
+        if chart_path.is_dir():
+            return chart_path
+
+        try:
+            archive = self._get_blob_path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        if hashlib.sha256(archive).hexdigest() != digest:
+            logger.warning("discarding corrupt chart archive for %s", ref)
+            return None
+
+        self._extract_atomically(ref, archive, chart_path)
+        return chart_path
+
+    def _extract_atomically(self, ref: ChartReference, archive: bytes, chart_path: Path) -> None:
+        chart_path.parent.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{chart_path.parent.name}.", dir=chart_path.parent.parent))
+        try:
+            _extract(archive, tmp_dir)
+            if not (tmp_dir / ref.chart).is_dir():
+                raise ChartCacheException(f"chart archive for {ref} doesn't contain a `{ref.chart}` directory")
+            os.rename(tmp_dir, chart_path.parent)
+        except OSError:
+            # another program extracted the same archive first
+            if not chart_path.is_dir():
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def get(self, ref: ChartReference) -> Optional[Path]:
+        """
+        Find a chart in the cache, without downloading anything
+
+        :param ref: The chart reference
+        :return: Path to the extracted chart, or None if it isn't cached
+        """
+        digest = self._read_digest(ref)
+        return self._unpack(ref, digest) if digest else None
+
+    def fetch(self, ref: ChartReference) -> Path:
+        """
+        Download a chart from its repository, verify its digest and store it in the cache
+
+        :param ref: The chart reference
+        :return: Path to the extracted chart
+        """
+        entries = self._get_repo_index(ref.repo).get("entries", {}).get(ref.chart, [])
+        entry = next((entry for entry in entries if str(entry.get("version")) == ref.version), None)
+        if entry is None or not entry.get("urls"):
+            raise ChartCacheException(f"chart {ref} isn't listed in the repository index")
+
+        archive = _download(urljoin(f"{ref.repo.rstrip('/')}/", entry["urls"][0]))
+        digest = hashlib.sha256(archive).hexdigest()
+        if entry.get("digest") and entry["digest"] != digest:
+            raise ChartCacheException(f"digest mismatch for {ref}: expected {entry['digest']}, got {digest}")
+
+        self._write_atomically(self._get_blob_path(digest), archive)
+        chart_path = self._unpack(ref, digest)
+        self._write_atomically(self._get_ref_path(ref), json.dumps({**vars(ref), "digest": digest}).encode("utf-8"))
+
+        logger.info("cached chart %s (%s)", ref, digest[:12])
+        return chart_path
+
+    def get_or_fetch(self, ref: ChartReference) -> Path:
+        """
+        Find a chart in the cache, downloading it on a miss
+
+        :param ref: The chart reference
+        :return: Path to the extracted chart
+        """
+        return self.get(ref) or self.fetch(ref)
+
+
+@cache
+def _get_chart_cache(path: Path) -> ChartCache:
+    # shared by the charts of a program, so each repository index is downloaded once
+    return ChartCache(path)
+
+
+def get_local_chart(repo: str, chart: str, version: str) -> Optional[Path]:
+    """
+    Get a local copy of a pinned chart from the chart cache, so it can be rendered without contacting its repository.
+
+    The cache lives in ``.thunder-cache/charts`` in the SysEnv directory (see ``get_cache_dir``), and is controlled
+    by the ``THUNDER_CHART_CACHE`` environment variable:
+
+    - unset or ``on``: use the cache, downloading the charts that are missing
+    - ``offline``: use the cache, raising ``ChartCacheException`` for charts that are missing
+    - ``off``: bypass the cache, and let Helm fetch the chart
+
+    ``THUNDER_CHART_CACHE_DIR`` moves the cache elsewhere. Warm it with ``thunder charts prefetch``.
+
+    :param repo: URL of the chart repository
+    :param chart: Name of the chart
+    :param version: Version of the chart
+    :return: Path to the chart directory, or None if Helm should fetch the chart itself
+    """
+    mode = get_chart_cache_mode()
+    cache_dir = get_chart_cache_dir() if mode is not ChartCacheMode.OFF else None
+    if cache_dir is None:
+        return None
+
+    ref = ChartReference(repo, chart, version)
+    chart_cache = _get_chart_cache(cache_dir)
+
+    if mode is ChartCacheMode.OFFLINE:
+        if (chart_path := chart_cache.get(ref)) is None:
+            raise ChartCacheException(f"chart {ref} isn't cached, and `{CHART_CACHE_ENV}` is `offline`")
+        return chart_path
+
+    return chart_cache.get_or_fetch(ref)
+
+
+def get_chart_digest(chart_path: Path) -> str:
+    """
+    Get the digest of the archive a cached chart was extracted from
+
+    :param chart_path: Path to a chart, as returned by ``get_local_chart``
+    :return: SHA-256 hex digest
+    """
+    return chart_path.parent.name
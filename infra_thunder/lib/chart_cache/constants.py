@@ -0,0 +1,17 @@
+CHART_CACHE_ENV = "THUNDER_CHART_CACHE"
+"""Environment variable controlling the chart cache. Unset for normal use, `offline` to never download, `off` to bypass."""
+
+CHART_CACHE_DIR_ENV = "THUNDER_CHART_CACHE_DIR"
+"""Environment variable overriding the chart cache directory, so it can be shared between SysEnvs and CI jobs"""
+
+CHART_CACHE_NAME = "charts"
+"""Name of the chart cache directory under the Thunder cache directory"""
+
+REPO_INDEX_FILE = "index.yaml"
+"""Index of a Helm chart repository, listing the versions of its charts with their URL and digest"""
+
+DOWNLOAD_TIMEOUT = 60
+"""Seconds to wait for a chart repository to answer"""
+
+DEFAULT_PREFETCH_JOBS = 8
+"""Number of charts `thunder charts prefetch` downloads concurrently"""
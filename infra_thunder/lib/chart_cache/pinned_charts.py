@@ -0,0 +1,57 @@
+import ast
+from pathlib import Path
+from typing import Any, Iterator
+
+import yaml
+
+import infra_thunder
+from .chart_cache import ChartReference
+
+_package_path = Path(infra_thunder.__file__).parent
+
+_REFERENCE_FIELDS = ("repo", "chart", "version")
+
+
+def _get_literal_charts(tree: ast.Module) -> Iterator[ChartReference]:
+    """Find calls like ``HelmChart(chart="cilium", repo="https://helm.cilium.io/", version="1.9.0", ...)``"""
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and getattr(node.func, "id", None) == "HelmChart"):
+            continue
+
+        fields = {
+            keyword.arg: keyword.value.value
+            for keyword in node.keywords
+            if keyword.arg in _REFERENCE_FIELDS and isinstance(keyword.value, ast.Constant)
+        }
+        if len(fields) == len(_REFERENCE_FIELDS):
+            yield ChartReference(**fields)
+
+
+def _get_config_charts(value: Any) -> Iterator[ChartReference]:
+    """Find the charts added by a stack's configuration, like ``extra_helm_charts`` of ``k8s-controllers``"""
+    if isinstance(value, dict):
+        if all(isinstance(value.get(name), str) for name in _REFERENCE_FIELDS):
+            yield ChartReference(**{name: value[name] for name in _REFERENCE_FIELDS})
+        for item in value.values():
+            yield from _get_config_charts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _get_config_charts(item)
+
+
+def find_pinned_charts(stack_files: list[Path]) -> set[ChartReference]:
+    """
+    Find the charts Thunder modules may render: those pinned in the source of ``infra_thunder``, and those added by
+    the configuration of the given stacks. Nothing is imported, so this works outside of a Pulumi program.
+
+    :param stack_files: Paths to ``Pulumi.<stack>.yaml`` files
+    :return: Set of chart references
+    """
+    charts = set()
+    for file in sorted(_package_path.rglob("*.py")):
+        charts.update(_get_literal_charts(ast.parse(file.read_text(), filename=str(file))))
+
+    for stack_file in stack_files:
+        charts.update(_get_config_charts((yaml.safe_load(stack_file.read_text()) or {}).get("config")))
+
+    return charts
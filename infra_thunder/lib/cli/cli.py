@@ -1,13 +1,40 @@
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from operator import itemgetter
+from pathlib import Path
 
-import boto3
 import click
 from click_option_group import optgroup, RequiredMutuallyExclusiveOptionGroup
 
-ec2 = boto3.client("ec2")
-autoscaling = boto3.client("autoscaling")
+from infra_thunder.lib import orchestrator
+from infra_thunder.lib.chart_cache import CHART_CACHE_DIR_ENV, CHART_CACHE_NAME, DEFAULT_PREFETCH_JOBS
+from infra_thunder.lib.orchestrator import (
+    discover_stacks,
+    StackGraph,
+    StackOperation,
+    StackResult,
+    StackStatus,
+)
+from infra_thunder.lib.orchestrator.constants import DEFAULT_JOBS, STACK_FILE_GLOB
+from infra_thunder.lib.utils import run_once
+from infra_thunder.lib.utils.get_cache_dir import CACHE_DIR_ENV, DEFAULT_CACHE_DIR_NAME
+
+
+@run_once
+def _get_ec2_client():
+    # boto3 is imported on first use, so commands that don't talk to AWS start quickly
+    import boto3
+
+    return boto3.client("ec2")
+
+
+@run_once
+def _get_autoscaling_client():
+    import boto3
+
+    return boto3.client("autoscaling")
 
 
 def echo_key_value(key, value):
@@ -49,6 +76,8 @@ def cli(debug):
 def terminate_instance(id, ip, replace, yes):
     instance_id = id
     ip_address = ip
+    ec2 = _get_ec2_client()
+    autoscaling = _get_autoscaling_client()
 
     click.echo()
 
@@ -136,6 +165,148 @@ def terminate_instance(id, ip, replace, yes):
         echo_key_value("Status Code", status_code)
 
 
+@cli.group()
+def stacks():
+    """Run the stacks of a SysEnv in dependency order"""
+
+
+def _get_stack_graph(sysenv_dir: str, provider: str, selected: tuple[str]) -> StackGraph:
+    sysenv_stacks = discover_stacks(Path(sysenv_dir), provider)
+
+    unknown = set(selected) - set(sysenv_stacks)
+    if unknown:
+        raise click.BadParameter(f"unknown stacks {sorted(unknown)}", param_hint="--stack")
+
+    return StackGraph(stack for name, stack in sysenv_stacks.items() if not selected or name in selected)
+
+
+_sysenv_dir_argument = click.argument(
+    "sysenv_dir", default=".", type=click.Path(exists=True, file_okay=False, dir_okay=True)
+)
+_provider_option = click.option(
+    "--provider", default="aws", show_default=True, help="SysEnv provider, as passed to `run_active_stack`"
+)
+_stack_option = click.option(
+    "-s",
+    "--stack",
+    "selected",
+    multiple=True,
+    help="Only run this stack (repeatable). Stacks it references are assumed to be deployed.",
+)
+
+
+@stacks.command()
+@_sysenv_dir_argument
+@_provider_option
+@_stack_option
+def graph(sysenv_dir, provider, selected):
+    """Show the stacks of a SysEnv, grouped in waves that can run concurrently"""
+    stack_graph = _get_stack_graph(sysenv_dir, provider, selected)
+
+    for i, wave in enumerate(stack_graph.waves, start=1):
+        click.echo(click.style(f"wave {i}:", fg="green", bold=True))
+        for name in wave:
+            dependencies = ", ".join(sorted(stack_graph.dependencies[name]))
+            click.echo(f"  {name}" + (f" (after {dependencies})" if dependencies else ""))
+
+
+def _echo_result(result: StackResult) -> None:
+    color = {StackStatus.SUCCEEDED: "green", StackStatus.FAILED: "red", StackStatus.SKIPPED: "yellow"}[result.status]
+    message = f"[{result.name}] {result.status.value} in {result.duration:.0f}s"
+    click.echo(click.style(message, fg=color, bold=True) + (f": {result.error}" if result.error else ""))
+
+
+@stacks.command(name="run")
+@_sysenv_dir_argument
+@_provider_option
+@_stack_option
+@click.option(
+    "--operation",
+    type=click.Choice([operation.value for operation in StackOperation]),
+    default=StackOperation.PREVIEW.value,
+    show_default=True,
+    help="Preview or update the stacks",
+)
+@click.option("-j", "--jobs", default=DEFAULT_JOBS, show_default=True, help="Maximum number of concurrent stacks")
+@click.option("-y", "--yes", help="Answer yes to all questions", is_flag=True)
+def run_stacks_command(sysenv_dir, provider, selected, operation, jobs, yes):
+    """Preview or update the stacks of a SysEnv, running independent stacks concurrently"""
+    stack_graph = _get_stack_graph(sysenv_dir, provider, selected)
+    operation = StackOperation(operation)
+
+    echo_key_value("Stacks", len(stack_graph.stacks))
+    echo_key_value("Waves", len(stack_graph.waves))
+    echo_key_value("Operation", operation.value)
+    click.echo()
+
+    if operation is StackOperation.UP and not (yes or click.confirm("Do you want to continue?")):
+        return
+
+    start = time.monotonic()
+    # the Automation API is only imported when stacks actually run
+    results = orchestrator.run_stacks(
+        Path(sysenv_dir),
+        stack_graph,
+        operation,
+        jobs=jobs,
+        on_output=lambda name, line: click.echo(f"[{name}] {line.rstrip()}"),
+        on_result=_echo_result,
+    )
+
+    click.echo()
+    echo_key_value("Wall-clock time", f"{time.monotonic() - start:.0f}s")
+    for status in StackStatus:
+        echo_key_value(status.value.capitalize(), sum(result.status is status for result in results.values()))
+
+    if any(result.status is not StackStatus.SUCCEEDED for result in results.values()):
+        raise click.exceptions.Exit(1)
+
+
+@cli.group()
+def charts():
+    """Manage the local cache of the Helm charts Thunder modules render"""
+
+
+def _get_chart_cache_dir(sysenv_dir: str) -> Path:
+    """Find the chart cache of a SysEnv the way the Pulumi program run from it would"""
+    if override := os.getenv(CHART_CACHE_DIR_ENV):
+        return Path(override).absolute()
+    elif override := os.getenv(CACHE_DIR_ENV):
+        return Path(override).absolute() / CHART_CACHE_NAME
+
+    return Path(sysenv_dir).absolute() / DEFAULT_CACHE_DIR_NAME / CHART_CACHE_NAME
+
+
+@charts.command()
+@_sysenv_dir_argument
+@click.option("-j", "--jobs", default=DEFAULT_PREFETCH_JOBS, show_default=True, help="Maximum concurrent downloads")
+def prefetch(sysenv_dir, jobs):
+    """Download the pinned Helm charts into the chart cache, so previews can render them offline"""
+    # the chart cache is only imported when it is used
+    from infra_thunder.lib.chart_cache import ChartCache, find_pinned_charts
+
+    cache = ChartCache(_get_chart_cache_dir(sysenv_dir))
+    pinned_charts = sorted(find_pinned_charts(sorted(Path(sysenv_dir).rglob(STACK_FILE_GLOB))), key=str)
+
+    echo_key_value("Chart cache", cache.path)
+    echo_key_value("Charts", len(pinned_charts))
+    click.echo()
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(cache.get_or_fetch, ref): ref for ref in pinned_charts}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                click.echo(click.style("cached ", fg="green", bold=True) + str(futures[future]))
+            except Exception as e:
+                failed += 1
+                click.echo(click.style("failed ", fg="red", bold=True) + f"{futures[future]}: {e}")
+
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
 def run():
     exit(cli())
 
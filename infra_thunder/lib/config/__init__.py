@@ -1,3 +1,4 @@
+from infra_thunder.lib.utils import lazy_exports
 from .core import (
     get_sysenv,
     get_purpose,
@@ -5,13 +6,18 @@ from .core import (
     get_provider_and_region,
     get_stack,
     get_project,
-    tag_namespace,
-    tag_prefix,
-    team,
     get_internal_sysenv_domain,
     get_public_sysenv_domain,
     get_provider_override,
     get_public_base_domain,
+    get_tag_namespace,
+    get_tag_prefix,
+    get_team,
 )
+from .decoder import ConfigDecodeError, decode_config
 from .mapper import get_stack_config
 from .thunder_env import thunder_env
+
+
+# `tag_namespace`, `tag_prefix` and `team` read Thunder.common.yaml, so they are resolved on first access
+__getattr__ = lazy_exports(__name__, {"tag_namespace": ".core", "tag_prefix": ".core", "team": ".core"})
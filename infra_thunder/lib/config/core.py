@@ -1,24 +1,55 @@
 from typing import Optional
 from pulumi import Config, get_stack, get_project
 
-from infra_thunder.lib.utils import run_once
+from infra_thunder.lib.utils import lazy_attributes, run_once
 from .thunder_env import thunder_env
 
-aws_config = Config("aws")
-azure_config = Config("azure-native")
-thunder_config = Config("thunder")
 
-tag_namespace = thunder_env.get("tag_namespace", "thunder")
-"""Resources created using the tagging libraries Thunder provides use this to prefix the standard tags.
-   This differs from the `CONFIG_NAMESPACE`, as this is used for the actual resources, not the Pulumi config itself.
-"""
+@run_once
+def _get_aws_config() -> Config:
+    return Config("aws")
+
+
+@run_once
+def _get_azure_config() -> Config:
+    return Config("azure-native")
+
+
+@run_once
+def _get_thunder_config() -> Config:
+    return Config("thunder")
+
+
+def get_tag_namespace() -> str:
+    """Resources created using the tagging libraries Thunder provides use this to prefix the standard tags.
+    This differs from the `CONFIG_NAMESPACE`, as this is used for the actual resources, not the Pulumi config itself.
+    """
+    return thunder_env.get("tag_namespace", "thunder")
+
+
+def get_tag_prefix() -> str:
+    """Prefix of the standard tag keys, like `thunder:`"""
+    return f"{get_tag_namespace()}{thunder_env.get('tag_separator', ':')}"
+
+
+def get_team() -> str:
+    """Team responsible for the resources created in this SysEnv"""
+    return thunder_env.require("team")
 
-tag_prefix = f"{tag_namespace}{thunder_env.get('tag_separator', ':')}"
 
-stack = get_stack()
-project = get_project()
+LAZY_ATTRIBUTES = {
+    "aws_config": _get_aws_config,
+    "azure_config": _get_azure_config,
+    "thunder_config": _get_thunder_config,
+    "tag_namespace": get_tag_namespace,
+    "tag_prefix": get_tag_prefix,
+    "stack": get_stack,
+    "project": get_project,
+    "team": get_team,
+}
+"""Module attributes computed on first access, so importing this module doesn't load any configuration"""
 
-team = thunder_env.require("team")
+__getattr__ = lazy_attributes(__name__, LAZY_ATTRIBUTES)
 
 
 def get_provider_and_region():
@@ -26,8 +57,8 @@ def get_provider_and_region():
     Retrieve the provider and region for this program
     :return: (provider, region)
     """
-    aws_region = aws_config.get("region")
-    azure_region = azure_config.get("location")
+    aws_region = _get_aws_config().get("region")
+    azure_region = _get_azure_config().get("location")
 
     if aws_region:
         return "aws", aws_region
@@ -81,7 +112,7 @@ def get_internal_sysenv_domain():
 
     :return:
     """
-    return f"{get_sysenv()}.{tag_namespace}"
+    return f"{get_sysenv()}.{get_tag_namespace()}"
 
 
 def get_public_base_domain() -> str:
@@ -106,4 +137,4 @@ def get_provider_override() -> Optional[str]:
 
     :return: bool
     """
-    return thunder_config.get("provider")
+    return _get_thunder_config().get("provider")
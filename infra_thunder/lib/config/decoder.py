@@ -0,0 +1,271 @@
+import dataclasses
+import types
+from collections import abc
+from enum import Enum
+from typing import Any, Callable, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+
+T = TypeVar("T")
+
+Converter = Callable[[Any, str, list[str]], Any]
+"""Converts a value found at a path of the config, appending what's wrong with it to a list of errors"""
+
+_UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+"""``Optional[X]`` and ``Union[X, Y]``, and ``X | Y`` on Python 3.10+"""
+
+_SEQUENCE_TYPES = (list, tuple, set, frozenset, abc.Sequence, abc.MutableSequence, abc.Set, abc.Collection)
+_MAPPING_TYPES = (dict, abc.Mapping, abc.MutableMapping)
+
+_MISSING = dataclasses.MISSING
+
+_NONE_TYPE = type(None)
+"""The member ``Optional[X]`` adds to ``X``"""
+
+_converters: dict[Any, Converter] = {}
+"""Converter of each type, compiled the first time the type is decoded"""
+
+
+class ConfigDecodeError(ValueError):
+    """A config doesn't match its dataclass. Holds every error found, not just the first one."""
+
+    def __init__(self, config_cls: type, errors: list[str]):
+        self.errors = errors
+        details = "\n".join(f"  - {error}" for error in errors)
+        super().__init__(f"invalid config for `{config_cls.__name__}`, {len(errors)} error(s):\n{details}")
+
+
+@dataclasses.dataclass(frozen=True)
+class _Field:
+    name: str
+    """Name of the dataclass field, and key of its value in the config"""
+
+    convert: Converter
+    """Converter of the field's type"""
+
+    default: Callable[[], Any]
+    """Returns the value of the field when it's not in the config, or ``_MISSING`` if it's required"""
+
+    init: bool
+    """Whether the field is an argument of ``__init__``, or set on the instance after it's created"""
+
+
+def decode_config(config_cls: Type[T], data: dict[str, Any]) -> T:
+    """
+    Map a config dict to its dataclass, like ``dacite.from_dict(config=Config(cast=[Enum], strict=True))`` does:
+
+    - keys that aren't fields of the dataclass are errors
+    - missing fields take their default, ``None`` if they are Optional, and are errors otherwise
+    - Enums are cast from their values
+    - every other value must be an instance of its type (or of the origin of a generic type, like ``list``)
+
+    The converter of each dataclass is compiled once, from its type hints, and reused for every config of that type.
+    Every error is reported at once, with the path of the value.
+
+    :param config_cls: The dataclass of the config
+    :param data: The config
+    :raises ConfigDecodeError: If the config doesn't match the dataclass
+    :return: The config, as an instance of the dataclass
+    """
+    errors: list[str] = []
+    config = _compile(config_cls)(data, "", errors)
+    if errors:
+        raise ConfigDecodeError(config_cls, errors)
+
+    return config
+
+
+def _compile(type_: Any) -> Converter:
+    try:
+        return _converters[type_]
+    except KeyError:
+        pass
+
+    if dataclasses.is_dataclass(type_):
+        # stands in for the converter while the fields are compiled, for dataclasses that refer to themselves
+        _converters[type_] = lambda value, path, errors: _converters[type_](value, path, errors)
+
+    converter = _compile_type(type_)
+    _converters[type_] = converter
+    return converter
+
+
+def _compile_type(type_: Any) -> Converter:
+    origin = get_origin(type_)
+    if type_ is Any:
+        return _convert_any
+    elif origin in _UNION_TYPES:
+        return _compile_union(get_args(type_))
+    elif dataclasses.is_dataclass(type_):
+        return _compile_dataclass(type_)
+    elif origin in _SEQUENCE_TYPES:
+        return _compile_sequence(origin, get_args(type_))
+    elif origin in _MAPPING_TYPES:
+        return _compile_mapping(origin, get_args(type_))
+
+    return _compile_plain(type_, origin)
+
+
+def _convert_any(value: Any, _path: str, _errors: list[str]) -> Any:
+    return value
+
+
+def _compile_union(args: tuple) -> Converter:
+    optional = _NONE_TYPE in args
+    members = [arg for arg in args if arg is not _NONE_TYPE]
+    # Optional[X]: X reports its own errors
+    convert_member = _compile(members[0]) if len(members) == 1 else _compile_members(members)
+
+    def convert_union(value: Any, path: str, errors: list[str]) -> Any:
+        if value is None and optional:
+            return None
+        return convert_member(value, path, errors)
+
+    return convert_union
+
+
+def _compile_members(members: list) -> Converter:
+    converters = [_compile(member) for member in members]
+
+    def convert_members(value: Any, path: str, errors: list[str]) -> Any:
+        # the first member the value converts to without errors, like dacite
+        for convert in converters:
+            member_errors: list[str] = []
+            converted = convert(value, path, member_errors)
+            if not member_errors:
+                return converted
+
+        errors.append(f"{_label(path)}: expected one of {_format_types(members)}, got {type(value).__name__}")
+        return value
+
+    return convert_members
+
+
+def _compile_dataclass(cls: type) -> Converter:
+    hints = get_type_hints(cls)
+    fields = [
+        _Field(field.name, _compile(hints[field.name]), _get_default(field, hints[field.name]), field.init)
+        for field in dataclasses.fields(cls)
+    ]
+    names = frozenset(field.name for field in fields)
+
+    def convert_dataclass(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, abc.Mapping):
+            errors.append(f"{_label(path)}: expected a mapping for `{cls.__name__}`, got {type(value).__name__}")
+            return value
+
+        errors.extend(f"{_label(_join(path, key))}: unexpected key" for key in value if key not in names)
+        error_count = len(errors)
+        values = [(field, _get_field_value(field, value, path, errors)) for field in fields]
+        if len(errors) > error_count:
+            return value
+
+        instance = cls(**{field.name: v for field, v in values if field.init and v is not _MISSING})
+        for field, v in values:
+            if not field.init and v is not _MISSING:
+                setattr(instance, field.name, v)
+        return instance
+
+    return convert_dataclass
+
+
+def _get_default(field: dataclasses.Field, type_: Any) -> Callable[[], Any]:
+    if field.default is not _MISSING:
+        return lambda: field.default
+    elif field.default_factory is not _MISSING:
+        return field.default_factory
+    elif get_origin(type_) in _UNION_TYPES and _NONE_TYPE in get_args(type_):
+        return lambda: None
+
+    return lambda: _MISSING
+
+
+def _get_field_value(field: _Field, data: abc.Mapping, path: str, errors: list[str]) -> Any:
+    if field.name in data:
+        return field.convert(data[field.name], _join(path, field.name), errors)
+
+    value = field.default()
+    # fields that aren't arguments of `__init__` are left to `__post_init__`
+    if value is _MISSING and field.init:
+        errors.append(f"{_label(_join(path, field.name))}: missing value")
+    return value
+
+
+def _compile_sequence(origin: type, args: tuple) -> Converter:
+    if origin is tuple and args and args[-1] is not Ellipsis:
+        return _compile_fixed_tuple(args)
+
+    convert_item = _compile(args[0]) if args else _convert_any
+
+    def convert_sequence(value: Any, path: str, errors: list[str]) -> Any:
+        # strings are sequences too, but never the list a config expects
+        if not isinstance(value, origin) or isinstance(value, str):
+            errors.append(f"{_label(path)}: expected a {origin.__name__}, got {type(value).__name__}")
+            return value
+        return value.__class__(convert_item(item, f"{path}[{i}]", errors) for i, item in enumerate(value))
+
+    return convert_sequence
+
+
+def _compile_fixed_tuple(args: tuple) -> Converter:
+    converters = [_compile(arg) for arg in args]
+
+    def convert_tuple(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, tuple) or len(value) != len(converters):
+            errors.append(f"{_label(path)}: expected a tuple of {len(converters)} items, got {type(value).__name__}")
+            return value
+        return tuple(convert(item, f"{path}[{i}]", errors) for i, (convert, item) in enumerate(zip(converters, value)))
+
+    return convert_tuple
+
+
+def _compile_mapping(origin: type, args: tuple) -> Converter:
+    convert_key, convert_value = (_compile(args[0]), _compile(args[1])) if args else (_convert_any, _convert_any)
+
+    def convert_mapping(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, origin):
+            errors.append(f"{_label(path)}: expected a {origin.__name__}, got {type(value).__name__}")
+            return value
+        return value.__class__(
+            (convert_key(k, _join(path, k), errors), convert_value(v, _join(path, k), errors)) for k, v in value.items()
+        )
+
+    return convert_mapping
+
+
+def _compile_plain(type_: Any, origin: Any) -> Converter:
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        return _compile_enum(type_)
+
+    # other generics, like `Type[X]` or `Callable[..., X]`, are only checked against their origin
+    expected = origin or type_
+
+    def convert_plain(value: Any, path: str, errors: list[str]) -> Any:
+        if not isinstance(value, expected):
+            errors.append(f"{_label(path)}: expected {_format_types([type_])}, got {type(value).__name__}")
+        return value
+
+    return convert_plain
+
+
+def _compile_enum(enum_cls: Type[Enum]) -> Converter:
+    choices = ", ".join(str(member.value) for member in enum_cls)
+
+    def convert_enum(value: Any, path: str, errors: list[str]) -> Any:
+        try:
+            return enum_cls(value)
+        except ValueError:
+            errors.append(f"{_label(path)}: `{value}` is not a valid {enum_cls.__name__}, expected one of {choices}")
+            return value
+
+    return convert_enum
+
+
+def _join(path: str, key: Any) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+def _label(path: str) -> str:
+    return f"`{path}`" if path else "config"
+
+
+def _format_types(types_: list) -> str:
+    return ", ".join(getattr(type_, "__name__", str(type_)) for type_ in types_)
@@ -1,11 +1,13 @@
 import json
-from enum import Enum
 from typing import Type, Any
 
-from dacite import from_dict, Config
 from pulumi import log, runtime
 
 from infra_thunder.lib.base import ConfigType
+from .decoder import decode_config
+
+JSON_FIRST_CHARACTERS = frozenset('{["-0123456789tfnNI')
+"""Characters a JSON document can start with (``NaN`` and ``Infinity`` included): other values are plain strings"""
 
 
 def _parse_args_value(value: Any) -> Any:
@@ -14,6 +16,10 @@ def _parse_args_value(value: Any) -> Any:
     :param value: A potential json string
     :return: Parsed json object or raw arg
     """
+    # most values are plain strings, which don't need to go through the parser to fail
+    if not isinstance(value, str) or value.lstrip()[:1] not in JSON_FIRST_CHARACTERS:
+        return value
+
     try:
         return json.loads(value)
     except json.decoder.JSONDecodeError:
@@ -44,22 +50,17 @@ def get_raw_stack_config(stack: str) -> dict:
 def get_stack_config(stack: str, config_cls: Type[ConfigType]) -> ConfigType:
     """Get a stack config in dataclass form
 
-    Uses `dacite <https://github.com/konradhalas/dacite>`_ to map dict to dataclass.
+    Uses ``decode_config`` to map dict to dataclass, with the same rules as
+    `dacite <https://github.com/konradhalas/dacite>`_ in strict mode.
 
     :param stack: Name of the stack
     :param config_cls: The dataclass for the config
+    :raises ConfigDecodeError: With every error of the stack config, if it doesn't match the dataclass
     :return: The stack config expressed in the module's config dataclass
     """
     raw_config = get_raw_stack_config(stack)
 
-    config = from_dict(
-        data_class=config_cls,
-        data=raw_config,
-        config=Config(
-            cast=[Enum],
-            strict=True,
-        ),
-    )
+    config = decode_config(config_cls, raw_config)
 
     log.debug(f"config for stack `{stack}` is {config}")
 
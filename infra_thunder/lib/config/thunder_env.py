@@ -1,12 +1,19 @@
+import hashlib
 import logging
+import os
+import pickle
 import sys
 from collections import UserDict
 from pathlib import Path
+from typing import Optional
 
-import hiyapyco
+from infra_thunder.lib.utils import get_cache_dir
 
 logger = logging.getLogger(__name__)
 
+CONFIG_CACHE_NAME = "config"
+"""Name of the on-disk cache holding merged configurations"""
+
 
 class ThunderConfigException(Exception):
     def __init__(self, key):
@@ -16,11 +23,14 @@ class ThunderConfigException(Exception):
 class HierarchicalConfig(UserDict):
     """
     HierarchicalConfig is a UserDict that automatically loads configuration from a tiered set of config files.
+    Configuration is loaded on first access, so importing this module doesn't read or merge anything.
 
     This class will load `Thunder.common.yaml` from the directory where the entrypoint that calls this class, and will
     walk the filesystem upwards a configurable number of times to find other `Thunder.common.yaml` files.
 
     The discovered files will be merged using a YAML object merger (HiYaPyCo) that supports Jinja2 syntax.
+    The merged result is cached in ``.thunder-cache/config`` (see ``get_cache_dir``) and reused for as long as the
+    contributing files are unchanged, by mtime or by content.
 
     Typically, you won't use this class directly, and instead will
 
@@ -41,12 +51,55 @@ class HierarchicalConfig(UserDict):
         """
         super().__init__()
         self.filename = filename
-        configs = list(reversed(self._discover_configs(limit)))
+        self.limit = limit
+        # UserDict.__init__ assigns an empty dict, which must not count as loaded
+        self._data = None
+
+    @property
+    def data(self) -> dict:
+        """The merged configuration, loaded on first access"""
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+
+    @data.setter
+    def data(self, value: dict):
+        self._data = value
+
+    def _load(self) -> dict:
+        """
+        Merge the discovered configs, or reuse the result of a previous program if none of them changed
+
+        :return: Merged configuration
+        """
+        configs = list(reversed(self._discover_configs(self.limit)))
         logger.debug("Found configs in %s", configs)
-        loader = hiyapyco.load([str(path) for path in configs])
 
-        # expose the data from the loader as our UserDict backing store
-        self.data = loader
+        cache_path = self._get_cache_path(configs)
+        if cache_path is not None and (data := _read_cache(cache_path, configs)) is not None:
+            logger.debug("Loaded merged config from cache [%s]", cache_path)
+            return data
+
+        # HiYaPyCo (and Jinja2) are slow to import, and not needed when the cache is fresh
+        import hiyapyco
+
+        data = hiyapyco.load([str(path) for path in configs])
+
+        if cache_path is not None:
+            try:
+                _write_cache(cache_path, configs, data)
+            except Exception as e:
+                logger.warning("Unable to write config cache [%s]: %s", cache_path, e)
+
+        return data
+
+    def _get_cache_path(self, configs: list[Path]) -> Optional[Path]:
+        cache_dir = get_cache_dir(CONFIG_CACHE_NAME)
+        if cache_dir is None:
+            return None
+
+        key = hashlib.sha256("\n".join(str(path) for path in configs).encode("utf-8")).hexdigest()
+        return cache_dir / f"{key}.pickle"
 
     def require(self, key: str) -> any:
         """
@@ -104,5 +157,50 @@ class HierarchicalConfig(UserDict):
         return config_paths
 
 
-# Create our singleton object to avoid loading and merging configuration multiple times on import
+def _get_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _read_cache(cache_path: Path, configs: list[Path]) -> Optional[dict]:
+    """
+    Read a merged config from the cache, if every contributing file is unchanged
+
+    A file is unchanged if its mtime matches, or failing that (fresh checkout, ``touch``) if its content does.
+
+    :param cache_path: Path to the cache entry
+    :param configs: The contributing files, in merge order
+    :return: The merged config, or None if the entry is missing or stale
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            files, data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("Discarding unreadable config cache [%s]: %s", cache_path, e)
+        return None
+
+    if [path for path, _, _ in files] != [str(path) for path in configs]:
+        return None
+
+    unchanged = all(
+        config.stat().st_mtime_ns == mtime or _get_digest(config) == digest
+        for config, (_, mtime, digest) in zip(configs, files)
+    )
+    return data if unchanged else None
+
+
+def _write_cache(cache_path: Path, configs: list[Path], data: dict) -> None:
+    files = [(str(path), path.stat().st_mtime_ns, _get_digest(path)) for path in configs]
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file and rename it, so concurrent programs never read a partial entry
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump((files, data), f)
+    os.replace(tmp_path, cache_path)
+
+
+# Create our singleton object to avoid loading and merging configuration multiple times.
+# Nothing is loaded until the configuration is first read.
 thunder_env = HierarchicalConfig()
@@ -1,4 +1,4 @@
-from .create_policy import create_policy
+from .create_policy import create_policy, generate_statements
 from .generators.assumable_roles import generate_assumable_role_policy
 from .generators.ebs import generate_ebs_policy
 from .generators.ecr import generate_ecr_policy
@@ -7,5 +7,6 @@ from .generators.kubernetes_eni import generate_kubernetes_eni_policy
 from .generators.s3 import generate_s3_policy
 from .generators.ssm import generate_ssm_policy
 from .instance_policies import generate_instance_profile
+from .policy_packer import create_packed_policies, get_policy_size, merge_statements, pack_statements
 from .resource_interpolator import interpolate_resource
 from .types import RolePolicy, Statement
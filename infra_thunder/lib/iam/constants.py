@@ -0,0 +1,17 @@
+INLINE_POLICY_MAX_SIZE = 10240
+"""Characters, whitespace excluded, that the inline policies of a role can add up to"""
+
+MANAGED_POLICY_MAX_SIZE = 6144
+"""Characters, whitespace excluded, that a managed policy can hold"""
+
+MANAGED_POLICIES_PER_ROLE = 10
+"""Number of managed policies that can be attached to a role, with the default IAM quotas"""
+
+UNRESOLVED_VALUE_SIZE = 200
+"""
+Characters counted for a value that isn't known when packing, like the ARN of a bucket from another stack.
+ARNs of buckets, streams and queues are shorter than this.
+"""
+
+POLICY_VERSION = "2012-10-17"
+"""Version of the IAM policy language of packed policies"""
@@ -15,12 +15,22 @@ def create_policy(cls, policy: RolePolicy, role: iam.Role) -> iam.RolePolicy:
     """
     return iam.RolePolicy(
         policy.name,
-        policy={"Statement": list([_generate_statement(cls, statement) for statement in policy.statements])},
+        policy={"Statement": generate_statements(cls, policy)},
         role=role.id,
         opts=ResourceOptions(parent=role),
     )
 
 
+def generate_statements(cls, policy: RolePolicy) -> list[dict]:
+    """
+    Generate the statements of a RolePolicy, with their resources interpolated
+    :param cls: Calling class to interpolate from
+    :param policy:
+    :return: Statements of the policy document
+    """
+    return [_generate_statement(cls, statement) for statement in policy.statements]
+
+
 def _generate_statement(cls, statement: Statement) -> dict:
     return {
         "Effect": statement.Effect,
@@ -0,0 +1,178 @@
+import json
+from typing import Any, Optional
+
+from pulumi import Resource, ResourceOptions, log
+from pulumi_aws import iam
+
+from .constants import (
+    MANAGED_POLICIES_PER_ROLE,
+    MANAGED_POLICY_MAX_SIZE,
+    POLICY_VERSION,
+    UNRESOLVED_VALUE_SIZE,
+)
+
+
+def get_policy_size(value: Any) -> int:
+    """
+    Estimate the size IAM counts for a policy, or a part of it: its JSON without whitespace.
+    Values that aren't known yet, like Outputs, count as ``UNRESOLVED_VALUE_SIZE`` characters.
+
+    :param value: Policy document, statement or resource
+    :return: Number of characters
+    """
+    return len(json.dumps(value, separators=(",", ":"), default=lambda _: "x" * UNRESOLVED_VALUE_SIZE))
+
+
+def merge_statements(statements: list[dict]) -> list[dict]:
+    """
+    Merge the statements that have the same Effect and set of Actions, and nothing else that differs (like a
+    Condition), into one statement per set of Actions with the resources of all of them, without duplicates.
+
+    :param statements: Statements, with ``Action`` and ``Resource`` as a value or a list
+    :return: Merged statements, in the order each set of Actions first appears
+    """
+    merged: dict[str, dict] = {}
+    for statement in statements:
+        actions = sorted(set(_as_list(statement["Action"])))
+        key = json.dumps(
+            [{k: v for k, v in statement.items() if k not in ("Action", "Resource")}, actions],
+            sort_keys=True,
+            default=id,
+        )
+        merged.setdefault(key, {**statement, "Action": actions, "Resource": []})
+        merged[key]["Resource"] += _as_list(statement["Resource"])
+
+    for statement in merged.values():
+        statement["Resource"] = _deduplicate(statement["Resource"])
+
+    return list(merged.values())
+
+
+def pack_statements(statements: list[dict], max_size: int) -> list[list[dict]]:
+    """
+    Pack statements into as few policy documents of at most ``max_size`` characters as possible, first fit
+    decreasing. Statements too big for a document on their own are split over their resources.
+
+    :param statements: Statements to pack
+    :param max_size: Maximum size of a document, see ``get_policy_size``
+    :return: Statements of each document
+    """
+    budget = max_size - get_policy_size(get_policy_document([]))
+    statements = [split for statement in statements for split in _split_statement(statement, budget)]
+
+    documents: list[list[dict]] = []
+    sizes: list[int] = []
+    for statement in sorted(statements, key=get_policy_size, reverse=True):
+        # one more character for the comma separating it from the previous statement
+        size = get_policy_size(statement) + 1
+        index = next((i for i, used in enumerate(sizes) if used + size <= budget), len(documents))
+        if index == len(documents):
+            documents.append([])
+            sizes.append(0)
+        documents[index].append(statement)
+        sizes[index] += size
+
+    return documents
+
+
+def get_policy_document(statements: list[dict]) -> dict:
+    """
+    :param statements: Statements of the policy
+    :return: Policy document with the statements
+    """
+    return {"Version": POLICY_VERSION, "Statement": statements}
+
+
+def create_packed_policies(
+    name: str,
+    role: iam.Role,
+    policies: list[list[dict]],
+    max_inline_size: int = 0,
+    opts: Optional[ResourceOptions] = None,
+) -> list[Resource]:
+    """
+    Grant the statements of several policies to a role with as few resources as possible.
+
+    The statements are merged (see ``merge_statements``), and packed into managed policies attached to the role. They
+    are granted with a single inline policy instead when ``max_inline_size`` leaves room for it.
+
+    Managed policies are the default because they don't count against the role's inline policy quota (see
+    ``INLINE_POLICY_MAX_SIZE``): a role that has other inline policies can't go over it, and neither can a role whose
+    per-grant inline policies are replaced by packed ones, since Pulumi creates the new policies before it deletes the
+    old ones.
+
+    :param name: Name of the policy, or prefix of the managed policies
+    :param role: The role to grant the statements to
+    :param policies: Statements of each policy, as they would have been created one resource per policy
+    :param max_inline_size: What the statements can use of the role's inline policy quota, once its other inline
+        policies, and those being replaced, are counted. 0 to only use managed policies.
+    :param opts: Options of the policies, parented to the role by default
+    :return: The created resources
+    """
+    statements = merge_statements([statement for policy in policies for statement in policy])
+    if not statements:
+        return []
+
+    opts = ResourceOptions.merge(ResourceOptions(parent=role), opts)
+    document = get_policy_document(statements)
+    if get_policy_size(document) <= max_inline_size:
+        resources = [iam.RolePolicy(name, policy=document, role=role.id, opts=opts)]
+    else:
+        resources = _create_managed_policies(name, role, pack_statements(statements, MANAGED_POLICY_MAX_SIZE), opts)
+
+    log.info(f"{name}: {len(policies)} policies packed into {len(resources)} resources", resource=role)
+    return resources
+
+
+def _create_managed_policies(name: str, role: iam.Role, documents: list[list[dict]], opts: ResourceOptions):
+    if len(documents) > MANAGED_POLICIES_PER_ROLE:
+        raise ValueError(
+            f"{name} needs {len(documents)} managed policies, more than the {MANAGED_POLICIES_PER_ROLE} "
+            "that can be attached to a role"
+        )
+
+    resources = []
+    for i, statements in enumerate(documents):
+        policy = iam.Policy(f"{name}-{i}", policy=get_policy_document(statements), opts=opts)
+        attachment = iam.RolePolicyAttachment(
+            f"{name}-{i}", role=role.name, policy_arn=policy.arn, opts=ResourceOptions(parent=policy)
+        )
+        resources += [policy, attachment]
+
+    return resources
+
+
+def _split_statement(statement: dict, budget: int) -> list[dict]:
+    """Split a statement over its resources into statements that each fit in a document"""
+    if get_policy_size(statement) + 1 <= budget:
+        return [statement]
+
+    base_size = get_policy_size({**statement, "Resource": []}) + 1
+    chunks: list[list] = [[]]
+    used = base_size
+    for resource in statement["Resource"]:
+        size = get_policy_size(resource) + 1
+        if chunks[-1] and used + size > budget:
+            chunks.append([])
+            used = base_size
+        chunks[-1].append(resource)
+        used += size
+
+    return [{**statement, "Resource": chunk} for chunk in chunks]
+
+
+def _as_list(value: Any) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _deduplicate(resources: list) -> list:
+    """Remove duplicate resources. Outputs can't be compared before they resolve, so only the same Output is removed."""
+    seen = set()
+    unique = []
+    for resource in resources:
+        key = resource if isinstance(resource, str) else id(resource)
+        if key not in seen:
+            seen.add(key)
+            unique.append(resource)
+
+    return unique
@@ -0,0 +1,2 @@
+from .cached_invoke import cached_invoke, get_invoke_cache_mode, InvokeCacheMode
+from .constants import ACCOUNT_TTL, AMI_TTL, NETWORK_TTL, PREFIX_LIST_TTL, ZONE_TTL
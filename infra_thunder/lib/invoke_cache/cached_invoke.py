@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from pulumi import Config, Output, log
+
+from infra_thunder.lib.config import get_provider_and_region
+from infra_thunder.lib.utils import get_cache_dir
+from .constants import INVOKE_CACHE_ENV, INVOKE_CACHE_NAME
+
+InvokeResult = TypeVar("InvokeResult")
+
+
+class InvokeCacheMode(Enum):
+    ON = "on"
+    """Read from and write to the cache (default)"""
+
+    REFRESH = "refresh"
+    """Ignore existing entries, re-issue every invoke and write the results back"""
+
+    OFF = "off"
+    """Bypass the cache entirely"""
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def get_invoke_cache_mode() -> InvokeCacheMode:
+    """
+    Read the invoke cache mode from the `THUNDER_INVOKE_CACHE` environment variable
+
+    :return: InvokeCacheMode
+    """
+    value = os.getenv(INVOKE_CACHE_ENV) or InvokeCacheMode.ON.value
+    try:
+        return InvokeCacheMode(value.lower())
+    except ValueError:
+        raise ValueError(
+            f"`{INVOKE_CACHE_ENV}` must be one of {[mode.value for mode in InvokeCacheMode]}, got `{value}`"
+        )
+
+
+def _canonicalize(value: Any) -> Any:
+    """
+    Convert invoke arguments into a JSON-serializable structure that is stable between program runs.
+
+    Pulumi input types (``ec2.GetVpcFilterArgs`` and friends) keep their values in ``__dict__``, so they are expanded
+    along with their type name. Outputs can't be resolved synchronously, so calls using them are not cached.
+    """
+    if isinstance(value, Output):
+        raise _Uncacheable()
+    elif isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonicalize(v) for v in value]
+        return items if isinstance(value, (list, tuple)) else sorted(items, key=repr)
+    elif hasattr(value, "__dict__"):
+        return {"__type__": type(value).__qualname__, **_canonicalize(vars(value))}
+    else:
+        return value
+
+
+def _get_cache_key(func: Callable, kwargs: dict) -> str:
+    """
+    Build a content address for an invoke from the provider scope, the invoked function and its arguments
+
+    :param func: The pulumi data source function
+    :param kwargs: Arguments to the data source function
+    :return: Hex digest
+    """
+    provider, region = get_provider_and_region()
+    document = {
+        "scope": [provider, region, Config("aws").get("profile") or os.getenv("AWS_PROFILE")],
+        "function": f"{func.__module__}.{func.__qualname__}",
+        "args": _canonicalize(kwargs),
+    }
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _get_entry_path(func: Callable, kwargs: dict) -> Optional[Path]:
+    """
+    Find where the cache entry for an invoke lives
+
+    :param func: The pulumi data source function
+    :param kwargs: Arguments to the data source function
+    :return: Path to the entry, or None if this invoke should not be cached
+    """
+    cache_dir = get_cache_dir(INVOKE_CACHE_NAME)
+    if cache_dir is None or kwargs.get("opts") is not None:
+        return None
+
+    try:
+        key = _get_cache_key(func, kwargs)
+    except _Uncacheable:
+        return None
+
+    return cache_dir / key[:2] / f"{key}.pickle"
+
+
+def _read_entry(path: Path, ttl: timedelta) -> Optional[Any]:
+    try:
+        with open(path, "rb") as f:
+            created, result = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # a corrupt entry or a result type that changed shape between provider versions - treat as a miss
+        log.debug(f"discarding unreadable invoke cache entry `{path}`: {e}")
+        return None
+
+    if time.time() - created > ttl.total_seconds():
+        return None
+
+    return result
+
+
+def _write_entry(path: Path, result: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file and rename it, so concurrent programs never read a partial entry
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump((time.time(), result), f)
+    os.replace(tmp_path, path)
+
+
+def cached_invoke(func: Callable[..., InvokeResult], *, ttl: timedelta, **kwargs) -> InvokeResult:
+    """
+    Call a read-only Pulumi data source function, reusing the result of a previous program run if it is fresh enough.
+
+    Results are stored in ``.thunder-cache/invoke`` in the SysEnv directory (see ``get_cache_dir``), content-addressed
+    by the provider scope (provider, region and AWS profile), the invoked function and its arguments.
+
+    The cache is controlled by the ``THUNDER_INVOKE_CACHE`` environment variable:
+
+    - unset or ``on``: use and populate the cache
+    - ``refresh``: re-issue every invoke and overwrite the cached results
+    - ``off``: bypass the cache entirely
+
+    Calls passing explicit ``opts`` (a provider for another account) or ``Output`` arguments are never cached.
+    When running under ``pulumi.runtime.set_mocks``, point ``THUNDER_CACHE_DIR`` at a temporary directory or set
+    ``THUNDER_INVOKE_CACHE=off`` to keep the mocked results out of the SysEnv cache.
+
+    Example::
+
+        vpc = cached_invoke(ec2.get_vpc, ttl=NETWORK_TTL, filters=[...])
+
+    :param func: The pulumi data source function, like ``ec2.get_vpc``
+    :param ttl: How long a cached result stays valid
+    :param kwargs: Arguments to the data source function
+    :return: The result of ``func(**kwargs)``
+    """
+    mode = get_invoke_cache_mode()
+    path = _get_entry_path(func, kwargs) if mode is not InvokeCacheMode.OFF else None
+
+    if path is None:
+        return func(**kwargs)
+
+    if mode is InvokeCacheMode.ON and (result := _read_entry(path, ttl)) is not None:
+        log.debug(f"invoke cache hit for `{func.__qualname__}` ({path.stem[:12]})")
+        return result
+
+    result = func(**kwargs)
+
+    try:
+        _write_entry(path, result)
+    except Exception as e:
+        log.warn(f"unable to write invoke cache entry `{path}`: {e}")
+
+    return result
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+INVOKE_CACHE_ENV = "THUNDER_INVOKE_CACHE"
+"""Environment variable controlling the invoke cache. Unset for normal use, `refresh` to re-fetch, `off` to bypass."""
+
+INVOKE_CACHE_NAME = "invoke"
+"""Name of the invoke cache directory under the Thunder cache directory"""
+
+ACCOUNT_TTL = timedelta(days=7)
+"""Account-level lookups (caller identity, partition) only change if the profile points elsewhere"""
+
+NETWORK_TTL = timedelta(hours=12)
+"""VPCs, subnets and route tables are created once by the `vpc` stack and rarely change"""
+
+PREFIX_LIST_TTL = timedelta(hours=1)
+"""Prefix list entries are modified by the `transitgateway` stack"""
+
+AMI_TTL = timedelta(hours=1)
+"""AMI lookups use `most_recent`, so new images should be picked up reasonably quickly"""
+
+ZONE_TTL = timedelta(days=1)
+"""Route53 hosted zones are created once by the `route53` stack"""
@@ -1,38 +1,195 @@
+import asyncio
+import os
+import random
 import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+from urllib.parse import urlparse
 
 import yaml
-from kubernetes import client, config
+from kubernetes import config
 from kubernetes.client import ApiClient, Configuration, ApiException
-from pulumi import ComponentResource, Input, log, ResourceOptions
+from pulumi import ComponentResource, Input, Output, log, ResourceOptions
+from pulumi.runtime import is_dry_run
 from urllib3.exceptions import HTTPError
 
+from ..constants import (
+    KUBE_HEALTH_PATHS,
+    KUBE_WAIT_BACKOFF_BASE,
+    KUBE_WAIT_BACKOFF_MAX,
+    KUBE_WAIT_DEADLINE,
+    KUBE_WAIT_ENV,
+    KUBE_WAIT_PROBE_TIMEOUT,
+)
+
+
+@dataclass
+class KubeHealth:
+    healthy: list[str] = field(default_factory=list)
+    """API servers that answered their health probe"""
+
+    unhealthy: dict[str, str] = field(default_factory=dict)
+    """API servers that didn't answer before the quorum was reached or the deadline passed, with their last error"""
+
+    probed: bool = True
+    """False if the API servers weren't probed: during previews, or with `THUNDER_KUBE_WAIT=off`"""
+
 
 class KubeWaiter(ComponentResource):
-    def __init__(self, name: str, kubeconfig: Input[str], opts: ResourceOptions = None):
+    """
+    Waits for a quorum of the API servers of a cluster to be healthy, without blocking the Pulumi program.
+
+    Every API server is probed concurrently on ``/readyz`` (``/healthz`` on clusters that don't have it), retrying with
+    jittered exponential backoff until a quorum answered, or the deadline passed. The probes run on the program's event
+    loop, so other resources keep being registered while the API servers boot.
+
+    Use ``kubeconfig`` rather than the kubeconfig passed in, so that what is created with it waits for the cluster:
+
+    Example::
+
+        waiter = KubeWaiter("kube-waiter", kubeconfig, endpoints, opts=ResourceOptions(parent=cluster))
+        provider = kubernetes.Provider("k8s", kubeconfig=waiter.kubeconfig, ...)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kubeconfig: Input[str],
+        endpoints: Optional[list[Input[str]]] = None,
+        quorum: Optional[int] = None,
+        deadline: timedelta = KUBE_WAIT_DEADLINE,
+        opts: ResourceOptions = None,
+    ):
+        """
+        :param name: Name of the component
+        :param kubeconfig: Kubeconfig of the cluster, with the credentials used to probe the API servers
+        :param endpoints: Host names of the API servers. Defaults to the server of the kubeconfig.
+        :param quorum: Number of API servers that must be healthy. Defaults to a majority of the endpoints.
+        :param deadline: How long to wait for the quorum before failing
+        :param opts: Options of the component
+        """
         super().__init__(
             f"pkg:thunder:kubernetes:{self.__class__.__name__.lower()}",
             name,
             None,
             opts,
         )
-        kubeconfig.apply(self._wait_for_kube_api)
-
-    def _wait_for_kube_api(self, kubeconfig: Input[str]):
-        kube_client = client.CoreV1Api(api_client=new_client_from_string(config_string=kubeconfig))
-        retries = 0
-        while True:
-            try:
-                kube_client.get_api_resources()
-            except (HTTPError, ApiException):
-                if retries == 12:
-                    raise
-                log.warn(f"Unable to contact kube ApiServer at {kube_client.api_client.configuration.host}, retrying")
-                time.sleep(10)
-                retries = retries + 1
-                pass
+        self.quorum = quorum
+        self.deadline = deadline
 
+        self.health: Output[KubeHealth] = Output.all(kubeconfig, *(endpoints or [])).apply(
+            lambda args: self._wait_for_kube_api(args[0], args[1:])
+        )
+        """Health of the API servers, once a quorum of them is healthy"""
 
-def new_client_from_string(config_string=None, context=None, persist_config=False):
+        self.kubeconfig: Output[str] = Output.all(kubeconfig, self.health).apply(lambda args: args[0])
+        """The kubeconfig, resolved once a quorum of API servers is healthy"""
+
+        self.register_outputs({})
+
+    async def _wait_for_kube_api(self, kubeconfig: str, endpoints: list[str]) -> KubeHealth:
+        if is_dry_run() or os.getenv(KUBE_WAIT_ENV, "").lower() == "off":
+            return KubeHealth(probed=False)
+
+        server = urlparse(_new_configuration_from_string(kubeconfig).host)
+        hosts = [f"https://{endpoint}:{server.port or 443}" for endpoint in endpoints] or [server.geturl()]
+        quorum = self.quorum or len(hosts) // 2 + 1
+        deadline = time.monotonic() + self.deadline.total_seconds()
+
+        health = await _wait_for_quorum(kubeconfig, hosts, quorum, deadline)
+        if len(health.healthy) < quorum:
+            raise TimeoutError(
+                f"only {len(health.healthy)} of {len(hosts)} kube ApiServers became healthy in {self.deadline}, "
+                f"{quorum} needed: {health.unhealthy}"
+            )
+
+        # the servers still booting when the quorum was reached
+        health.unhealthy.update((host, "not healthy yet") for host in hosts if host not in health.healthy)
+        log.info(f"kube ApiServers healthy: {len(health.healthy)}/{len(hosts)}", resource=self)
+        return health
+
+
+async def _wait_for_quorum(kubeconfig: str, hosts: list[str], quorum: int, deadline: float) -> KubeHealth:
+    """Probe the API servers concurrently, until a quorum of them is healthy or every probe gave up"""
+    health = KubeHealth()
+    probes = [asyncio.ensure_future(_probe_until_healthy(kubeconfig, host, deadline)) for host in hosts]
+    try:
+        for probe in asyncio.as_completed(probes):
+            host, error = await probe
+            if error is None:
+                health.healthy.append(host)
+            else:
+                health.unhealthy[host] = error
+            if len(health.healthy) >= quorum:
+                break
+    finally:
+        # the servers that are still booting don't hold up the quorum
+        for probe in probes:
+            probe.cancel()
+
+    return health
+
+
+def _probe(api_client: ApiClient) -> Optional[str]:
+    """
+    Probe the health endpoints of an API server, blocking
+
+    :return: None if the API server is healthy, the error otherwise
+    """
+    for path in KUBE_HEALTH_PATHS:
+        try:
+            api_client.call_api(
+                path,
+                "GET",
+                auth_settings=["BearerToken"],
+                response_type="str",
+                _return_http_data_only=True,
+                _request_timeout=KUBE_WAIT_PROBE_TIMEOUT,
+            )
+            return None
+        except ApiException as e:
+            if e.status != 404:
+                return f"{path} returned {e.status}"
+        except (HTTPError, OSError) as e:
+            return str(e)
+
+    return f"none of {KUBE_HEALTH_PATHS} exist"
+
+
+async def _probe_until_healthy(kubeconfig: str, host: str, deadline: float) -> tuple[str, Optional[str]]:
+    """
+    Probe an API server until it is healthy, or until the deadline
+
+    :param kubeconfig: Kubeconfig with the credentials of the cluster
+    :param host: URL of the API server
+    :param deadline: ``time.monotonic()`` after which to give up
+    :return: The host, and None if it is healthy or its last error otherwise
+    """
+    client_config = _new_configuration_from_string(kubeconfig)
+    client_config.host = host
+    # the backoff below replaces urllib3's retries
+    client_config.retries = False
+    api_client = ApiClient(configuration=client_config)
+
+    loop = asyncio.get_running_loop()
+    attempt = 0
+    while True:
+        # the kubernetes client blocks, so probes run in the loop's executor
+        error = await loop.run_in_executor(None, _probe, api_client)
+        if error is None:
+            return host, None
+
+        delay = min(KUBE_WAIT_BACKOFF_MAX, KUBE_WAIT_BACKOFF_BASE * 2**attempt) * random.uniform(0.5, 1)
+        if time.monotonic() + delay > deadline:
+            return host, error
+
+        log.debug(f"kube ApiServer at {host} isn't healthy ({error}), retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _new_configuration_from_string(config_string, context=None, persist_config=False) -> Configuration:
     client_config = type.__call__(Configuration)
     config.load_kube_config_from_dict(
         config_dict=yaml.safe_load(config_string),
@@ -40,4 +197,8 @@ def new_client_from_string(config_string=None, context=None, persist_config=Fals
         client_configuration=client_config,
         persist_config=persist_config,
     )
-    return ApiClient(configuration=client_config)
+    return client_config
+
+
+def new_client_from_string(config_string=None, context=None, persist_config=False):
+    return ApiClient(configuration=_new_configuration_from_string(config_string, context, persist_config))
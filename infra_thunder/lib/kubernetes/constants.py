@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 MONITORING_SECRET_NAME = "monitoring-secret"  # pragma: allowlist secret
 SPOT_TAG_KEY = "spot"
 SPOT_TAG_VALUE = "true"
@@ -5,3 +7,30 @@ DEDICATED_TAG_KEY = "dedicated"
 DEDICATED_TAG_VALUE = "true"
 NODEGROUP_TAG_KEY = "k8s-nodegroup"
 NODEGROUP_TAG_VALUE = "true"
+
+KUBE_WAIT_ENV = "THUNDER_KUBE_WAIT"
+"""Environment variable controlling `KubeWaiter`. Set it to `off` to skip probing the API servers (mocks, benchmarks)."""
+
+KUBE_WAIT_DEADLINE = timedelta(minutes=15)
+"""How long `KubeWaiter` waits for a quorum of API servers, which matches the create timeout of the cluster provider"""
+
+KUBE_WAIT_PROBE_TIMEOUT = 5
+"""Seconds to wait for an API server to answer a health probe"""
+
+KUBE_WAIT_BACKOFF_BASE = 2
+"""Seconds before the first retry of a failed health probe. The delay doubles with each retry, with jitter."""
+
+KUBE_WAIT_BACKOFF_MAX = 30
+"""Maximum seconds between two health probes of the same API server"""
+
+KUBE_HEALTH_PATHS = ("/readyz", "/healthz")
+"""Health endpoints of the API server, in order of preference. `/readyz` is missing before Kubernetes 1.16."""
+
+PERSONALIZER_FLAG_INPUT = "cluster_config"
+"""Input of the personalizers holding the feature flags that enable them"""
+
+PERSONALIZER_DEPENDS_ON_ARG = "depends_on"
+"""Keyword argument receiving the resources of its dependencies, for personalizers that have some"""
+
+PERSONALIZER_GRAPH_CACHE_NAME = "personalizers"
+"""Name of the directory holding the personalizer graphs under the Thunder cache directory"""
@@ -1,2 +1,3 @@
+from .cached_chart import CachedChart
 from .config import HelmChart
-from .helm_chart_stack import HelmChartStack, HelmChartComponent
+from .helm_chart_stack import HelmChartStack, HelmChartComponent, depend_on_chart
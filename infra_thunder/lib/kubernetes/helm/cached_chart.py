@@ -0,0 +1,98 @@
+import json
+from typing import Callable
+
+import pulumi
+from pulumi import Alias, ComponentResource, InvokeOptions, Output, ResourceOptions
+from pulumi_kubernetes import _utilities, helm
+from pulumi_kubernetes.yaml import _parse_yaml_document
+
+from .constants import HELM_TEMPLATE_TOKEN
+from .render_cache import RenderedObjects, cached_render, get_render_cache_key
+
+
+def _transform(obj: dict, transformations: list[Callable]) -> None:
+    """Apply transformations to a rendered object, and to the items of a ``List``, like ``_parse_yaml_object`` does"""
+    for transformation in transformations:
+        transformation(obj, None)
+
+    if obj.get("kind", "").endswith("List"):
+        for item in obj.get("items", []):
+            _transform(item, transformations)
+
+
+class CachedChart(helm.v3.Chart):
+    """
+    A ``helm.v3.Chart`` rendered from a cached chart, whose rendered objects are reused between program runs.
+
+    The objects are rendered once per chart digest and render options (values, namespace, release name...), and the
+    object transformations are applied to them before they are stored, so a run that hits the cache neither calls
+    ``helm template`` nor runs those transformations. Transformations in ``config`` still run on every object, every
+    time.
+
+    The component has the same type as ``helm.v3.Chart``, so charts keep their URNs.
+
+    Example::
+
+        CachedChart(
+            "cilium",
+            config=helm.v3.LocalChartOpts(path=str(local_chart), namespace="kube-system", values={...}),
+            chart_digest=get_chart_digest(local_chart),
+            object_transformations=[_noawait, _nostatus],
+            opts=ResourceOptions(parent=self, provider=provider),
+        )
+    """
+
+    def __init__(
+        self,
+        release_name: str,
+        config: helm.v3.LocalChartOpts,
+        chart_digest: str,
+        object_transformations: list[Callable],
+        opts: ResourceOptions,
+    ):
+        """
+        :param release_name: Name of the chart release
+        :param config: Options of the chart, pointing at its cached copy
+        :param chart_digest: Digest of the chart archive, see ``get_chart_digest``
+        :param object_transformations: Transformations that only modify the rendered object, not its resource options.
+                                       They are called with the object and None.
+        :param opts: Options of the component
+        """
+        # helm.v3.Chart.__init__ would render the chart itself
+        ComponentResource.__init__(
+            self,
+            "kubernetes:helm.sh/v3:Chart",
+            release_name,
+            {},
+            ResourceOptions.merge(opts, ResourceOptions(aliases=[Alias(type_="kubernetes:helm.sh/v2:Chart")])),
+        )
+        self.chart_digest = chart_digest
+        self.object_transformations = object_transformations
+
+        config.release_name = release_name
+        all_config = Output.from_input((config, ResourceOptions(parent=self)))
+
+        self.resources = all_config.apply(lambda all_config: self._parse_chart(*all_config))
+        self.register_outputs({"resources": self.resources})
+
+    def _render(self, json_opts: str) -> RenderedObjects:
+        objects = pulumi.runtime.invoke(
+            HELM_TEMPLATE_TOKEN, {"jsonOpts": json_opts}, InvokeOptions(version=_utilities.get_version())
+        ).value["result"]
+
+        for obj in objects:
+            _transform(obj, self.object_transformations)
+
+        return objects
+
+    def _get_cached_objects(self, json_opts: str) -> RenderedObjects:
+        # the chart path stands for the chart digest, and transformations can't be serialized
+        render_opts = {k: v for k, v in json.loads(json_opts).items() if k not in ("path", "transformations")}
+        render_opts["provider_version"] = _utilities.get_version()
+        key = get_render_cache_key(self.chart_digest, render_opts, self.object_transformations)
+
+        return cached_render(key, lambda: self._render(json_opts))
+
+    def _parse_chart(self, config: helm.v3.LocalChartOpts, opts: ResourceOptions) -> Output:
+        objects = config.to_json().apply(self._get_cached_objects)
+        return objects.apply(lambda objects: _parse_yaml_document(objects, opts, config.transformations or []))
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+HELM_TEMPLATE_TOKEN = "kubernetes:helm:template"
+"""Provider function rendering the templates of a chart"""
+
+RENDER_CACHE_ENV = "THUNDER_HELM_RENDER_CACHE"
+"""Environment variable controlling the render cache. Unset for normal use, `refresh` to re-render, `off` to bypass."""
+
+RENDER_CACHE_NAME = "helm-render"
+"""Name of the render cache directory under the Thunder cache directory"""
+
+RENDER_CACHE_MAX_AGE = timedelta(days=14)
+"""Rendered charts that weren't used for this long are evicted"""
+
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+"""Size of the render cache above which the least recently used entries are evicted"""
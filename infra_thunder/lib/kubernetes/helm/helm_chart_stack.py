@@ -1,8 +1,12 @@
 import collections.abc
+from typing import Callable, Union
 
-from pulumi import ResourceOptions, ComponentResource
+from pulumi import ComponentResource, Output, Resource, ResourceOptions
 from pulumi_kubernetes import helm
 
+from infra_thunder.lib.chart_cache import get_chart_digest, get_local_chart
+from infra_thunder.lib.profiling import profile_span
+from .cached_chart import CachedChart
 from .config import HelmChart
 
 
@@ -44,6 +48,64 @@ def _nostatus(obj, opts):
         del obj["status"]
 
 
+def depend_on_chart(chart: Union[helm.v3.Chart, "HelmChartStack", "HelmChartComponent"]) -> Output:
+    """
+    Build a ``depends_on`` entry that waits for the resources rendered by a chart.
+
+    Depending on the chart itself only waits for its component to be registered, which happens before any of the
+    rendered resources are created. Use this when something needs the chart to be installed, like custom resources
+    whose CRD the chart provides.
+
+    Example::
+
+        apiextensions.CustomResource(..., opts=ResourceOptions(depends_on=[depend_on_chart(cni_stack)]))
+
+    :param chart: The chart, or the component wrapping it
+    :return: An Output resolving to None, that depends on every resource rendered by the chart
+    """
+
+    async def get_resources() -> set[Resource]:
+        return set((await chart.resources.future() or {}).values())
+
+    async def resolve_none() -> None:
+        await chart.resources.future()
+
+    return Output(get_resources(), resolve_none(), chart.resources.is_known())
+
+
+def _create_chart(name: str, chart: HelmChart, transformations: list[Callable], opts: ResourceOptions) -> helm.v3.Chart:
+    """
+    Create a chart, rendered from the chart cache when it is enabled, so previews don't download it from its repository,
+    and through the render cache, so they don't render it again unless its version or values changed.
+
+    :param name: Name of the chart release
+    :param chart: The chart
+    :param transformations: Transformations applied to the rendered resources, besides `_noawait` and `_nostatus`
+    :param opts: Options of the chart
+    :return: The chart
+    """
+    local_chart = get_local_chart(chart.repo, chart.chart, chart.version)
+    if local_chart is None:
+        config = helm.v3.ChartOpts(
+            chart=chart.chart,
+            namespace=chart.namespace,
+            fetch_opts=helm.v3.FetchOpts(repo=chart.repo, version=chart.version),
+            values=chart.values,
+            transformations=[_noawait, _nostatus] + transformations,
+            skip_crd_rendering=chart.skip_crd_rendering,
+        )
+        return helm.v3.Chart(name, config=config, opts=opts)
+
+    config = helm.v3.LocalChartOpts(
+        path=str(local_chart),
+        namespace=chart.namespace,
+        values=chart.values,
+        transformations=transformations,
+        skip_crd_rendering=chart.skip_crd_rendering,
+    )
+    return CachedChart(name, config, get_chart_digest(local_chart), [_noawait, _nostatus], opts)
+
+
 class HelmChartStack(ComponentResource):
     """
     This class exists to allow Pulumi to create multiple Helm charts in the same "root" stack where the Helm charts
@@ -78,19 +140,15 @@ class HelmChartStack(ComponentResource):
         self.configure()
 
     def configure(self):
-        helm.v3.Chart(
-            self.name,
-            config=helm.v3.ChartOpts(
-                chart=self.chart.chart,
-                namespace=self.chart.namespace,
-                fetch_opts=helm.v3.FetchOpts(repo=self.chart.repo, version=self.chart.version),
-                values=self.chart.values,
-                transformations=[_noawait, _nostatus]
-                + (self.chart.transformations if self.chart.transformations else []),
-                skip_crd_rendering=self.chart.skip_crd_rendering,
-            ),
-            opts=ResourceOptions(parent=self, provider=self.opts.provider),
-        )
+        with profile_span("helm", f"{self.__class__.__name__}:{self.name}"):
+            release = _create_chart(
+                self.name,
+                self.chart,
+                self.chart.transformations if self.chart.transformations else [],
+                ResourceOptions(parent=self, provider=self.opts.provider),
+            )
+        self.resources: Output[dict[str, Resource]] = release.resources
+        """Resources rendered by the chart, see `depend_on_chart`"""
 
 
 class HelmChartComponent(ComponentResource):
@@ -108,19 +166,15 @@ class HelmChartComponent(ComponentResource):
         self.configure()
 
     def configure(self):
-        helm.v3.Chart(
-            self.name,
-            config=helm.v3.ChartOpts(
-                chart=self.chart.chart,
-                namespace=self.chart.namespace,
-                fetch_opts=helm.v3.FetchOpts(repo=self.chart.repo, version=self.chart.version),
-                values=self.chart.values,
-                transformations=[_noawait, _nostatus]
-                + (self.chart.transformations if self.chart.transformations else []),
-                skip_crd_rendering=self.chart.skip_crd_rendering,
-            ),
-            opts=ResourceOptions(parent=self, provider=self.opts.provider),
-        )
+        with profile_span("helm", f"{self.__class__.__name__}:{self.name}"):
+            release = _create_chart(
+                self.name,
+                self.chart,
+                self.chart.transformations if self.chart.transformations else [],
+                ResourceOptions(parent=self, provider=self.opts.provider),
+            )
+        self.resources: Output[dict[str, Resource]] = release.resources
+        """Resources rendered by the chart, see `depend_on_chart`"""
 
 
 class HelmChartComponent(ComponentResource):
@@ -138,15 +192,9 @@ class HelmChartComponent(ComponentResource):
         self.configure()
 
     def configure(self):
-        helm.v3.Chart(
-            self.name,
-            config=helm.v3.ChartOpts(
-                chart=self.chart.chart,
-                namespace=self.chart.namespace,
-                fetch_opts=helm.v3.FetchOpts(repo=self.chart.repo, version=self.chart.version),
-                values=self.chart.values,
-                transformations=[_noawait, _nostatus],
-                skip_crd_rendering=self.chart.skip_crd_rendering,
-            ),
-            opts=ResourceOptions(parent=self, provider=self.opts.provider),
-        )
+        with profile_span("helm", f"{self.__class__.__name__}:{self.name}"):
+            release = _create_chart(
+                self.name, self.chart, [], ResourceOptions(parent=self, provider=self.opts.provider)
+            )
+        self.resources: Output[dict[str, Resource]] = release.resources
+        """Resources rendered by the chart, see `depend_on_chart`"""
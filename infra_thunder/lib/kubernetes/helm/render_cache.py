@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from pulumi import log
+
+from infra_thunder.lib.utils import get_cache_dir
+from .constants import RENDER_CACHE_ENV, RENDER_CACHE_MAX_AGE, RENDER_CACHE_MAX_BYTES, RENDER_CACHE_NAME
+
+RenderedObjects = list[dict[str, Any]]
+
+
+class RenderCacheMode(Enum):
+    ON = "on"
+    """Reuse the rendered charts and store the new ones (default)"""
+
+    REFRESH = "refresh"
+    """Render every chart again and overwrite the stored results"""
+
+    OFF = "off"
+    """Render every chart, without storing anything"""
+
+
+def get_render_cache_mode() -> RenderCacheMode:
+    """
+    Read the render cache mode from the `THUNDER_HELM_RENDER_CACHE` environment variable
+
+    :return: RenderCacheMode
+    """
+    value = os.getenv(RENDER_CACHE_ENV) or RenderCacheMode.ON.value
+    try:
+        return RenderCacheMode(value.lower())
+    except ValueError:
+        raise ValueError(
+            f"`{RENDER_CACHE_ENV}` must be one of {[mode.value for mode in RenderCacheMode]}, got `{value}`"
+        )
+
+
+def get_render_cache_key(chart_digest: str, render_opts: dict[str, Any], transformations: list[Callable]) -> str:
+    """
+    Build a content address for a rendered chart
+
+    :param chart_digest: Digest of the chart archive
+    :param render_opts: Options passed to ``helm template``: values, namespace, release name... but not the chart path,
+                        which the digest stands for
+    :param transformations: Transformations applied to the rendered objects before they are stored
+    :return: Hex digest
+    """
+    document = {
+        "chart": chart_digest,
+        "opts": render_opts,
+        "transformations": [f"{func.__module__}.{func.__qualname__}" for func in transformations],
+    }
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _read_entry(path: Path) -> Optional[RenderedObjects]:
+    try:
+        objects = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        log.debug(f"discarding unreadable render cache entry `{path}`: {e}")
+        return None
+
+    # the modification time tracks the last use, for eviction
+    os.utime(path)
+    return objects
+
+
+def _write_entry(path: Path, objects: RenderedObjects) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file and rename it, so concurrent programs never read a partial entry
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(objects))
+    os.replace(tmp_path, path)
+
+
+def evict(cache_dir: Path) -> None:
+    """
+    Remove the entries that weren't used for `RENDER_CACHE_MAX_AGE`, then the least recently used ones until the cache
+    is smaller than `RENDER_CACHE_MAX_BYTES`
+
+    :param cache_dir: The render cache directory
+    """
+    stats = [(entry.stat(), entry) for entry in cache_dir.glob("*.json")]
+    entries = sorted((stat.st_mtime, stat.st_size, entry) for stat, entry in stats)
+    oldest_mtime = time.time() - RENDER_CACHE_MAX_AGE.total_seconds()
+    total_size = sum(size for _, size, _ in entries)
+
+    for mtime, size, entry in entries:
+        if mtime >= oldest_mtime and total_size <= RENDER_CACHE_MAX_BYTES:
+            break
+        entry.unlink(missing_ok=True)
+        total_size -= size
+
+
+def cached_render(key: str, render: Callable[[], RenderedObjects]) -> RenderedObjects:
+    """
+    Render a chart, reusing the objects rendered by a previous program run for the same key.
+
+    Rendered objects are stored in ``.thunder-cache/helm-render`` in the SysEnv directory (see ``get_cache_dir``), and
+    evicted by age and total size whenever a new entry is stored.
+
+    The cache is controlled by the ``THUNDER_HELM_RENDER_CACHE`` environment variable:
+
+    - unset or ``on``: use and populate the cache
+    - ``refresh``: render every chart again and overwrite the stored objects
+    - ``off``: bypass the cache entirely
+
+    :param key: Content address of the rendered chart, see ``get_render_cache_key``
+    :param render: Renders the chart on a miss
+    :return: The rendered objects. They are not shared with the cache, so callers may modify them.
+    """
+    mode = get_render_cache_mode()
+    cache_dir = get_cache_dir(RENDER_CACHE_NAME) if mode is not RenderCacheMode.OFF else None
+
+    if cache_dir is None:
+        return render()
+
+    path = cache_dir / f"{key}.json"
+    if mode is RenderCacheMode.ON and (objects := _read_entry(path)) is not None:
+        log.debug(f"render cache hit ({key[:12]})")
+        return objects
+
+    objects = render()
+
+    try:
+        _write_entry(path, objects)
+        evict(cache_dir)
+    except OSError as e:
+        log.warn(f"unable to write render cache entry `{path}`: {e}")
+
+    return objects
@@ -2,6 +2,7 @@ from .charts import Charts
 from .coredns import CoreDNS
 from .cross_cluster_access_serviceaccount import CrossClusterServiceAccount
 from .datadog_cluster_agent import DatadogClusterAgent
+from .engine import Personalizer, PersonalizerRegistry, format_graph, get_critical_path
 from .kube_metrics import KubeMetrics
 from .kubelet_csr_renewal import KubeletCSRRenewal
 from .kubelet_rolebinding import KubeletRolebinding
@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from pulumi import Input, Output, Resource, log
+
+from infra_thunder.lib.profiling import profile_span
+from infra_thunder.lib.utils import get_cache_dir
+from ..constants import PERSONALIZER_DEPENDS_ON_ARG, PERSONALIZER_FLAG_INPUT, PERSONALIZER_GRAPH_CACHE_NAME
+from ..helm import depend_on_chart
+
+
+@dataclass(frozen=True)
+class Personalizer:
+    name: str
+    """Name of the personalizer, referenced by the dependencies of other personalizers"""
+
+    configure: Callable[..., Any]
+    """Configures the cluster, called with the declared inputs as keyword arguments. What it returns (resources,
+    charts) is what the personalizers depending on it wait for."""
+
+    inputs: tuple[str, ...] = ()
+    """Names of the inputs passed to `configure`, like `provider` or `cluster_config`"""
+
+    flag: Optional[str] = None
+    """Boolean attribute of the `cluster_config` input that enables the personalizer. Always enabled if None."""
+
+    depends_on: tuple[str, ...] = ()
+    """Personalizers whose resources must exist before this one's are created. `configure` then receives them as its
+    `depends_on` keyword argument. Dependencies on disabled personalizers are ignored."""
+
+    def is_enabled(self, inputs: dict[str, Any]) -> bool:
+        return self.flag is None or bool(getattr(inputs[PERSONALIZER_FLAG_INPUT], self.flag))
+
+
+class PersonalizerRegistry:
+    """
+    Declares the personalizers of a cluster, and configures them in dependency order.
+
+    Pulumi creates the resources of personalizers concurrently unless something links them, so the only ordering between
+    personalizers is the declared dependencies: a personalizer with dependencies receives a ``depends_on`` list to put in
+    the options of its resources. A dependency that returned a chart is waited for until the chart's resources exist
+    (see ``depend_on_chart``), not just until its component is registered.
+
+    Personalizers are configured in the order they were registered, moved after their dependencies when needed.
+
+    Example::
+
+        personalizers = PersonalizerRegistry(
+            [
+                Personalizer("cni", configure_cni, inputs=("provider", "cluster_config")),
+                Personalizer("coredns", configure_coredns, inputs=("provider",), flag="enable_coredns", depends_on=("cni",)),
+            ]
+        )
+        personalizers.run({"provider": provider, "cluster_config": cluster_config}, graph_name="my-cluster")
+    """
+
+    def __init__(self, personalizers: Iterable[Personalizer] = ()):
+        """
+        :param personalizers: Personalizers, in their default order
+        """
+        self.personalizers: dict[str, Personalizer] = {}
+        for personalizer in personalizers:
+            self.register(personalizer)
+
+    def register(self, personalizer: Personalizer) -> Personalizer:
+        """
+        Add a personalizer after the ones already registered
+
+        :param personalizer: The personalizer
+        :return: The personalizer
+        """
+        if personalizer.name in self.personalizers:
+            raise ValueError(f"personalizer `{personalizer.name}` is already registered")
+
+        self.personalizers[personalizer.name] = personalizer
+        return personalizer
+
+    def get_plan(self, inputs: dict[str, Any]) -> list[Personalizer]:
+        """
+        Order the enabled personalizers so that each one comes after its dependencies
+
+        :param inputs: Inputs of the personalizers, by name
+        :return: The enabled personalizers, in the order they must be configured
+        """
+        enabled = {name: p for name, p in self.personalizers.items() if p.is_enabled(inputs)}
+        for personalizer in enabled.values():
+            self._check(personalizer, inputs)
+
+        plan: list[Personalizer] = []
+        for personalizer in enabled.values():
+            _visit(personalizer, enabled, plan, set())
+
+        return plan
+
+    def _check(self, personalizer: Personalizer, inputs: dict[str, Any]):
+        unknown = [name for name in personalizer.depends_on if name not in self.personalizers]
+        if unknown:
+            raise ValueError(f"personalizer `{personalizer.name}` depends on unknown personalizers {unknown}")
+
+        missing = [name for name in personalizer.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"personalizer `{personalizer.name}` is missing inputs {missing}")
+
+    def run(self, inputs: dict[str, Any], graph_name: Optional[str] = None) -> dict[str, Any]:
+        """
+        Configure the enabled personalizers
+
+        :param inputs: Inputs of the personalizers, by name
+        :param graph_name: If set, write the dependency graph to ``.thunder-cache/personalizers/{graph_name}.dot``
+        :return: What each personalizer's `configure` returned, by personalizer name
+        """
+        plan = self.get_plan(inputs)
+        results: dict[str, Any] = {}
+        for personalizer in plan:
+            kwargs = {name: inputs[name] for name in personalizer.inputs}
+            if personalizer.depends_on:
+                kwargs[PERSONALIZER_DEPENDS_ON_ARG] = [
+                    dependency
+                    for name in personalizer.depends_on
+                    if name in results
+                    for dependency in _get_dependencies(results[name])
+                ]
+
+            with profile_span("personalizer", personalizer.name):
+                results[personalizer.name] = personalizer.configure(**kwargs)
+
+        if graph_name is not None:
+            _write_graph(plan, graph_name)
+
+        return results
+
+
+def _visit(personalizer: Personalizer, enabled: dict[str, Personalizer], plan: list[Personalizer], visiting: set[str]):
+    """Add a personalizer to the plan after its enabled dependencies, depth first"""
+    if personalizer in plan:
+        return
+    if personalizer.name in visiting:
+        raise ValueError(f"personalizer `{personalizer.name}` has a dependency cycle")
+
+    visiting.add(personalizer.name)
+    # dependencies on disabled personalizers are dropped
+    for dependency in personalizer.depends_on:
+        if dependency in enabled:
+            _visit(enabled[dependency], enabled, plan, visiting)
+    visiting.discard(personalizer.name)
+    plan.append(personalizer)
+
+
+def _get_dependencies(result: Any) -> list[Input[Resource]]:
+    """Turn what a personalizer returned into `depends_on` entries"""
+    results = result if isinstance(result, (list, tuple)) else [result]
+    return [
+        depend_on_chart(item) if isinstance(getattr(item, "resources", None), Output) else item
+        for item in results
+        if isinstance(item, Resource)
+    ]
+
+
+def get_critical_path(plan: list[Personalizer]) -> list[Personalizer]:
+    """
+    Find the longest chain of dependencies in a plan. Personalizers that don't depend on each other are created
+    concurrently, so this chain is what bounds the bring-up of a cluster.
+
+    :param plan: Personalizers ordered by ``PersonalizerRegistry.get_plan``
+    :return: The personalizers of the chain, first to last
+    """
+    chains: dict[str, list[Personalizer]] = {}
+    for personalizer in plan:
+        longest = max((chains[name] for name in personalizer.depends_on if name in chains), key=len, default=[])
+        chains[personalizer.name] = longest + [personalizer]
+
+    return max(chains.values(), key=len, default=[])
+
+
+def format_graph(plan: list[Personalizer]) -> str:
+    """
+    Render the dependencies between personalizers in the DOT format, with the critical path in bold
+
+    :param plan: Personalizers ordered by ``PersonalizerRegistry.get_plan``
+    :return: DOT source, for ``dot -Tsvg`` or https://dreampuf.github.io/GraphvizOnline
+    """
+    critical_path = [personalizer.name for personalizer in get_critical_path(plan)]
+    critical_edges = set(zip(critical_path, critical_path[1:]))
+    enabled = {personalizer.name for personalizer in plan}
+
+    lines = ["digraph personalizers {", "  rankdir=LR;"]
+    for personalizer in plan:
+        style = " [style=bold]" if personalizer.name in critical_path else ""
+        lines.append(f'  "{personalizer.name}"{style};')
+        for name in personalizer.depends_on:
+            if name in enabled:
+                style = " [style=bold]" if (name, personalizer.name) in critical_edges else ""
+                lines.append(f'  "{name}" -> "{personalizer.name}"{style};')
+    lines.append("}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _write_graph(plan: list[Personalizer], graph_name: str):
+    critical_path = " -> ".join(personalizer.name for personalizer in get_critical_path(plan))
+    log.debug(f"personalizers of {graph_name}: critical path {critical_path}")
+
+    cache_dir = get_cache_dir(PERSONALIZER_GRAPH_CACHE_NAME)
+    if cache_dir is None:
+        return
+
+    path = cache_dir / f"{graph_name}.dot"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        path.write_text(format_graph(plan))
+    except OSError as e:
+        log.warn(f"unable to write the personalizer graph to `{path}`: {e}")
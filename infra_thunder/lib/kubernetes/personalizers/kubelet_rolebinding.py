@@ -1,5 +1,30 @@
-from pulumi import ResourceOptions, ComponentResource
+from typing import Optional
+
+from pulumi import ComponentResource, Resource, ResourceOptions
 from pulumi_kubernetes import meta, rbac
+from pulumi_kubernetes import provider as kubernetes_provider
+
+
+def configure_kubelet_rolebinding(parent: Resource, provider: Optional[kubernetes_provider.Provider] = None):
+    """
+    Configure a ClusterRoleBinding that allows the APIServer to access logs on Kubelets
+
+    :param parent: Parent of the resources
+    :param provider: Kubernetes provider, inherited from the parent if None
+    """
+    rbac.v1.ClusterRoleBinding(
+        "kube-apiserver-to-kubelet",
+        metadata=meta.v1.ObjectMetaArgs(
+            name="system:kube-apiserver-to-kubelet",
+        ),
+        role_ref=rbac.v1.RoleRefArgs(
+            api_group="rbac.authorization.k8s.io",
+            kind="ClusterRole",
+            name="system:kubelet-api-admin",
+        ),
+        subjects=[rbac.v1.SubjectArgs(api_group="rbac.authorization.k8s.io", kind="User", name="kubernetes")],
+        opts=ResourceOptions(parent=parent, provider=provider),
+    )
 
 
 class KubeletRolebinding(ComponentResource):
@@ -15,22 +40,4 @@ class KubeletRolebinding(ComponentResource):
             opts,
         )
 
-        rbac.v1.ClusterRoleBinding(
-            "kube-apiserver-to-kubelet",
-            metadata=meta.v1.ObjectMetaArgs(
-                name="system:kube-apiserver-to-kubelet",
-            ),
-            role_ref=rbac.v1.RoleRefArgs(
-                api_group="rbac.authorization.k8s.io",
-                kind="ClusterRole",
-                name="system:kubelet-api-admin",
-            ),
-            subjects=[
-                rbac.v1.SubjectArgs(
-                    api_group="rbac.authorization.k8s.io",
-                    kind="User",
-                    name="kubernetes",
-                )
-            ],
-            opts=ResourceOptions(parent=self),
-        )
+        configure_kubelet_rolebinding(self)
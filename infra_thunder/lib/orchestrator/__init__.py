@@ -0,0 +1,8 @@
+from infra_thunder.lib.utils import lazy_exports
+from .discover_stacks import discover_stacks, SysenvStack
+from .stack_graph import StackGraph
+from .stack_references import get_module_stack_references
+from .types import StackOperation, StackResult, StackStatus
+
+# running stacks needs the Automation API, which is slow to import
+__getattr__ = lazy_exports(__name__, {"run_stacks": ".run_stacks"})
@@ -0,0 +1,28 @@
+STACK_FILE_GLOB = "Pulumi.*.yaml"
+"""Stack configuration files in a SysEnv. ``Pulumi.yaml`` itself is the project file."""
+
+PROJECT_FILE = "Pulumi.yaml"
+
+STACK_REFERENCE_FUNCTIONS = (
+    "get_stack_output",
+    "get_stack_output_index",
+    "find_entity_in_stack_output",
+    "find_entities_in_stack_output",
+    "search_in_stack_output",
+)
+"""Functions in ``infra_thunder.lib.stack`` that take the name of the referenced stack as their first argument"""
+
+TAG_DISCOVERED_STACKS = {
+    "infra_thunder.lib.vpc": "vpc",
+    "infra_thunder.lib.subnets": "vpc",
+    "infra_thunder.lib.route_tables": "vpc",
+    "infra_thunder.lib.security_groups": "vpc",
+    "infra_thunder.lib.route53": "route53",
+    "infra_thunder.lib.azure.network": "network",
+}
+"""
+Libraries that look up resources of another stack by tags or naming convention instead of a stack reference,
+and the stack that creates those resources
+"""
+
+DEFAULT_JOBS = 4
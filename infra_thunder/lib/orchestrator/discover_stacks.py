@@ -0,0 +1,80 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+import infra_thunder
+from infra_thunder.lib.utils import kebab_from_snake
+from .constants import PROJECT_FILE, STACK_FILE_GLOB
+from .stack_references import get_module_stack_references
+
+logger = logging.getLogger(__name__)
+
+_modules_path = Path(infra_thunder.__file__).parent / "modules"
+
+
+@dataclass
+class SysenvStack:
+    """A stack of a SysEnv and the thunder module it runs"""
+
+    name: str
+    """Name of the stack"""
+
+    provider: str
+    """Provider of the module"""
+
+    module_name: str
+    """Name of the python module (snake case)"""
+
+    references: set[str] = field(default_factory=set)
+    """Names of the stacks this stack references"""
+
+
+def _get_stack_config_dir(sysenv_dir: Path) -> Path:
+    """Honour the ``config`` setting of the project file, which points at the directory of the stack files"""
+    project = yaml.safe_load((sysenv_dir / PROJECT_FILE).read_text()) or {}
+    return sysenv_dir / project.get("config", ".")
+
+
+def _find_module(stack_name: str, provider: str, stack_config: dict) -> Optional[tuple[str, str]]:
+    """
+    Find the module a stack runs, following the same rules as the launcher: the stack name is the module name, and
+    ``thunder:provider`` overrides the SysEnv provider. Falls back to any other provider with a matching module.
+    """
+    providers = [stack_config.get("thunder:provider") or provider] + sorted(
+        d.name for d in _modules_path.iterdir() if d.is_dir() and not d.name.startswith("_")
+    )
+    for candidate in providers:
+        module_dir = _modules_path / candidate / stack_name.replace("-", "_")
+        if module_dir.is_dir() and kebab_from_snake(module_dir.name) == stack_name:
+            return candidate, module_dir.name
+
+    return None
+
+
+def discover_stacks(sysenv_dir: Path, provider: str) -> dict[str, SysenvStack]:
+    """
+    Discover the stacks of a SysEnv from its ``Pulumi.<stack>.yaml`` files, and the stacks each of them references
+
+    :param sysenv_dir: Directory holding the SysEnv's ``Pulumi.yaml``
+    :param provider: The SysEnv provider, as passed to ``run_active_stack`` in ``thunder.py``
+    :return: Mapping of stack names to stacks. Stacks without a matching module are left out.
+    """
+    stacks = {}
+    for stack_file in sorted(_get_stack_config_dir(sysenv_dir).glob(STACK_FILE_GLOB)):
+        name = stack_file.name.removeprefix("Pulumi.").removesuffix(".yaml")
+        stack_config = (yaml.safe_load(stack_file.read_text()) or {}).get("config") or {}
+
+        module = _find_module(name, provider, stack_config)
+        if module is None:
+            logger.warning("Ignoring stack [%s]: no module found for it", name)
+            continue
+
+        module_provider, module_name = module
+        references = get_module_stack_references(module_provider, module_name) - {name}
+
+        stacks[name] = SysenvStack(name, module_provider, module_name, references)
+
+    return stacks
@@ -0,0 +1,91 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable, Optional
+
+from pulumi import automation as auto
+
+from .constants import DEFAULT_JOBS
+from .stack_graph import StackGraph
+from .types import StackOperation, StackResult, StackStatus
+
+
+def _run_stack(
+    sysenv_dir: Path,
+    name: str,
+    operation: StackOperation,
+    on_output: Optional[Callable[[str, str], None]],
+) -> StackResult:
+    start = time.monotonic()
+    try:
+        stack = auto.select_stack(stack_name=name, work_dir=str(sysenv_dir))
+        run = stack.up if operation is StackOperation.UP else stack.preview
+        run(on_output=(lambda line: on_output(name, line)) if on_output else None)
+    except Exception as e:
+        return StackResult(name, StackStatus.FAILED, time.monotonic() - start, str(e))
+
+    return StackResult(name, StackStatus.SUCCEEDED, time.monotonic() - start)
+
+
+def _settle(graph: StackGraph, result: StackResult, pending_dependencies: dict[str, set[str]]) -> list[StackResult]:
+    """
+    Update the pending dependencies after a stack finished
+
+    :return: Results for the stacks skipped because of a failure
+    """
+    if result.status is StackStatus.SUCCEEDED:
+        for dependent in graph.dependents[result.name] & pending_dependencies.keys():
+            pending_dependencies[dependent].discard(result.name)
+        return []
+
+    skipped = sorted(graph.get_all_dependents(result.name) & pending_dependencies.keys())
+    for dependent in skipped:
+        del pending_dependencies[dependent]
+
+    return [StackResult(dependent, StackStatus.SKIPPED, error=f"`{result.name}` failed") for dependent in skipped]
+
+
+def run_stacks(
+    sysenv_dir: Path,
+    graph: StackGraph,
+    operation: StackOperation,
+    jobs: int = DEFAULT_JOBS,
+    on_output: Optional[Callable[[str, str], None]] = None,
+    on_result: Optional[Callable[[StackResult], None]] = None,
+) -> dict[str, StackResult]:
+    """
+    Preview or update the stacks of a SysEnv with the Pulumi Automation API.
+
+    A stack starts as soon as every stack it depends on has succeeded, with at most ``jobs`` stacks running at once.
+    When a stack fails, the stacks depending on it are skipped, and independent stacks carry on.
+
+    :param sysenv_dir: Directory holding the SysEnv's ``Pulumi.yaml``
+    :param graph: The stacks to run and their dependencies
+    :param operation: Preview or update
+    :param jobs: Maximum number of stacks to run concurrently
+    :param on_output: Called with the stack name and each line of Pulumi output
+    :param on_result: Called with the result of each stack once it is known
+    :return: Mapping of stack names to results
+    """
+    results: dict[str, StackResult] = {}
+    pending_dependencies = {name: set(dependencies) for name, dependencies in graph.dependencies.items()}
+    # ordered by wave, so the stacks blocking the most work start first
+    order = [name for wave in graph.waves for name in wave]
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="stack") as executor:
+        running = {}
+        while pending_dependencies or running:
+            for name in [name for name in order if not pending_dependencies.get(name, True)]:
+                del pending_dependencies[name]
+                running[executor.submit(_run_stack, sysenv_dir, name, operation, on_output)] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                result = future.result()
+                for settled in [result, *_settle(graph, result, pending_dependencies)]:
+                    results[settled.name] = settled
+                    if on_result:
+                        on_result(settled)
+
+    return results
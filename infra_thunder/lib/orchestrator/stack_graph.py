@@ -0,0 +1,64 @@
+from typing import Iterable
+
+from .discover_stacks import SysenvStack
+
+
+class StackGraph:
+    """
+    Dependency graph of the stacks in a SysEnv.
+
+    A stack depends on every stack it references that is part of the SysEnv. References to stacks outside the SysEnv
+    (or outside the selection) are assumed to be deployed already.
+    """
+
+    def __init__(self, stacks: Iterable[SysenvStack]):
+        """
+        :param stacks: The stacks to schedule
+        :raises ValueError: When the stacks reference each other in a cycle
+        """
+        self.stacks = {stack.name: stack for stack in stacks}
+        self.dependencies = {
+            name: {reference for reference in stack.references if reference in self.stacks}
+            for name, stack in self.stacks.items()
+        }
+        self.dependents = {name: set() for name in self.stacks}
+        for name, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                self.dependents[dependency].add(name)
+
+        self.waves = self._get_waves()
+
+    def _get_waves(self) -> list[list[str]]:
+        """Group the stacks into waves, where every stack only depends on stacks of earlier waves"""
+        remaining = {name: set(dependencies) for name, dependencies in self.dependencies.items()}
+        waves = []
+        while remaining:
+            wave = sorted(name for name, dependencies in remaining.items() if not dependencies)
+            if not wave:
+                raise ValueError(f"stacks reference each other in a cycle: {sorted(remaining)}")
+
+            for name in wave:
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(wave)
+
+            waves.append(wave)
+
+        return waves
+
+    def get_all_dependents(self, name: str) -> set[str]:
+        """
+        Get the stacks that depend on a stack, directly or transitively
+
+        :param name: Stack name
+        :return: Set of stack names
+        """
+        dependents = set()
+        pending = [name]
+        while pending:
+            for dependent in self.dependents[pending.pop()]:
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    pending.append(dependent)
+
+        return dependents
@@ -0,0 +1,170 @@
+import ast
+from functools import cache
+from pathlib import Path
+from typing import Optional
+
+import infra_thunder
+from .constants import STACK_REFERENCE_FUNCTIONS, TAG_DISCOVERED_STACKS
+
+_package_path = Path(infra_thunder.__file__).parent
+_package_name = "infra_thunder"
+
+
+def _get_module_file(module: str) -> Optional[Path]:
+    """
+    Find the source file of a module in the ``infra_thunder`` package, without importing it
+
+    :param module: Dotted module name
+    :return: Path to the module file or the package ``__init__.py``, or None if it is not part of the package
+    """
+    parts = module.split(".")
+    if parts[0] != _package_name:
+        return None
+
+    path = _package_path.joinpath(*parts[1:])
+    if (path / "__init__.py").is_file():
+        return path / "__init__.py"
+    elif path.with_suffix(".py").is_file():
+        return path.with_suffix(".py")
+
+    return None
+
+
+def _get_module_name(file: Path) -> str:
+    parts = file.relative_to(_package_path.parent).with_suffix("").parts
+    return ".".join(parts[:-1] if parts[-1] == "__init__" else parts)
+
+
+@cache
+def _parse(file: Path) -> ast.Module:
+    return ast.parse(file.read_text(), filename=str(file))
+
+
+def _resolve_import_from(file: Path, node: ast.ImportFrom) -> str:
+    """Get the absolute name of the module an ``from ... import ...`` statement imports from"""
+    if not node.level:
+        return node.module
+
+    package = _get_module_name(file).split(".")
+    if file.name != "__init__.py":
+        package = package[:-1]
+    base = package[: len(package) - node.level + 1]
+
+    return ".".join(base + ([node.module] if node.module else []))
+
+
+def _resolve_name(module: str, name: str, seen: frozenset = frozenset()) -> Optional[Path]:
+    """
+    Find the file that defines a name imported from a module, following re-exports in ``__init__.py`` files
+
+    :param module: Dotted module name
+    :param name: Name imported from the module
+    :return: Path to the defining file, or None if it is not part of the package
+    """
+    if (submodule := _get_module_file(f"{module}.{name}")) is not None:
+        return submodule
+
+    file = _get_module_file(module)
+    if file is None or (file, name) in seen:
+        return None
+
+    for node in _parse(file).body:
+        if isinstance(node, ast.ImportFrom) and any((alias.asname or alias.name) == name for alias in node.names):
+            original = next(alias.name for alias in node.names if (alias.asname or alias.name) == name)
+            return _resolve_name(_resolve_import_from(file, node), original, seen | {(file, name)})
+        elif (lazy_module := _get_lazy_export(node, name)) is not None:
+            return _resolve_name(_resolve_relative(file, lazy_module), name, seen | {(file, name)})
+
+    return file
+
+
+def _get_lazy_export(node: ast.stmt, name: str) -> Optional[str]:
+    """Find ``name`` in a ``__getattr__ = lazy_exports(__name__, {...})`` statement"""
+    if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+        return None
+
+    call = node.value
+    if getattr(call.func, "id", None) != "lazy_exports" or len(call.args) < 2 or not isinstance(call.args[1], ast.Dict):
+        return None
+
+    for key, value in zip(call.args[1].keys, call.args[1].values):
+        if isinstance(key, ast.Constant) and key.value == name and isinstance(value, ast.Constant):
+            return value.value
+
+    return None
+
+
+def _resolve_relative(file: Path, module: str) -> str:
+    """Resolve a module name like ``.run_stacks``, as passed to ``importlib.import_module``, against a package"""
+    level = len(module) - len(module.lstrip("."))
+    return _resolve_import_from(file, ast.ImportFrom(module=module.lstrip(".") or None, names=[], level=level))
+
+
+def _get_literal_references(tree: ast.Module) -> set[str]:
+    """Find calls like ``get_stack_output("seed")`` that name the referenced stack literally"""
+    references = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant):
+            func = node.func
+            func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if func_name in STACK_REFERENCE_FUNCTIONS and isinstance(node.args[0].value, str):
+                references.add(node.args[0].value)
+
+    return references
+
+
+def _get_imported_files(file: Path, tree: ast.Module) -> set[Path]:
+    files = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            module = _resolve_import_from(file, node)
+            files.update(_resolve_name(module, alias.name) for alias in node.names)
+        elif isinstance(node, ast.Import):
+            files.update(_get_module_file(alias.name) for alias in node.names)
+
+    files.discard(None)
+    return files
+
+
+def get_file_stack_references(file: Path, seen: Optional[set[Path]] = None) -> set[str]:
+    """
+    Find the stacks a source file references, directly or through the parts of ``infra_thunder`` it imports
+
+    :param file: Path to a python file in the ``infra_thunder`` package
+    :param seen: Files already visited in this search
+    :return: Set of stack names
+    """
+    seen = set() if seen is None else seen
+    if file in seen:
+        return set()
+    seen.add(file)
+
+    tree = _parse(file)
+    references = _get_literal_references(tree)
+
+    module = _get_module_name(file)
+    references.update(stack for prefix, stack in TAG_DISCOVERED_STACKS.items() if f"{module}.".startswith(f"{prefix}."))
+
+    for imported_file in _get_imported_files(file, tree):
+        references.update(get_file_stack_references(imported_file, seen))
+
+    return references
+
+
+def get_module_stack_references(provider: str, module_name: str) -> set[str]:
+    """
+    Find the stacks a thunder module references, by reading the module's source.
+    Nothing is imported, so this works outside of a Pulumi program.
+
+    :param provider: Name of the provider
+    :param module_name: Name of the python module (snake case)
+    :return: Set of stack names
+    """
+    module_path = _package_path / "modules" / provider / module_name
+
+    references = set()
+    seen = set()
+    for file in sorted(module_path.rglob("*.py")):
+        references.update(get_file_stack_references(file, seen))
+
+    return references
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class StackOperation(Enum):
+    PREVIEW = "preview"
+    UP = "up"
+
+
+class StackStatus(Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    """A stack it depends on failed"""
+
+
+@dataclass
+class StackResult:
+    name: str
+    status: StackStatus
+    duration: float = 0.0
+    """Wall-clock seconds spent on the stack"""
+    error: Optional[str] = None
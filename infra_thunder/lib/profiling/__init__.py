@@ -0,0 +1,2 @@
+from .constants import PROFILE_ENV, PROFILE_TRACE_ENV
+from .profiler import Profiler, Span, get_profiler, is_profiling_enabled, profile_span, profiled, start_profiling
@@ -0,0 +1,11 @@
+PROFILE_ENV = "THUNDER_PROFILE"
+"""Environment variable enabling the profiler. Set it to `1` to record spans and print a summary at exit."""
+
+PROFILE_TRACE_ENV = "THUNDER_PROFILE_TRACE"
+"""Environment variable overriding where the Chrome trace is written"""
+
+PROFILE_CACHE_NAME = "profile"
+"""Name of the directory holding the Chrome traces under the Thunder cache directory"""
+
+SUMMARY_ROWS = 25
+"""Number of spans listed in the summary, slowest first"""
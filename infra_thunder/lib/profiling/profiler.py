@@ -0,0 +1,201 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Iterator, Optional, TypeVar
+
+import pulumi
+from pulumi.runtime import register_stack_transformation
+
+from infra_thunder.lib.utils import run_once
+from .constants import PROFILE_ENV
+
+Func = TypeVar("Func", bound=Callable)
+
+
+@dataclass
+class Span:
+    category: str
+    """What the span measures: `build`, `lookup`, `invoke`, `user_data`, `helm`, `personalizer`"""
+
+    name: str
+    """Name of the module, function, invoke token or resource"""
+
+    start_ns: int
+    """Start of the span, relative to the start of the profiler"""
+
+    thread_id: int
+
+    parent: Optional["Span"] = None
+    """Span that was open when this one started"""
+
+    duration_ns: int = 0
+
+    resources: int = 0
+    """Resources registered while the span was open, including by nested spans"""
+
+    children_ns: int = field(default=0, repr=False)
+    """Time spent in the spans nested directly in this one"""
+
+    @property
+    def self_ns(self) -> int:
+        """Time spent in this span, outside of nested spans"""
+        return self.duration_ns - self.children_ns
+
+
+class Profiler:
+    """
+    Records nested spans, with their duration and the number of resources registered while they were open.
+
+    Resources are counted by a stack transformation, which Pulumi runs synchronously for every resource constructed.
+    Invokes made through ``pulumi.runtime.invoke`` (every provider data source) get a span each.
+    """
+
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        self.spans: list[Span] = []
+        self.resources = 0
+        self._open: list[Span] = []
+
+    def _count_resource(self, _args: pulumi.ResourceTransformationArgs) -> None:
+        self.resources += 1
+
+    def _trace_invokes(self) -> None:
+        invoke = pulumi.runtime.invoke
+
+        @wraps(invoke)
+        def traced_invoke(tok: str, *args, **kwargs):
+            with self.span("invoke", tok):
+                return invoke(tok, *args, **kwargs)
+
+        pulumi.runtime.invoke = traced_invoke
+
+    def start(self) -> None:
+        """Count the resources registered from now on, and trace invokes"""
+        register_stack_transformation(self._count_resource)
+        self._trace_invokes()
+
+    @contextmanager
+    def span(self, category: str, name: str) -> Iterator[Span]:
+        """
+        Record a span for the duration of the block
+
+        :param category: What the span measures
+        :param name: Name of the span
+        """
+        span = Span(
+            category=category,
+            name=name,
+            start_ns=time.perf_counter_ns() - self.origin_ns,
+            thread_id=threading.get_ident(),
+            parent=self._open[-1] if self._open else None,
+        )
+        resources = self.resources
+        self._open.append(span)
+        try:
+            yield span
+        finally:
+            span.duration_ns = time.perf_counter_ns() - self.origin_ns - span.start_ns
+            span.resources = self.resources - resources
+            # invokes made concurrently finish in reverse order, so this is nearly always the last span
+            self._open.remove(span)
+            if span.parent is not None:
+                span.parent.children_ns += span.duration_ns
+            self.spans.append(span)
+
+
+_profiler: Optional[Profiler] = None
+
+
+@run_once
+def is_profiling_enabled() -> bool:
+    """
+    Read whether profiling is enabled from the `THUNDER_PROFILE` environment variable
+
+    :return: bool
+    """
+    return os.getenv(PROFILE_ENV, "").lower() not in ("", "0", "false", "off")
+
+
+def get_profiler() -> Optional[Profiler]:
+    """
+    :return: The profiler of this program, or None if profiling hasn't started
+    """
+    return _profiler
+
+
+def start_profiling() -> None:
+    """
+    Start the profiler if `THUNDER_PROFILE` is set, and report its spans when the program exits.
+
+    This must be called before the resources to count are constructed: a stack transformation only applies to the
+    resources whose parent is constructed after it is registered.
+    """
+    global _profiler
+    if _profiler is not None or not is_profiling_enabled():
+        return
+
+    # imported here: the report isn't needed unless profiling
+    from .report import report
+
+    _profiler = Profiler()
+    _profiler.start()
+    atexit.register(report, _profiler)
+
+
+@contextmanager
+def profile_span(category: str, name: str) -> Iterator[None]:
+    """
+    Record a span for the duration of the block, if profiling
+
+    Example::
+
+        with profile_span("helm", self.name):
+            helm.v3.Chart(...)
+
+    :param category: What the span measures
+    :param name: Name of the span
+    """
+    if _profiler is None:
+        yield
+        return
+
+    with _profiler.span(category, name):
+        yield
+
+
+def profiled(category: str, name: Optional[str] = None) -> Callable[[Func], Func]:
+    """
+    Decorator that records a span for every call of the decorated function, if profiling.
+
+    When `THUNDER_PROFILE` isn't set, the function is returned undecorated. Put it below ``@memoize`` so that only the
+    calls that run the function are recorded.
+
+    Example::
+
+        @memoize
+        @profiled("lookup")
+        def get_vpc() -> ec2.AwaitableGetVpcResult:
+            ...
+
+    :param category: What the span measures
+    :param name: Name of the span. Defaults to the qualified name of the function.
+    """
+
+    def decorator(func: Func) -> Func:
+        if not is_profiling_enabled():
+            return func
+
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def profiled_func(*args, **kwargs):
+            with profile_span(category, span_name):
+                return func(*args, **kwargs)
+
+        return profiled_func
+
+    return decorator
@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+from pulumi import get_stack
+
+from infra_thunder.lib.utils import get_cache_dir
+from .constants import PROFILE_CACHE_NAME, PROFILE_TRACE_ENV, SUMMARY_ROWS
+from .profiler import Profiler, Span
+
+
+def get_chrome_trace(spans: list[Span]) -> dict:
+    """
+    Convert spans to the Chrome trace event format, which ``chrome://tracing`` and https://ui.perfetto.dev can open
+
+    :param spans: The spans
+    :return: JSON-serializable trace
+    """
+    pid = os.getpid()
+    return {
+        "displayTimeUnit": "ms",
+        "traceEvents": [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {"resources": span.resources},
+            }
+            for span in sorted(spans, key=lambda span: span.start_ns)
+        ],
+    }
+
+
+def format_summary(spans: list[Span], rows: int = SUMMARY_ROWS) -> str:
+    """
+    Summarize the spans by name, slowest first, and the time spent in each category
+
+    Self time is the time spent in a span outside of the spans nested in it, so it adds up to the profiled time.
+
+    :param spans: The spans
+    :param rows: Maximum number of span names to list
+    :return: A text table
+    """
+    by_name: dict[tuple[str, str], list[Span]] = defaultdict(list)
+    by_category: dict[str, int] = defaultdict(int)
+    for span in spans:
+        by_name[(span.category, span.name)].append(span)
+        by_category[span.category] += span.self_ns
+
+    lines = [f"{'category':<10} {'name':<60} {'calls':>6} {'total ms':>10} {'self ms':>10} {'resources':>9}"]
+    slowest = sorted(by_name.items(), key=lambda item: sum(span.self_ns for span in item[1]), reverse=True)
+    for (category, name), named_spans in slowest[:rows]:
+        # nested calls of the same function would be counted twice
+        total_ns = sum(span.duration_ns for span in named_spans if span.parent is None or span.parent.name != name)
+        self_ns = sum(span.self_ns for span in named_spans)
+        resources = sum(span.resources for span in named_spans if span.parent is None or span.parent.name != name)
+        lines.append(
+            f"{category:<10} {name[-60:]:<60} {len(named_spans):>6} {total_ns / 1e6:>10.1f} {self_ns / 1e6:>10.1f}"
+            f" {resources:>9}"
+        )
+
+    categories = ", ".join(f"{category} {self_ns / 1e6:.1f} ms" for category, self_ns in sorted(by_category.items()))
+    lines += ["", f"self time by category: {categories}"]
+    return "\n".join(lines)
+
+
+def get_trace_path() -> Optional[Path]:
+    """
+    Find where to write the Chrome trace: `THUNDER_PROFILE_TRACE`, or ``.thunder-cache/profile/{stack}-{time}.json``
+
+    :return: Path to the trace, or None if no location could be determined
+    """
+    if override := os.getenv(PROFILE_TRACE_ENV):
+        return Path(override)
+
+    cache_dir = get_cache_dir(PROFILE_CACHE_NAME)
+    if cache_dir is None:
+        return None
+
+    return cache_dir / f"{get_stack()}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+
+def report(profiler: Profiler) -> None:
+    """
+    Write the Chrome trace of a profiler, and print the summary of its spans
+
+    This runs when the program exits, after the engine stopped listening to the program's log messages, so the summary
+    goes to stderr.
+
+    :param profiler: The profiler
+    """
+    print(f"thunder profile: {profiler.resources} resources, {len(profiler.spans)} spans", file=sys.stderr)
+    print(format_summary(profiler.spans), file=sys.stderr)
+
+    trace_path = get_trace_path()
+    if trace_path is None:
+        return
+
+    try:
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        trace_path.write_text(json.dumps(get_chrome_trace(profiler.spans)))
+        print(f"thunder profile: Chrome trace written to {trace_path}", file=sys.stderr)
+    except OSError as e:
+        print(f"thunder profile: unable to write the Chrome trace to {trace_path}: {e}", file=sys.stderr)
@@ -0,0 +1 @@
+from .route53_get_zone import get_zone
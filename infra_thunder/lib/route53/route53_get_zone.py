@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pulumi_aws import route53
+
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
+from ..invoke_cache import cached_invoke, ZONE_TTL
+
+
+@memoize
+@profiled("lookup")
+def get_zone(name: str, private_zone: Optional[bool] = None) -> route53.AwaitableGetZoneResult:
+    """
+    Get a Route53 hosted zone by name
+    :param name: Name of the hosted zone
+    :param private_zone: Search for a private hosted zone
+    :return: Hosted zone attributes
+    """
+    return cached_invoke(route53.get_zone, ttl=ZONE_TTL, name=name, private_zone=private_zone)
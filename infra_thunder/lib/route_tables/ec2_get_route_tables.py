@@ -3,10 +3,14 @@ from typing import Optional
 from pulumi import Input
 from pulumi_aws import ec2
 
-from ..config import tag_prefix, get_sysenv
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
+from ..config import get_tag_prefix, get_sysenv
 from ..vpc import get_vpc
 
 
+@memoize
+@profiled("lookup")
 def get_route_tables(
     vpc_id: Optional[str] = None,
     purpose: Optional[str] = None,
@@ -19,12 +23,12 @@ def get_route_tables(
     :param availability_zones: Availability zone to filter for
     :return: List of route tables matching the given filters
     """
-    filters = [ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[get_sysenv()])]
+    filters = [ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}sysenv", values=[get_sysenv()])]
 
     if purpose:
-        filters.append(ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}role", values=[purpose]))
+        filters.append(ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}role", values=[purpose]))
 
     if availability_zones:
-        filters.append(ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}group", values=availability_zones))
+        filters.append(ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}group", values=availability_zones))
 
     return ec2.get_route_tables(vpc_id=vpc_id or get_vpc().id, filters=filters)
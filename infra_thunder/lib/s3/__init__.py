@@ -1,2 +1,2 @@
 from .generate_bucket_name import generate_bucket_name
-from .get_bucket import get_bucket
+from .get_bucket import get_bucket, get_buckets
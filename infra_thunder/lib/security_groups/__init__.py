@@ -1,5 +1,6 @@
-from .constants import ANY_IPV4_ADDRESS
+from .constants import ANY_IPV4_ADDRESS, RULES_PER_SECURITY_GROUP
 from .ec2_default_security_groups import get_default_security_groups
 from .ec2_generate_security_group import generate_security_group
 from .ec2_generate_security_group_rules import generate_security_group_ingress_rules
+from .rule_compiler import check_rule_quota, compile_ingress_rules, count_rule_entries
 from .types import SecurityGroupIngressRule
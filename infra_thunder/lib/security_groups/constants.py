@@ -1,2 +1,20 @@
 DEFAULT_SECURITY_GROUP = "DefaultSecurityGroup"
 ANY_IPV4_ADDRESS = "0.0.0.0/0"
+
+RULES_PER_SECURITY_GROUP = 60
+"""
+Default quota of inbound rule entries per security group. Override it with `rules_per_security_group` in
+Thunder.common.yaml when the quota was raised for the account.
+"""
+
+ALL_PROTOCOLS = "-1"
+"""Protocol of the rules that allow every protocol and port"""
+
+PORT_RANGE_PROTOCOLS = {"tcp": "tcp", "6": "tcp", "udp": "udp", "17": "udp"}
+"""Protocols whose rules have a port range, by name or number, to their name"""
+
+MAX_PORT = 65535
+"""Highest TCP and UDP port"""
+
+DESCRIPTION_MAX_LENGTH = 255
+"""Maximum length of the description of a security group rule"""
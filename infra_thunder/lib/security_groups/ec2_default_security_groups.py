@@ -2,11 +2,15 @@ from typing import Optional
 
 from pulumi_aws import ec2
 
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from .constants import DEFAULT_SECURITY_GROUP
-from ..config import tag_prefix
+from ..config import get_tag_prefix
 from ..vpc import get_vpc
 
 
+@memoize
+@profiled("lookup")
 def get_default_security_groups(
     vpc_id: Optional[str] = None,
 ) -> ec2.AwaitableGetSecurityGroupsResult:
@@ -20,7 +24,7 @@ def get_default_security_groups(
     return ec2.get_security_groups(
         filters=[
             ec2.GetSecurityGroupsFilterArgs(
-                name=f"tag:{tag_prefix}service",
+                name=f"tag:{get_tag_prefix()}service",
                 values=[DEFAULT_SECURITY_GROUP],
             ),
             ec2.GetSecurityGroupsFilterArgs(
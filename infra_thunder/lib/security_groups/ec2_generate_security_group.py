@@ -3,10 +3,11 @@ from typing import Optional
 from pulumi import ResourceOptions
 from pulumi_aws import ec2
 
+from .rule_compiler import check_rule_quota, compile_ingress_rules, get_prefix_list_ids
 from .types import SecurityGroupIngressRule
 from ..config import get_stack, get_sysenv
 from ..tags import get_tags
-from ..vpc import get_vpc, get_prefix_list, get_peered_prefix_list
+from ..vpc import get_vpc
 
 
 def generate_security_group(
@@ -16,25 +17,21 @@ def generate_security_group(
     opts: Optional[ResourceOptions] = None,
     vpc_id: Optional[str] = None,
 ) -> ec2.SecurityGroup:
-    rules = []
-    for rule in ingress_rules:
-        prefix_lists = [] if rule.allow_vpc_supernet or rule.allow_peered_supernets else None
-        if rule.allow_vpc_supernet:
-            prefix_lists.append(get_prefix_list().id)
-        if rule.allow_peered_supernets:
-            prefix_lists.append(get_peered_prefix_list().id)
+    compiled_rules = compile_ingress_rules(ingress_rules).values()
+    check_rule_quota(compiled_rules, name)
 
-        rules.append(
-            ec2.SecurityGroupIngressArgs(
-                description=rule.description,
-                from_port=rule.from_port,
-                to_port=rule.to_port,
-                protocol=rule.protocol,
-                cidr_blocks=rule.cidr_blocks,
-                prefix_list_ids=prefix_lists,
-                self=rule.self,
-            )
+    rules = [
+        ec2.SecurityGroupIngressArgs(
+            description=rule.description,
+            from_port=rule.from_port,
+            to_port=rule.to_port,
+            protocol=rule.protocol,
+            cidr_blocks=rule.cidr_blocks,
+            prefix_list_ids=get_prefix_list_ids(rule),
+            self=rule.self,
         )
+        for rule in compiled_rules
+    ]
     return ec2.SecurityGroup(
         name,
         ingress=rules,
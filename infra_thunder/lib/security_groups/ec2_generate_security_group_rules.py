@@ -4,7 +4,7 @@ from pulumi import ResourceOptions
 from pulumi.output import Input
 from pulumi_aws import ec2
 
-from infra_thunder.lib.vpc import get_prefix_list, get_peered_prefix_list
+from .rule_compiler import check_rule_quota, compile_ingress_rules, get_prefix_list_ids
 from .types import SecurityGroupIngressRule
 
 
@@ -14,13 +14,18 @@ def generate_security_group_ingress_rules(
     name: str,
     opts: Optional[ResourceOptions] = None,
 ) -> list[ec2.SecurityGroupRule]:
-    def generate_rule(index: int, rule: SecurityGroupIngressRule) -> ec2.SecurityGroupRule:
-        prefix_lists = [] if rule.allow_vpc_supernet or rule.allow_peered_supernets else None
-        if rule.allow_vpc_supernet:
-            prefix_lists.append(get_prefix_list().id)
-        if rule.allow_peered_supernets:
-            prefix_lists.append(get_peered_prefix_list().id)
+    """
+    Create the ingress rules of an existing security group. Rules are compiled first (see ``compile_ingress_rules``),
+    so rules that can be merged are created as one.
+
+    :param rules: Ingress rules
+    :param security_group_id: ID of the security group
+    :param name: Prefix of the names of the rules
+    :param opts: Options of the rules
+    :return: The created rules
+    """
 
+    def generate_rule(index: int, rule: SecurityGroupIngressRule) -> ec2.SecurityGroupRule:
         return ec2.SecurityGroupRule(
             f"{name}-{index}",
             type="ingress",
@@ -32,8 +37,12 @@ def generate_security_group_ingress_rules(
             cidr_blocks=rule.cidr_blocks,
             self=rule.self,
             source_security_group_id=rule.source_security_group_id,
-            prefix_list_ids=prefix_lists,
+            prefix_list_ids=get_prefix_list_ids(rule),
             opts=opts,
         )
 
-    return [generate_rule(index, rule) for index, rule in enumerate(rules)]
+    compiled_rules = compile_ingress_rules(rules)
+    # rules added to a security group that has others can only be counted against the quota on their own
+    check_rule_quota(compiled_rules.values(), name)
+
+    return [generate_rule(index, rule) for index, rule in compiled_rules.items()]
@@ -0,0 +1,212 @@
+from dataclasses import replace
+from typing import Hashable, Iterable, Optional
+
+from infra_thunder.lib.config import thunder_env
+from infra_thunder.lib.vpc import get_prefix_list, get_peered_prefix_list
+from .constants import (
+    ALL_PROTOCOLS,
+    DESCRIPTION_MAX_LENGTH,
+    MAX_PORT,
+    PORT_RANGE_PROTOCOLS,
+    RULES_PER_SECURITY_GROUP,
+)
+from .types import SecurityGroupIngressRule
+
+
+def compile_ingress_rules(rules: list[SecurityGroupIngressRule]) -> dict[int, SecurityGroupIngressRule]:
+    """
+    Compile ingress rules into as few rules as possible, allowing the same traffic:
+
+    - port ranges are normalized, and every protocol is allowed on all ports
+    - the VPC supernet among the CIDR blocks is replaced by the VPC supernet prefix list, when that doesn't count
+      more entries against the quota of the security group. The peered supernets prefix list is left alone: its
+      entries change with the peerings, and the rule would then allow CIDR blocks it doesn't list
+    - rules with the same sources are merged: overlapping and adjacent port ranges of a protocol are merged, and a
+      rule allowing every protocol replaces the others
+
+    :param rules: Ingress rules
+    :return: Compiled rules, by the index of a rule merged into each: the rule that already allows the same traffic
+        from the same sources if there is one, the first one otherwise. The index is kept in the name of the created
+        rule, so a rule that allows the same traffic isn't replaced, nor duplicated by a rule under another name.
+    """
+    permissions: dict[int, Hashable] = {}
+    groups: dict[Hashable, list[tuple[int, SecurityGroupIngressRule]]] = {}
+    for index, rule in enumerate(rules):
+        rule = _normalize_ports(rule)
+        permissions[index] = _get_permission(rule)
+        rule = _collapse_prefix_lists(rule)
+        groups.setdefault(_get_sources(rule), []).append((index, rule))
+
+    compiled = {}
+    for group in groups.values():
+        for indexes, rule in _merge_rules(group):
+            permission = _get_permission(rule)
+            compiled[next((i for i in indexes if permissions[i] == permission), indexes[0])] = rule
+
+    return dict(sorted(compiled.items()))
+
+
+def get_prefix_list_ids(rule: SecurityGroupIngressRule) -> Optional[list[str]]:
+    """
+    :param rule: Ingress rule
+    :return: IDs of the prefix lists the rule allows, None if it doesn't allow any
+    """
+    prefix_lists = [] if rule.allow_vpc_supernet or rule.allow_peered_supernets else None
+    if rule.allow_vpc_supernet:
+        prefix_lists.append(get_prefix_list().id)
+    if rule.allow_peered_supernets:
+        prefix_lists.append(get_peered_prefix_list().id)
+
+    return prefix_lists
+
+
+def count_rule_entries(rules: Iterable[SecurityGroupIngressRule]) -> int:
+    """
+    Count the entries of rules against the quota of rules per security group: a CIDR block, a source security group
+    or the group itself count as one, and a prefix list as its maximum number of entries
+
+    :param rules: Ingress rules
+    :return: Number of entries
+    """
+    return sum(_count_entries(rule) for rule in rules)
+
+
+def check_rule_quota(rules: Iterable[SecurityGroupIngressRule], name: str):
+    """
+    Fail before applying rules that would exceed the quota of rules per security group
+
+    :param rules: Ingress rules of the security group
+    :param name: Name of the security group, for the error
+    :raises ValueError: If the rules count more entries than the quota
+    """
+    quota = int(thunder_env.get("rules_per_security_group", RULES_PER_SECURITY_GROUP))
+    entries = count_rule_entries(rules)
+    if entries > quota:
+        raise ValueError(
+            f"the ingress rules of security group `{name}` count {entries} entries, over the quota of {quota}. "
+            "Set `rules_per_security_group` in Thunder.common.yaml if the quota was raised."
+        )
+
+
+def _normalize_ports(rule: SecurityGroupIngressRule) -> SecurityGroupIngressRule:
+    protocol = str(rule.protocol).lower()
+    if protocol in (ALL_PROTOCOLS, "all"):
+        return replace(rule, protocol=ALL_PROTOCOLS, from_port=0, to_port=0)
+    if protocol not in PORT_RANGE_PROTOCOLS:
+        # ICMP types and codes, or protocols without ports
+        return replace(rule, protocol=protocol)
+
+    if not 0 <= rule.from_port <= rule.to_port <= MAX_PORT:
+        raise ValueError(f"rule `{rule.description}` has an invalid port range {rule.from_port}-{rule.to_port}")
+    return replace(rule, protocol=PORT_RANGE_PROTOCOLS[protocol])
+
+
+def _collapse_prefix_lists(rule: SecurityGroupIngressRule) -> SecurityGroupIngressRule:
+    """Replace the VPC supernet among the CIDR blocks of a rule by the VPC supernet prefix list, which holds only it"""
+    if not rule.cidr_blocks or not all(isinstance(cidr, str) for cidr in rule.cidr_blocks):
+        return rule
+
+    cidr_blocks = list(dict.fromkeys(rule.cidr_blocks))
+    cidrs = {entry.cidr for entry in get_prefix_list().entries or []}
+    # the prefix list counts as its maximum number of entries, whatever it holds
+    if cidrs and cidrs.issubset(cidr_blocks) and len(cidrs) >= _get_max_entries(get_prefix_list()):
+        cidr_blocks = [cidr for cidr in cidr_blocks if cidr not in cidrs]
+        rule = replace(rule, allow_vpc_supernet=True)
+
+    return replace(rule, cidr_blocks=cidr_blocks or None)
+
+
+def _get_sources(rule: SecurityGroupIngressRule) -> Hashable:
+    """What a rule allows traffic from. Outputs can't be compared before they resolve, so only the same one matches."""
+    cidr_blocks = frozenset(cidr if isinstance(cidr, str) else id(cidr) for cidr in rule.cidr_blocks or [])
+    source_security_group_id = rule.source_security_group_id
+    if source_security_group_id is not None and not isinstance(source_security_group_id, str):
+        source_security_group_id = id(source_security_group_id)
+
+    return (
+        cidr_blocks,
+        source_security_group_id,
+        bool(rule.self),
+        bool(rule.allow_vpc_supernet),
+        bool(rule.allow_peered_supernets),
+    )
+
+
+def _get_permission(rule: SecurityGroupIngressRule) -> Hashable:
+    """What a rule allows, from where: two rules with the same permission are duplicates to EC2"""
+    return rule.protocol, rule.from_port, rule.to_port, _get_sources(rule)
+
+
+def _merge_rules(group: list[tuple[int, SecurityGroupIngressRule]]) -> list[tuple[list[int], SecurityGroupIngressRule]]:
+    """
+    Merge rules that have the same sources
+
+    :return: Indexes of the rules merged into each merged rule, in order, and the merged rule
+    """
+    all_protocols = [(index, rule) for index, rule in group if rule.protocol == ALL_PROTOCOLS]
+    if all_protocols:
+        # every other rule allows a subset of this one
+        rule = all_protocols[0][1]
+        return [([index for index, _ in group], replace(rule, description=_merge_descriptions(r for _, r in group)))]
+
+    merged: list[tuple[list[int], SecurityGroupIngressRule]] = []
+    for protocol in dict.fromkeys(rule.protocol for _, rule in group):
+        rules = [(index, rule) for index, rule in group if rule.protocol == protocol]
+        merged += _merge_port_ranges(rules) if protocol in PORT_RANGE_PROTOCOLS.values() else _deduplicate(rules)
+
+    return merged
+
+
+def _merge_port_ranges(
+    rules: list[tuple[int, SecurityGroupIngressRule]]
+) -> list[tuple[list[int], SecurityGroupIngressRule]]:
+    """Merge overlapping and adjacent port ranges of rules with the same protocol and sources"""
+    ranges: list[list[tuple[int, SecurityGroupIngressRule]]] = []
+    for index, rule in sorted(rules, key=lambda item: item[1].from_port):
+        if ranges and rule.from_port <= max(r.to_port for _, r in ranges[-1]) + 1:
+            ranges[-1].append((index, rule))
+        else:
+            ranges.append([(index, rule)])
+
+    return [
+        (
+            sorted(index for index, _ in merged),
+            replace(
+                merged[0][1],
+                to_port=max(rule.to_port for _, rule in merged),
+                description=_merge_descriptions(rule for _, rule in sorted(merged, key=lambda item: item[0])),
+            ),
+        )
+        for merged in ranges
+    ]
+
+
+def _deduplicate(rules: list[tuple[int, SecurityGroupIngressRule]]) -> list[tuple[list[int], SecurityGroupIngressRule]]:
+    """Merge rules for the same ICMP type and code, or the same protocol without ports"""
+    unique: dict[tuple[int, int], list[tuple[int, SecurityGroupIngressRule]]] = {}
+    for index, rule in rules:
+        unique.setdefault((rule.from_port, rule.to_port), []).append((index, rule))
+
+    return [
+        ([index for index, _ in same], replace(same[0][1], description=_merge_descriptions(rule for _, rule in same)))
+        for same in unique.values()
+    ]
+
+
+def _merge_descriptions(rules: Iterable[SecurityGroupIngressRule]) -> str:
+    description = "; ".join(dict.fromkeys(rule.description for rule in rules if rule.description))
+    return description[:DESCRIPTION_MAX_LENGTH]
+
+
+def _get_max_entries(prefix_list) -> int:
+    return prefix_list.max_entries or len(prefix_list.entries or [])
+
+
+def _count_entries(rule: SecurityGroupIngressRule) -> int:
+    entries = len(rule.cidr_blocks or []) + bool(rule.source_security_group_id) + bool(rule.self)
+    if rule.allow_vpc_supernet:
+        entries += _get_max_entries(get_prefix_list())
+    if rule.allow_peered_supernets:
+        entries += _get_max_entries(get_peered_prefix_list())
+
+    return entries
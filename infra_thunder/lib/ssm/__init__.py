@@ -1,4 +1,18 @@
+from infra_thunder.lib.utils import lazy_attributes
 from ..config import get_sysenv
+from .parameters import SSMParameters
 
 PARAMETER_STORE_BASE = "/Infrastructure"
-PARAMETER_STORE_COMMON = f"{PARAMETER_STORE_BASE}/{get_sysenv()}/common"
+
+
+def get_parameter_store_common() -> str:
+    """
+    Get the path of the SSM parameters shared by every stack in this SysEnv
+
+    :return: SSM parameter path
+    """
+    return f"{PARAMETER_STORE_BASE}/{get_sysenv()}/common"
+
+
+# `PARAMETER_STORE_COMMON` depends on the SysEnv name, so it is resolved on first access
+__getattr__ = lazy_attributes(__name__, {"PARAMETER_STORE_COMMON": get_parameter_store_common})
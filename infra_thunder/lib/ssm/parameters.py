@@ -0,0 +1,265 @@
+import random
+import threading
+import time
+from typing import Any, Optional
+
+from pulumi import Input, Output, ResourceOptions, dynamic
+
+PUT_PARAMETER_RATE = 3.0
+"""Writes per second to start with: the default ``PutParameter`` throughput of an account"""
+
+MIN_RATE = 0.5
+"""Writes per second the rate never drops under, however often the writes are throttled"""
+
+MAX_RATE = 10.0
+"""Writes per second the rate never grows over"""
+
+RATE_INCREASE = 0.2
+"""Writes per second added to the rate after every write that wasn't throttled"""
+
+RATE_DECREASE = 0.5
+"""Factor applied to the rate after a throttled write"""
+
+MAX_ATTEMPTS = 8
+"""How many times a throttled write is tried before giving up"""
+
+BACKOFF_BASE = 0.5
+"""Seconds to wait after the first throttled write, doubled after each one"""
+
+BACKOFF_MAX = 20
+"""Maximum seconds to wait between two attempts of a throttled write"""
+
+MAX_NAMES_PER_CALL = 10
+"""``GetParameters`` and ``DeleteParameters`` accept at most 10 names per call"""
+
+THROTTLING_ERRORS = ("ThrottlingException", "TooManyUpdates")
+"""Too many requests were made, or too many updates to the same parameter"""
+
+
+class AdaptiveRateLimiter:
+    """
+    Spaces out API calls to a rate that adapts to throttling: it's halved after each throttled call, and grows back
+    slowly after each successful one.
+
+    Every resource of the provider host writes through the same limiter, so the rate is that of the whole update.
+    """
+
+    def __init__(self, rate: float = PUT_PARAMETER_RATE):
+        self.rate = rate
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Wait until the next call is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + 1 / self.rate
+
+        time.sleep(call_at - now)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(MAX_RATE, self.rate + RATE_INCREASE)
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate * RATE_DECREASE)
+
+
+_limiters: dict[tuple[Optional[str], Optional[str]], AdaptiveRateLimiter] = {}
+"""Rate limiter of each profile and region: SSM throttles per account and region"""
+
+
+def _get_limiter(props: dict) -> AdaptiveRateLimiter:
+    return _limiters.setdefault((props.get("profile"), props.get("region")), AdaptiveRateLimiter())
+
+
+def _get_client(props: dict):
+    # imported here: this runs in the dynamic provider host, not in the Pulumi program
+    import boto3
+    from botocore.config import Config
+
+    session = boto3.session.Session(profile_name=props.get("profile"), region_name=props.get("region"))
+    # throttled calls are retried by `call_with_backoff`, at the pace of the rate limiter
+    return session.client("ssm", config=Config(retries={"total_max_attempts": 1}))
+
+
+def call_with_backoff(limiter: AdaptiveRateLimiter, method, **kwargs) -> dict:
+    """
+    Call an SSM API at the pace of a rate limiter, retrying with jittered exponential backoff while it's throttled
+
+    :param limiter: Rate limiter shared by the calls to the account and region
+    :param method: Method of the SSM client
+    :param kwargs: Arguments of the call
+    :return: Response of the call
+    """
+    from botocore.exceptions import ClientError
+
+    for attempt in range(MAX_ATTEMPTS):
+        limiter.wait()
+        try:
+            response = method(**kwargs)
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in THROTTLING_ERRORS:
+                raise
+            limiter.throttled()
+            time.sleep(min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt) * random.uniform(0.5, 1))
+        else:
+            limiter.succeeded()
+            return response
+
+    raise TimeoutError(f"SSM still throttled after {MAX_ATTEMPTS} attempts (rate {limiter.rate:.1f}/s)")
+
+
+def write_parameters(
+    client, limiter: AdaptiveRateLimiter, desired: dict, owned: dict, tags: dict[str, str], rewrite: bool = False
+) -> int:
+    """
+    Converge a set of SSM parameters, only writing the ones that changed
+
+    :param client: SSM client
+    :param limiter: Rate limiter shared by the calls to the account and region
+    :param desired: Parameters that should exist: full name -> ``{"value", "type"}``
+    :param owned: Parameters that were previously written, deleted if they are no longer desired
+    :param tags: Tags of every parameter
+    :param rewrite: Write every desired parameter, even those that didn't change (to update their tags)
+    :return: Number of parameters written or deleted
+    """
+    # the type of a parameter can't be changed in place, so those are deleted too
+    removed = [name for name, parameter in owned.items() if desired.get(name, {}).get("type") != parameter["type"]]
+    for names in _batch(removed):
+        call_with_backoff(limiter, client.delete_parameters, Names=names)
+
+    changed = [name for name, parameter in desired.items() if rewrite or owned.get(name) != parameter]
+    for name in changed:
+        parameter = desired[name]
+        call_with_backoff(
+            limiter, client.put_parameter, Name=name, Value=parameter["value"], Type=parameter["type"], Overwrite=True
+        )
+        # tags can't be passed when overwriting
+        if tags:
+            call_with_backoff(
+                limiter,
+                client.add_tags_to_resource,
+                ResourceType="Parameter",
+                ResourceId=name,
+                Tags=[{"Key": key, "Value": value} for key, value in tags.items()],
+            )
+
+    return len(removed) + len(changed)
+
+
+def _batch(names: list[str]) -> list[list[str]]:
+    """Split names into batches of ``MAX_NAMES_PER_CALL``"""
+    batches = [[]]
+    for name in names:
+        if len(batches[-1]) == MAX_NAMES_PER_CALL:
+            batches.append([])
+        batches[-1].append(name)
+
+    return [batch for batch in batches if batch]
+
+
+def _read_parameters(client, limiter: AdaptiveRateLimiter, names: list[str]) -> dict:
+    parameters = {}
+    for batch in _batch(names):
+        response = call_with_backoff(limiter, client.get_parameters, Names=batch, WithDecryption=True)
+        parameters.update({p["Name"]: {"value": p["Value"], "type": p["Type"]} for p in response["Parameters"]})
+
+    return parameters
+
+
+class SSMParametersProvider(dynamic.ResourceProvider):
+    """
+    Dynamic Pulumi provider that owns a set of SSM parameters.
+
+    ``ssm.Parameter`` resources are written concurrently, and ``PutParameter`` is throttled at a few calls per second,
+    so large parameter sets get throttled and wait on long retries. This provider writes the parameters of a set one
+    after the other, at a rate that adapts to throttling (see ``AdaptiveRateLimiter``), and only those that changed.
+
+    Parameters are still written one per name, so their readers are unchanged.
+    """
+
+    def create(self, props: dict) -> dynamic.CreateResult:
+        write_parameters(_get_client(props), _get_limiter(props), props["parameters"], {}, props.get("tags") or {})
+        return dynamic.CreateResult(props["path"], props)
+
+    def diff(self, _id: str, olds: dict, news: dict) -> dynamic.DiffResult:
+        replaces = [key for key in ("path", "profile", "region") if olds.get(key) != news.get(key)]
+        changes = bool(replaces) or any(olds.get(key) != news.get(key) for key in ("parameters", "tags"))
+        # the new parameters may have the same names as the old ones, which must be deleted first
+        return dynamic.DiffResult(changes=changes, replaces=replaces, delete_before_replace=True)
+
+    def update(self, _id: str, olds: dict, news: dict) -> dynamic.UpdateResult:
+        write_parameters(
+            _get_client(news),
+            _get_limiter(news),
+            news["parameters"],
+            olds["parameters"],
+            news.get("tags") or {},
+            rewrite=olds.get("tags") != news.get("tags"),
+        )
+        return dynamic.UpdateResult(news)
+
+    def delete(self, _id: str, props: dict) -> None:
+        write_parameters(_get_client(props), _get_limiter(props), {}, props["parameters"], {})
+
+    def read(self, id_: str, props: dict) -> dynamic.ReadResult:
+        # parameters changed or deleted out of band are rewritten by the next update
+        current = _read_parameters(_get_client(props), _get_limiter(props), list(props.get("parameters") or {}))
+        return dynamic.ReadResult(id_, {**props, "parameters": current})
+
+
+class SSMParameters(dynamic.Resource):
+    path: Output[str]
+    parameters: Output[dict[str, dict[str, str]]]
+
+    def __init__(
+        self,
+        resource_name: str,
+        path: str,
+        parameters: dict[str, tuple[Input[str], bool]],
+        region: str,
+        tags: Optional[dict[str, str]] = None,
+        profile: Optional[str] = None,
+        opts: Optional[ResourceOptions] = None,
+    ):
+        """
+        Manage a set of SSM parameters under a path, written at a rate that avoids throttling
+
+        :param resource_name: The name of the resource
+        :param path: Path of the parameters, without a trailing ``/``
+        :param parameters: Value of each parameter, by name relative to the path, and whether it's a ``SecureString``
+        :param region: AWS region of the parameters
+        :param tags: Tags of every parameter
+        :param profile: AWS profile (``~/.aws/config``) of the account owning the parameters. Uses the default
+            credentials if not set.
+        :param opts: pulumi.ResourceOptions for this resource
+        """
+        self._path = path
+        props: dict[str, Any] = {
+            "path": path,
+            "parameters": Output.secret(
+                {
+                    f"{path}/{name}": {"value": value, "type": "SecureString" if secret else "String"}
+                    for name, (value, secret) in parameters.items()
+                }
+            ),
+            "region": region,
+            "tags": tags or {},
+            "profile": profile,
+        }
+        super().__init__(
+            SSMParametersProvider(),
+            resource_name,
+            props,
+            ResourceOptions.merge(ResourceOptions(additional_secret_outputs=["parameters"]), opts),
+        )
+
+    def get_parameter_name(self, name: str) -> Output[str]:
+        """
+        :param name: Name of a parameter, relative to the path
+        :return: Full name of the parameter, once the parameters are written
+        """
+        return self.id.apply(lambda _: f"{self._path}/{name}")
@@ -1,3 +1,4 @@
-from .find_entity_in_stack_output import find_entity_in_stack_output
+from .find_entity_in_stack_output import find_entity_in_stack_output, find_entities_in_stack_output
 from .get_stack_output import get_stack_output
 from .search_in_stack_output import search_in_stack_output
+from .stack_output_index import StackOutputIndex, get_stack_output_index
@@ -1,9 +1,8 @@
-from typing import Optional
+from typing import Hashable, Iterable, Optional
 
-from jmespath import search
 from pulumi import Output
 
-from .get_stack_output import get_stack_output
+from .stack_output_index import get_stack_output_index
 
 
 def find_entity_in_stack_output(stack: str, path_to_list: str, value: str, path: Optional[str] = None) -> Output[dict]:
@@ -17,6 +16,30 @@ def find_entity_in_stack_output(stack: str, path_to_list: str, value: str, path:
     :param path: Path at which to find ``value`` in each element in the list. Defaults to "name".
     :return: dict wrapped in Output
     """
-    output = get_stack_output(stack)
+    return get_stack_output_index(stack).apply(lambda index: index.find(path_to_list, value, path or "name"))
 
-    return output.apply(lambda v: search(f"{path_to_list}[?{path or 'name'} == `{value}`] | [0]", v))
+
+def find_entities_in_stack_output(
+    stack: str, path_to_list: str, values: Iterable[Hashable], path: Optional[str] = None
+) -> Output[dict[Hashable, Optional[dict]]]:
+    """Find many dictionaries in a list in a stack in one pass
+
+    Example::
+
+        buckets = find_entities_in_stack_output("s3", "@", ["logs", "assets"], "friendly_name")
+        bucket_name = buckets["logs"]["bucket"]
+
+    :param stack: Name of stack with output
+    :param path_to_list: Path to the list. Use "@" for identity.
+    :param values: Values of ``path`` to look for
+    :param path: Path at which to find each value in each element in the list. Defaults to "name".
+    :return: Mapping of each value to its dict (or None if not found), wrapped in Output
+    """
+    values = list(values)
+    if not values:
+        # don't reference the stack at all if there is nothing to look up
+        return Output.from_input({})
+
+    return get_stack_output_index(stack).apply(
+        lambda index: {value: index.find(path_to_list, value, path or "name") for value in values}
+    )
@@ -1,13 +1,15 @@
-from functools import cache
-
 from pulumi import StackReference, Output
 
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
+
 
 def _get_stack_reference(stack: str) -> StackReference:
     return StackReference(f"{stack}-stack-reference", stack_name=stack)
 
 
-@cache
+@memoize
+@profiled("lookup")
 def get_stack_output(stack: str) -> Output:
     stack_reference = _get_stack_reference(stack)
     return stack_reference.require_output(stack)
@@ -1,7 +1,6 @@
-from jmespath import search
 from pulumi import Output
 
-from infra_thunder.lib.stack import get_stack_output
+from .stack_output_index import get_stack_output_index
 
 
 def search_in_stack_output(stack: str, expression: str) -> Output:
@@ -11,5 +10,4 @@ def search_in_stack_output(stack: str, expression: str) -> Output:
     :param expression: JMESPath expression
     :return: Query result wrapped in Output
     """
-    output = get_stack_output(stack)
-    return output.apply(lambda v: search(expression, v))
+    return get_stack_output_index(stack).apply(lambda index: index.search(expression))
@@ -0,0 +1,84 @@
+from typing import Any, Hashable, Optional
+
+import jmespath
+from jmespath.parser import ParsedResult
+from pulumi import Output
+
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
+from .get_stack_output import get_stack_output
+
+
+@memoize
+def compile_expression(expression: str) -> ParsedResult:
+    """
+    Compile a JMESPath expression once per program
+
+    :param expression: JMESPath expression
+    :return: The compiled expression
+    """
+    return jmespath.compile(expression)
+
+
+class StackOutputIndex:
+    """
+    A resolved stack output, with hash indexes over the lists in it.
+
+    An index is built the first time a list is queried by a given key path (``name``, ``friendly_name``...), so
+    resolving many entities from the same list costs one scan of the list instead of one scan per entity.
+    """
+
+    def __init__(self, output: Any):
+        """
+        :param output: The resolved stack output
+        """
+        self.output = output
+        self._indexes: dict[tuple[str, str], dict[Hashable, dict]] = {}
+
+    def search(self, expression: str) -> Any:
+        """
+        Query the stack output
+
+        :param expression: JMESPath expression
+        :return: Query result
+        """
+        return compile_expression(expression).search(self.output)
+
+    def find(self, path_to_list: str, value: Hashable, path: str = "name") -> Optional[dict]:
+        """
+        Find the first dictionary in a list whose ``path`` equals ``value``
+
+        :param path_to_list: Path to the list. Use "@" for identity.
+        :param value: Value of ``path`` to look for
+        :param path: Path at which to find ``value`` in each element in the list
+        :return: The matching dictionary, or None
+        """
+        return self._get_index(path_to_list, path).get(value)
+
+    def _get_index(self, path_to_list: str, path: str) -> dict[Hashable, dict]:
+        key = (path_to_list, path)
+        if key not in self._indexes:
+            key_expression = compile_expression(path)
+
+            index = {}
+            for element in self.search(path_to_list) or []:
+                element_key = key_expression.search(element)
+                if isinstance(element_key, Hashable):
+                    # keep the first match, like `[?path == value] | [0]`
+                    index.setdefault(element_key, element)
+
+            self._indexes[key] = index
+
+        return self._indexes[key]
+
+
+@memoize
+@profiled("lookup")
+def get_stack_output_index(stack: str) -> Output[StackOutputIndex]:
+    """
+    Get the indexed output of a stack. The index is shared by every lookup against the stack in this program.
+
+    :param stack: Name of stack with output
+    :return: StackOutputIndex wrapped in Output
+    """
+    return get_stack_output(stack).apply(StackOutputIndex)
@@ -3,6 +3,7 @@ from .ec2_get_subnets import (
     get_subnet_attributes,
     get_all_subnets_attributes,
 )
+from .subnet_catalogue import SubnetCatalogue, get_subnet_catalogue
 
 # TODO: might need to add a function to get the Pulumi subnet objects for every subnet ID
 # from .ec2_get_subnets import get_subnets
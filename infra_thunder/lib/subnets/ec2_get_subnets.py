@@ -2,7 +2,8 @@ from typing import Optional
 
 from pulumi_aws import ec2
 
-from ..config import tag_prefix, get_sysenv
+from .subnet_catalogue import get_subnet_catalogue
+from ..invoke_cache import cached_invoke, NETWORK_TTL
 from ..vpc import get_vpc
 
 
@@ -16,12 +17,7 @@ def get_subnets_attributes(
     :param vpc_id: VPC ID to search
     :return: List of subnets and their attributes
     """
-    filters = [ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[get_sysenv()])]
-    if purpose:
-        filters.append(ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}role", values=[purpose]))
-    ids = ec2.get_subnet_ids(vpc_id=vpc_id or get_vpc().id, filters=filters).ids
-    subnets = [get_subnet_attributes(subnet_id=subnet, vpc_id=vpc_id or get_vpc().id) for subnet in ids]
-    return [subnet for subnet in subnets if subnet.map_public_ip_on_launch is public]
+    return get_subnet_catalogue(vpc_id or get_vpc().id).find(public=public, purpose=purpose)
 
 
 def get_all_subnets_attributes(
@@ -32,11 +28,7 @@ def get_all_subnets_attributes(
     :param vpc_id: VPC ID to search
     :return: List of subnets and their attributes
     """
-    ids = ec2.get_subnet_ids(
-        vpc_id=vpc_id or get_vpc().id,
-        filters=[ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[get_sysenv()])],
-    ).ids
-    return [get_subnet_attributes(subnet_id=subnet, vpc_id=vpc_id or get_vpc().id) for subnet in ids]
+    return list(get_subnet_catalogue(vpc_id or get_vpc().id).subnets)
 
 
 def get_subnet_attributes(subnet_id: str, vpc_id: Optional[str]) -> ec2.AwaitableGetSubnetResult:
@@ -46,4 +38,7 @@ def get_subnet_attributes(subnet_id: str, vpc_id: Optional[str]) -> ec2.Awaitabl
     :param vpc_id: VPC ID to search
     :return: subnet attributes
     """
-    return ec2.get_subnet(vpc_id=vpc_id or get_vpc().id, id=subnet_id)
+    vpc_id_ = vpc_id or get_vpc().id
+    return get_subnet_catalogue(vpc_id_).get(subnet_id) or cached_invoke(
+        ec2.get_subnet, ttl=NETWORK_TTL, vpc_id=vpc_id_, id=subnet_id
+    )
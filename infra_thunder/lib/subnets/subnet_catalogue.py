@@ -0,0 +1,104 @@
+from collections import defaultdict
+from typing import Optional
+
+from pulumi import log
+from pulumi_aws import ec2
+
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
+from ..config import get_tag_prefix, get_sysenv
+from ..invoke_cache import cached_invoke, NETWORK_TTL
+
+
+class SubnetCatalogue:
+    """
+    Every subnet of this SysEnv in a VPC, fetched once and indexed by purpose, availability zone and public/private.
+
+    Lookups against the catalogue are served from memory, so modules can ask for subnets as often as they like
+    without issuing more invokes.
+    """
+
+    def __init__(self, subnets: list[ec2.AwaitableGetSubnetResult]):
+        """
+        Build the indexes for a list of subnets
+
+        :param subnets: Subnets and their attributes, in the order AWS returned them
+        """
+        self.subnets = subnets
+
+        self._by_id = {subnet.id: subnet for subnet in subnets}
+        self._by_purpose: dict[str, list[ec2.AwaitableGetSubnetResult]] = defaultdict(list)
+        self._by_availability_zone: dict[str, list[ec2.AwaitableGetSubnetResult]] = defaultdict(list)
+        self._by_public: dict[bool, list[ec2.AwaitableGetSubnetResult]] = defaultdict(list)
+        role_tag = f"{get_tag_prefix()}role"
+        for subnet in subnets:
+            self._by_purpose[subnet.tags.get(role_tag)].append(subnet)
+            self._by_availability_zone[subnet.availability_zone].append(subnet)
+            self._by_public[subnet.map_public_ip_on_launch].append(subnet)
+
+    def find(
+        self,
+        public: Optional[bool] = None,
+        purpose: Optional[str] = None,
+        availability_zone: Optional[str] = None,
+    ) -> list[ec2.AwaitableGetSubnetResult]:
+        """
+        Find the subnets matching all the given criteria, preserving catalogue order
+
+        :param public: Does this subnet receive a public IP. Leave unset to match both.
+        :param purpose: The purpose (role tag) of the subnet
+        :param availability_zone: The availability zone of the subnet
+        :return: List of subnets and their attributes
+        """
+        candidates = [
+            index[key]
+            for index, key in (
+                (self._by_public, public),
+                (self._by_purpose, purpose),
+                (self._by_availability_zone, availability_zone),
+            )
+            if key is not None
+        ]
+        if not candidates:
+            return list(self.subnets)
+
+        # intersect by identity, starting from the smallest bucket
+        smallest, *others = sorted(candidates, key=len)
+        other_ids = [{id(subnet) for subnet in bucket} for bucket in others]
+        return [subnet for subnet in smallest if all(id(subnet) in ids for ids in other_ids)]
+
+    def get(self, subnet_id: str) -> Optional[ec2.AwaitableGetSubnetResult]:
+        """
+        Get a subnet from the catalogue by ID
+
+        :param subnet_id: Subnet ID
+        :return: Subnet attributes, or None if the subnet is not part of this catalogue
+        """
+        return self._by_id.get(subnet_id)
+
+
+@memoize
+@profiled("lookup")
+def get_subnet_catalogue(vpc_id: str) -> SubnetCatalogue:
+    """
+    Get the catalogue of every subnet tagged for this SysEnv in a VPC.
+
+    The catalogue is built once per VPC per program: one invoke to list the subnet IDs, and one to describe each subnet
+    (served from the on-disk invoke cache on later runs). The AWS provider has no data source that describes many
+    subnets in a single call.
+
+    :param vpc_id: VPC ID to search
+    :return: SubnetCatalogue
+    """
+    ids = cached_invoke(
+        ec2.get_subnet_ids,
+        ttl=NETWORK_TTL,
+        vpc_id=vpc_id,
+        filters=[ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}sysenv", values=[get_sysenv()])],
+    ).ids
+
+    log.debug(f"building subnet catalogue for `{vpc_id}` from {len(ids)} subnets")
+
+    return SubnetCatalogue(
+        [cached_invoke(ec2.get_subnet, ttl=NETWORK_TTL, vpc_id=vpc_id, id=subnet_id) for subnet_id in ids]
+    )
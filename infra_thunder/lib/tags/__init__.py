@@ -1,6 +1,10 @@
+from types import MappingProxyType
+from typing import Mapping
+
+from infra_thunder.lib.utils import memoize
 from ..config import (
-    tag_prefix,
-    team,
+    get_tag_prefix,
+    get_team,
     get_sysenv,
     get_stack,
     get_project,
@@ -8,6 +12,73 @@ from ..config import (
     get_phase,
 )
 
+CREATED_BY = "pulumi"
+"""Value of the `createdby` tag"""
+
+
+@memoize
+def get_base_tags() -> Mapping[str, str]:
+    """
+    Tags shared by every resource of the program, computed on first use: they only depend on the SysEnv, the stack and
+    Thunder.common.yaml
+
+    :return: Read-only mapping of the tags
+    """
+    tag_prefix = get_tag_prefix()
+
+    return MappingProxyType(
+        {
+            f"{tag_prefix}sysenv": get_sysenv(),
+            f"{tag_prefix}team": get_team(),
+            f"{tag_prefix}createdby": CREATED_BY,
+            f"{tag_prefix}stack": get_stack(),
+            f"{tag_prefix}project": get_project(),
+            f"{tag_prefix}purpose": get_purpose(),
+            f"{tag_prefix}phase": get_phase(),
+        }
+    )
+
+
+@memoize
+def get_tag_set(service, role, group=None) -> Mapping[str, str]:
+    """
+    Standard tags of a resource: the base tags (see ``get_base_tags``) with the service, role and group of the
+    resource. Built once for each service, role and group.
+
+    :param service: This resource's "namespace" (kubernetes, cassandra, subnet,...)
+    :param role: The role this resource performs within the namespace (master, instance, public,...)
+    :param group: The group this resource belongs to (integrations, us-west-2a). Leave unset to use "main".
+    :return: Read-only mapping of the tags, in the order of ``get_tags``
+    """
+    group_name = "main" if not group else group
+    group_suffix = f"-{group}" if group else ""
+    base_tags = get_base_tags()
+    tag_prefix = get_tag_prefix()
+    sysenv_key = f"{tag_prefix}sysenv"
+
+    return MappingProxyType(
+        {
+            "Name": f"{service}-{role}{group_suffix}",
+            sysenv_key: base_tags[sysenv_key],
+            f"{tag_prefix}service": service,
+            f"{tag_prefix}role": role,
+            f"{tag_prefix}group": group_name,
+            # the other base tags, after the sysenv
+            **base_tags,
+        }
+    )
+
+
+def render_asg_tags(tags: Mapping[str, str], propagate_at_launch=False) -> list[dict]:
+    """
+    Render tags in the list form of the AWS auto scaling group ``tags``
+
+    :param tags: Tags, like those of ``get_tags``
+    :param propagate_at_launch: Whether the instances of the group get the tags
+    :return: List of dicts of tags
+    """
+    return [{"key": k, "value": v, "propagate_at_launch": propagate_at_launch} for k, v in tags.items()]
+
 
 def get_tags(service, role, group=None) -> dict:
     """
@@ -116,26 +187,10 @@ def get_tags(service, role, group=None) -> dict:
     :param service: This resource's "namespace" (kubernetes, cassandra, subnet,...)
     :param role: The role this resource performs within the namespace (master, instance, public,...)
     :param group: The group this resource belongs to (integrations, us-west-2a). Leave unset to use "main".
-    :return: Dict of tags
+    :return: Dict of tags, in the form of AWS and Azure resource ``tags``. It's a copy of ``get_tag_set``, so it can be
+        modified.
     """
-
-    group_name = "main" if not group else group
-    group_suffix = f"-{group}" if group else ""
-    sysenv = get_sysenv()
-
-    return {
-        "Name": f"{service}-{role}{group_suffix}",
-        f"{tag_prefix}sysenv": sysenv,
-        f"{tag_prefix}service": service,
-        f"{tag_prefix}role": role,
-        f"{tag_prefix}group": group_name,
-        f"{tag_prefix}team": team,
-        f"{tag_prefix}createdby": "pulumi",
-        f"{tag_prefix}stack": get_stack(),
-        f"{tag_prefix}project": get_project(),
-        f"{tag_prefix}purpose": get_purpose(),
-        f"{tag_prefix}phase": get_phase(),
-    }
+    return dict(get_tag_set(service, role, group))
 
 
 def get_asg_tags(service, role, group=None, propagate_at_launch=False) -> list[dict]:
@@ -144,9 +199,7 @@ def get_asg_tags(service, role, group=None, propagate_at_launch=False) -> list[d
     :param service: This resource's "namespace" (kubernetes, cassandra, subnet,...)
     :param role: The role this resource performs within the namespace (master, instance, public,...)
     :param group: The group this resource belongs to (integrations, us-west-2a). Leave unset to use "main".
+    :param propagate_at_launch: Whether the instances of the group get the tags
     :return: List of dicts of tags
     """
-    return [
-        {"key": k, "value": v, "propagate_at_launch": propagate_at_launch}
-        for k, v in get_tags(service, role, group).items()
-    ]
+    return render_asg_tags(get_tag_set(service, role, group), propagate_at_launch)
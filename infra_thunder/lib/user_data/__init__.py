@@ -1,14 +1,10 @@
-import gzip
-import inspect
 import sys
-from base64 import b64encode
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
 
-import jinja2
 import yaml
-from pulumi import Output, ComponentResource, ResourceOptions
+from pulumi import Output, ComponentResource, ResourceOptions, log
 from pulumi.output import Inputs
 
 from infra_thunder.lib.config import (
@@ -18,28 +14,52 @@ from infra_thunder.lib.config import (
     get_purpose,
     get_phase,
     get_sysenv,
-    tag_namespace,
-    tag_prefix,
-    team,
+    get_provider_and_region,
+    get_tag_namespace,
+    get_tag_prefix,
+    get_team,
 )
+from infra_thunder.lib.profiling import profile_span
 from infra_thunder.lib.prompt_color import get_prompt_color
-from infra_thunder.lib.ssm import PARAMETER_STORE_BASE, PARAMETER_STORE_COMMON
+from infra_thunder.lib.ssm import PARAMETER_STORE_BASE, get_parameter_store_common
+from infra_thunder.lib.utils import lazy_attributes, run_once
+from .rendered_user_data import (
+    RenderedUserData,
+    UserDataTooLargeException,
+    get_digest,
+    get_rendered_user_data,
+    EC2_USER_DATA_LIMIT,
+    AZURE_CUSTOM_DATA_LIMIT,
+)
+from .template_environment import get_template, get_template_digest
 
 DEFAULT_TEMPLATE_NAME = "user_data.sh.j2"
 
-DEFAULT_TEMPLATE_VARIABLES = {
-    "prompt_color": get_prompt_color(),
-    "project": get_project(),
-    "stack": get_stack(),
-    "sysenv": get_sysenv(),
-    "purpose": get_purpose(),
-    "phase": get_phase(),
-    "team": team,
-    "tag_namespace": tag_namespace,
-    "tag_prefix": tag_prefix,
-    "parameter_store_base": PARAMETER_STORE_BASE,
-    "parameter_store_common": PARAMETER_STORE_COMMON,
-}
+
+@run_once
+def get_default_template_variables() -> dict[str, str]:
+    """
+    Get the variables UserData templates can use under the `defaults` prefix
+
+    :return: Default template variables
+    """
+    return {
+        "prompt_color": get_prompt_color(),
+        "project": get_project(),
+        "stack": get_stack(),
+        "sysenv": get_sysenv(),
+        "purpose": get_purpose(),
+        "phase": get_phase(),
+        "team": get_team(),
+        "tag_namespace": get_tag_namespace(),
+        "tag_prefix": get_tag_prefix(),
+        "parameter_store_base": PARAMETER_STORE_BASE,
+        "parameter_store_common": get_parameter_store_common(),
+    }
+
+
+# `DEFAULT_TEMPLATE_VARIABLES` reads the stack and Thunder configuration, so it is resolved on first access
+__getattr__ = lazy_attributes(__name__, {"DEFAULT_TEMPLATE_VARIABLES": get_default_template_variables})
 
 
 class UserData(ComponentResource):
@@ -101,6 +121,7 @@ class UserData(ComponentResource):
         if replacements is None:
             replacements = {}
 
+        self._resource_name = resource_name
         self._template = self._find_template(template_name)
         self._include_defaults = include_defaults
         self._include_cloudconfig = include_cloudconfig
@@ -130,12 +151,13 @@ class UserData(ComponentResource):
             return Path(main_module.__file__).absolute() / template_name
         else:
             # template name should be located in the module directory, so we must find where the calling class lives
-            # we use inspect for this to both cut down on the amount of self-passing
+            # we look at the call stack for this to both cut down on the amount of self-passing
             # and allow for non class objects to utilize templates located next to them in the filesystem
             # 2 is a magic number here - this is how deep we currently are in the stack
             # 0 is this function itself, 1 is the class itself, and 2 is the calling class/function
+            # sys._getframe only touches the frame we need, unlike inspect.stack() which reads source for every frame
             # TODO: figure out better way of finding calling class/function without counting frames
-            caller_filename = inspect.stack()[2].filename
+            caller_filename = sys._getframe(2).f_code.co_filename
             caller_path = Path(caller_filename).parent
             return caller_path / template_name
 
@@ -145,24 +167,7 @@ class UserData(ComponentResource):
 
         :return: Cloud-config MIME part
         """
-        thunder_users = [
-            {
-                "name": user["name"],
-                "groups": user["groups"],
-                "sudo": "ALL=(ALL) NOPASSWD:ALL",
-                "ssh_authorized_keys": user["ssh_authorized_keys"],
-            }
-            for user in thunder_env.require("ssh_users")
-        ]
-        users = ["default"] + thunder_users
-
-        cloud_init = {
-            "users": users,
-            # default is /mnt, we want to move this elsewhere
-            "mounts": [["ephemeral0", "/mnt/ephemeral0"]],
-        }
-
-        document = MIMEText(yaml.safe_dump(cloud_init), "cloud-config")
+        document = MIMEText(_get_cloudconfig(), "cloud-config")
         document.add_header("Content-Disposition", "attachment", filename="cloud-config.txt")
         return document
 
@@ -174,18 +179,14 @@ class UserData(ComponentResource):
         :return: Shellscript MIME part
         """
         if self._include_defaults:
-            resolved_args["defaults"] = DEFAULT_TEMPLATE_VARIABLES
-        with open(self._template, "r") as f:
-            document = MIMEText(
-                jinja2.Template(f.read(), undefined=jinja2.StrictUndefined).render(resolved_args),
-                "x-shellscript",
-            )
+            resolved_args["defaults"] = get_default_template_variables()
+        document = MIMEText(get_template(self._template).render(resolved_args), "x-shellscript")
         document.add_header("Content-Disposition", "attachment", filename="shellscript.sh")
         return document
 
-    def _render(self, resolved_args):
+    def _render_archive(self, resolved_args) -> RenderedUserData:
         """
-        Render the cloud-config and shell scripts (and optionally base64 encodes)
+        Render the cloud-config and shell scripts into a MIME multipart archive
 
         :param resolved_args: Arguments to be provided to the Jinja renderer
         :return: Rendered MIME multipart archive
@@ -195,37 +196,55 @@ class UserData(ComponentResource):
             doc.attach(self._generate_cloudconfig())
         doc.attach(self._render_shellscript(resolved_args))
 
-        rendered = (
-            b64encode(doc.as_string().encode(encoding="ascii")).decode(encoding="ascii")
-            if self._base64_encode
-            else doc.as_string()
-        )
-        return rendered
+        raw = doc.as_string()
+        sections = {part.get_filename(): len(part.as_string().encode("utf-8")) for part in doc.get_payload()}
+        sections["MIME envelope"] = len(raw.encode("utf-8")) - sum(sections.values())
 
-    def _render_internal(self, resolved_args):
+        return RenderedUserData(raw, sections)
+
+    def _get_rendered(self, resolved_args, compressed: bool) -> RenderedUserData:
         """
-        Render the cloud-config and shell scripts
+        Get the rendered archive from the render cache, and check that it fits in the cloud provider's limit
 
         :param resolved_args: Arguments to be provided to the Jinja renderer
+        :param compressed: Whether the archive will be gzipped
         :return: Rendered MIME multipart archive
         """
-        doc = MIMEMultipart(boundary="thunder--user--data--0123456789")
-        if self._include_cloudconfig:
-            doc.attach(self._generate_cloudconfig())
-        doc.attach(self._render_shellscript(resolved_args))
+        key = (
+            get_template_digest(self._template),
+            get_digest(resolved_args),
+            get_digest(_get_cloudconfig()) if self._include_cloudconfig else None,
+            self._include_defaults,
+        )
+        with profile_span("user_data", self._resource_name):
+            rendered = get_rendered_user_data(key, lambda: self._render_archive(resolved_args))
 
-        return doc.as_string()
+        sizes = ", ".join(f"{encoding} {size} B" for encoding, size in rendered.get_sizes().items())
+        log.debug(f"user data `{self._resource_name}`: {sizes}", resource=self)
 
-    def _compress(self, template):
+        provider, _ = get_provider_and_region()
+        rendered.check_size(self._resource_name, provider, compressed)
+
+        return rendered
+
+    def _render(self, resolved_args):
         """
-        Compress and base64 the rendered template string
+        Render the cloud-config and shell scripts (and optionally base64 encodes)
 
-        This sets mtime on the gzipped file to 0 (unix epoch) to prevent userData changing every render.
+        :param resolved_args: Arguments to be provided to the Jinja renderer
+        :return: Rendered MIME multipart archive
+        """
+        rendered = self._get_rendered(resolved_args, compressed=False)
+        return rendered.raw_base64 if self._base64_encode else rendered.raw
 
-        :param template:
-        :return:
+    def _render_compressed(self, resolved_args):
         """
-        return b64encode(gzip.compress(bytes(template, "utf-8"), mtime=0)).decode(encoding="utf-8")
+        Render the cloud-config and shell scripts, then gzip and base64 the archive
+
+        :param resolved_args: Arguments to be provided to the Jinja renderer
+        :return: Base64 encoded gzipped MIME multipart archive
+        """
+        return self._get_rendered(resolved_args, compressed=True).gzip_base64
 
     @property
     def template(self) -> Output[str]:
@@ -241,6 +260,35 @@ class UserData(ComponentResource):
         """
         Render the template and gzip it, returning as a pulumi.Output
 
+        This sets mtime on the gzipped file to 0 (unix epoch) to prevent userData changing every render.
+
         :return:
         """
-        return self._template_vars.apply(self._render_internal).apply(self._compress)
+        return self._template_vars.apply(self._render_compressed)
+
+
+@run_once
+def _get_cloudconfig() -> str:
+    """
+    Generate the cloud-config document, which is the same for every UserData in the program
+
+    :return: Cloud-config YAML
+    """
+    thunder_users = [
+        {
+            "name": user["name"],
+            "groups": user["groups"],
+            "sudo": "ALL=(ALL) NOPASSWD:ALL",
+            "ssh_authorized_keys": user["ssh_authorized_keys"],
+        }
+        for user in thunder_env.require("ssh_users")
+    ]
+    users = ["default"] + thunder_users
+
+    cloud_init = {
+        "users": users,
+        # default is /mnt, we want to move this elsewhere
+        "mounts": [["ephemeral0", "/mnt/ephemeral0"]],
+    }
+
+    return yaml.safe_dump(cloud_init)
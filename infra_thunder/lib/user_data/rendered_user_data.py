@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import json
+from base64 import b64encode
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Hashable
+
+EC2_USER_DATA_LIMIT = 16 * 1024
+"""EC2 rejects user data larger than 16 KB, measured before base64 encoding"""
+
+AZURE_CUSTOM_DATA_LIMIT = 64 * 1024 - 1
+"""Azure rejects custom data that decodes to more than 65535 bytes"""
+
+USER_DATA_LIMITS = {
+    "aws": EC2_USER_DATA_LIMIT,
+    "az": AZURE_CUSTOM_DATA_LIMIT,
+}
+"""Limit of each cloud provider, keyed like ``get_provider_and_region`` names them"""
+
+
+class UserDataTooLargeException(Exception):
+    pass
+
+
+@dataclass
+class RenderedUserData:
+    """
+    A rendered MIME multipart archive, with its compressed and encoded forms computed on first use
+    """
+
+    raw: str
+    """The MIME multipart archive"""
+
+    sections: dict[str, int] = field(default_factory=dict)
+    """Size in bytes of each part of the archive, by filename"""
+
+    @cached_property
+    def raw_bytes(self) -> bytes:
+        return self.raw.encode("utf-8")
+
+    @cached_property
+    def gzipped(self) -> bytes:
+        # mtime is set to 0 (unix epoch) to prevent userData changing every render
+        return gzip.compress(self.raw_bytes, mtime=0)
+
+    @cached_property
+    def raw_base64(self) -> str:
+        return b64encode(self.raw.encode(encoding="ascii")).decode(encoding="ascii")
+
+    @cached_property
+    def gzip_base64(self) -> str:
+        return b64encode(self.gzipped).decode(encoding="utf-8")
+
+    def get_sizes(self) -> dict[str, int]:
+        """
+        :return: Size in bytes of the raw archive, the gzipped archive, and the base64 encoded gzipped archive
+        """
+        return {
+            "raw": len(self.raw_bytes),
+            "gzip": len(self.gzipped),
+            "base64": len(self.gzip_base64),
+        }
+
+    def check_size(self, name: str, provider: str, compressed: bool) -> None:
+        """
+        Make sure the payload the cloud provider will decode fits within its limit
+
+        :param name: Name of the UserData resource, for error messages
+        :param provider: Cloud provider (see ``USER_DATA_LIMITS``)
+        :param compressed: Whether the payload is the gzipped archive rather than the raw archive
+        :raises UserDataTooLargeException: When the payload is over the limit
+        """
+        limit = USER_DATA_LIMITS.get(provider)
+        size = len(self.gzipped) if compressed else len(self.raw_bytes)
+        if limit is None or size <= limit:
+            return
+
+        breakdown = ", ".join(f"{section}: {section_size} B" for section, section_size in self.sections.items())
+        raise UserDataTooLargeException(
+            f"user data `{name}` is {size} B{' gzipped' if compressed else ''}, over the {provider} limit of "
+            f"{limit} B (raw archive {len(self.raw_bytes)} B - {breakdown})"
+        )
+
+
+_renders: dict[Hashable, RenderedUserData] = {}
+
+
+def get_digest(value: Any) -> str:
+    """
+    Digest a JSON-like value, such as the resolved replacements of a UserData
+
+    :param value: The value
+    :return: Hex digest
+    """
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_rendered_user_data(key: Hashable, render: Callable[[], RenderedUserData]) -> RenderedUserData:
+    """
+    Get a rendered archive from the render cache, rendering it on a miss.
+
+    UserData with the same template, replacements and cloud-config (for example the nodegroups of a cluster) share
+    the rendered archive along with its compressed and encoded forms.
+
+    :param key: Digests of everything that goes into the archive
+    :param render: Renders the archive
+    :return: The rendered archive
+    """
+    if key not in _renders:
+        _renders[key] = render()
+
+    return _renders[key]
@@ -0,0 +1,85 @@
+import hashlib
+from pathlib import Path
+
+import jinja2
+
+from infra_thunder.lib.utils import get_cache_dir, memoize, run_once
+
+TEMPLATE_CACHE_NAME = "templates"
+"""Name of the on-disk cache holding compiled template bytecode"""
+
+
+class _AbsolutePathLoader(jinja2.BaseLoader):
+    """
+    Load templates by absolute path.
+
+    UserData templates live next to the module using them or in the SysEnv directory, so there is no fixed set of
+    search paths to give to a ``FileSystemLoader``. Like ``FileSystemLoader``, a template is reloaded when its mtime
+    changes.
+    """
+
+    def get_source(self, environment: jinja2.Environment, template: str):
+        path = Path(template)
+        try:
+            source = path.read_text()
+        except FileNotFoundError:
+            raise jinja2.TemplateNotFound(template)
+
+        mtime = path.stat().st_mtime
+
+        def uptodate() -> bool:
+            try:
+                return path.stat().st_mtime == mtime
+            except OSError:
+                return False
+
+        return source, str(path), uptodate
+
+
+@run_once
+def get_template_environment() -> jinja2.Environment:
+    """
+    Get the Jinja2 environment shared by every UserData in the program.
+
+    Parsed templates are kept in memory, keyed by path and mtime, so a template is parsed once per program no matter
+    how many launch templates render it. Compiled bytecode is also kept in ``.thunder-cache/templates`` (see
+    ``get_cache_dir``) to skip compilation on the next run.
+
+    :return: The Jinja2 environment
+    """
+    bytecode_cache = None
+    if (cache_dir := get_cache_dir(TEMPLATE_CACHE_NAME)) is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_dir))
+
+    return jinja2.Environment(
+        loader=_AbsolutePathLoader(),
+        undefined=jinja2.StrictUndefined,
+        bytecode_cache=bytecode_cache,
+        auto_reload=True,
+    )
+
+
+def get_template(path: Path) -> jinja2.Template:
+    """
+    Get a compiled template from the shared environment
+
+    :param path: Absolute path to the template
+    :return: The template
+    """
+    return get_template_environment().get_template(str(path))
+
+
+@memoize
+def _get_file_digest(path: Path, mtime: float) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def get_template_digest(path: Path) -> str:
+    """
+    Digest the source of a template. Digests are computed once per template version.
+
+    :param path: Absolute path to the template
+    :return: Hex digest
+    """
+    return _get_file_digest(path, path.stat().st_mtime)
@@ -1,3 +1,7 @@
+from .get_cache_dir import get_cache_dir
 from .kebab_from_snake import kebab_from_snake
+from .lazy_exports import lazy_attributes, lazy_exports
+from .memoize import memoize, get_memoize_stats, MemoizeStats
 from .outputs_from_exports import outputs_from_exports
 from .run_once import run_once
+from .run_concurrently import run_concurrently
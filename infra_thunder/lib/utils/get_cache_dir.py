@@ -0,0 +1,31 @@
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR_ENV = "THUNDER_CACHE_DIR"
+"""Environment variable used to relocate every on-disk Thunder cache"""
+
+DEFAULT_CACHE_DIR_NAME = ".thunder-cache"
+"""Name of the cache directory created next to the entrypoint (the SysEnv directory)"""
+
+
+def get_cache_dir(name: str) -> Optional[Path]:
+    """Get the directory used by a named on-disk cache
+
+    Caches live in ``.thunder-cache/{name}`` next to the `__main__` module, which is the SysEnv directory when running
+    through the ``thunder.py`` launcher. Set ``THUNDER_CACHE_DIR`` to move all caches elsewhere (CI, tests).
+
+    The directory is not created by this function.
+
+    :param name: Name of the cache
+    :return: Path to the cache directory, or None if no location could be determined (REPL, embedded interpreter)
+    """
+    if override := os.getenv(CACHE_DIR_ENV):
+        return Path(override).absolute() / name
+
+    main_module = sys.modules.get("__main__")
+    if not hasattr(main_module, "__file__"):
+        return None
+
+    return Path(main_module.__file__).absolute().parent / DEFAULT_CACHE_DIR_NAME / name
@@ -0,0 +1,52 @@
+import sys
+from functools import partial
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_attributes(module: str, attributes: dict[str, Callable[[], Any]]) -> Callable[[str], Any]:
+    """
+    Build a module ``__getattr__`` (PEP 562) that computes attributes on first access, instead of when the module is
+    imported, and caches them on the module.
+
+    Example, in a module that reads the configuration::
+
+        __getattr__ = lazy_attributes(__name__, {"PARAMETER_STORE_COMMON": get_parameter_store_common})
+
+    :param module: Name of the module, usually ``__name__``
+    :param attributes: Mapping of attribute names to the functions computing them
+    :return: The ``__getattr__`` function
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {module!r} has no attribute {name!r}")
+
+        value = attributes[name]()
+        # cache on the module, so later lookups don't go through __getattr__
+        setattr(sys.modules[module], name, value)
+        return value
+
+    return __getattr__
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """
+    Build a module ``__getattr__`` (PEP 562) that imports the names a package re-exports on first access, instead of
+    when the package is imported.
+
+    Example, in a package ``__init__.py``::
+
+        __getattr__ = lazy_exports(__name__, {"run_stacks": ".run_stacks"})
+
+    :param package: Name of the package, usually ``__name__``
+    :param exports: Mapping of exported names to the (relative) module defining them
+    :return: The ``__getattr__`` function
+    """
+    return lazy_attributes(
+        package, {name: partial(_import_export, package, module, name) for name, module in exports.items()}
+    )
+
+
+def _import_export(package: str, module: str, name: str) -> Any:
+    return getattr(import_module(module, package), name)
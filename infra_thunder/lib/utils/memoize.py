@@ -0,0 +1,90 @@
+import inspect
+from dataclasses import dataclass
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Hashable
+
+from pulumi import InvokeOptions, Output, Resource
+
+
+@dataclass
+class MemoizeStats:
+    hits: int = 0
+    """Calls answered from the cache"""
+
+    misses: int = 0
+    """Calls that executed the wrapped function"""
+
+
+_stats: dict[str, MemoizeStats] = {}
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Convert an argument into a hashable cache key component
+
+    - ``InvokeOptions`` are keyed by the identity of their provider and parent, since those decide where the invoke runs
+    - Resources, Outputs and classes are keyed by identity
+    - lists, dicts and Pulumi input types (``ec2.GetVpcFilterArgs`` and friends) are keyed by value
+    """
+    if isinstance(value, InvokeOptions):
+        return InvokeOptions, value.provider, value.parent, value.version
+    elif isinstance(value, (str, int, float, bool, type(None), Enum, Resource, Output, type)):
+        return value
+    elif isinstance(value, dict):
+        return tuple(sorted(((str(k), _freeze(v)) for k, v in value.items()), key=lambda item: item[0]))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        frozen = tuple(_freeze(v) for v in value)
+        return frozen if isinstance(value, (list, tuple)) else frozenset(frozen)
+    elif hasattr(value, "__dict__"):
+        return type(value), _freeze(vars(value))
+    else:
+        return value
+
+
+def memoize(func: Callable) -> Callable:
+    """
+    Decorator that caches the result of a lookup helper for the lifetime of the program.
+
+    Arguments are normalized against the function signature (so ``f()`` and ``f(None)`` share an entry when ``None`` is
+    the default), and converted to hashable keys (see ``_freeze``). Hits and misses are counted per function and can be
+    read with ``get_memoize_stats()``.
+
+    Example::
+
+        @memoize
+        def get_default_security_groups(vpc_id: Optional[str] = None) -> ec2.AwaitableGetSecurityGroupsResult:
+            ...
+
+    :param func: The decorated function
+    """
+    signature = inspect.signature(func)
+    results: dict[Hashable, Any] = {}
+    stats = _stats.setdefault(f"{func.__module__}.{func.__qualname__}", MemoizeStats())
+
+    @wraps(func)
+    def memoized_func(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = _freeze(bound.arguments)
+
+        if key in results:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+            results[key] = func(*args, **kwargs)
+
+        return results[key]
+
+    memoized_func.cache_clear = results.clear
+
+    return memoized_func
+
+
+def get_memoize_stats() -> dict[str, MemoizeStats]:
+    """
+    Get the hit/miss counters of every memoized function, keyed by the function's qualified name
+
+    :return: Mapping of function name to MemoizeStats
+    """
+    return dict(_stats)
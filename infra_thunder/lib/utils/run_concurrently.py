@@ -0,0 +1,43 @@
+import asyncio
+from typing import Callable, Hashable, TypeVar
+
+# Private API of the Pulumi SDK, pinned to 3.9.1 in pyproject.toml. That version has no public way to await invokes:
+# `pulumi.runtime.invoke` blocks on this same function, which pumps the event loop until its future is done. Check
+# that it still exists, and still allows nested calls, when upgrading Pulumi.
+from pulumi.runtime.sync_await import _sync_await
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+def run_concurrently(calls: dict[K, Callable[[], T]]) -> dict[K, T]:
+    """
+    Run blocking Pulumi invokes (``ec2.get_vpc(...)`` and friends) concurrently, and wait for all of them.
+
+    A Pulumi invoke blocks by pumping the program's event loop until the engine answers. Running each call in its own
+    task means that while one call waits, the loop starts the next one, so every request is sent to the engine before
+    the first answer is awaited. This is the same mechanism Pulumi uses for invokes made inside ``apply``.
+
+    The requests themselves are made from the event loop's default executor, which bounds how many are in flight.
+    Calls are all started up front on purpose: a call can only return once the calls started after it have, so
+    holding some back (with a semaphore, say) would mostly serialize them. For the same reason, calls return in the
+    reverse order of their start, whatever order the engine answers them in.
+
+    Example::
+
+        vpcs = run_concurrently({
+            sysenv: partial(ec2.get_vpc, filters=[...], opts=InvokeOptions(provider=provider))
+            for sysenv, provider in providers.items()
+        })
+
+    :param calls: Mapping of keys to the calls to make
+    :return: Mapping of keys to the results of their calls
+    """
+
+    async def run(key: K, call: Callable[[], T]) -> tuple[K, T]:
+        return key, call()
+
+    async def run_all() -> list[tuple[K, T]]:
+        return await asyncio.gather(*(run(key, call) for key, call in calls.items()))
+
+    return dict(_sync_await(run_all()))
@@ -1,9 +1,14 @@
 from pulumi_aws import ec2
 
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 from .constants import DEFAULT_PREFIX_LIST, SUPERNET
-from ..config import tag_prefix, get_sysenv
+from ..config import get_tag_prefix, get_sysenv
+from ..invoke_cache import cached_invoke, PREFIX_LIST_TTL
 
 
+@memoize
+@profiled("lookup")
 def get_prefix_list() -> ec2.AwaitableGetManagedPrefixListResult:
     """
     Get the prefix lists valid for this SysEnv.
@@ -11,21 +16,23 @@ def get_prefix_list() -> ec2.AwaitableGetManagedPrefixListResult:
 
     :return:
     """
-    return ec2.get_managed_prefix_list(
+    return cached_invoke(
+        ec2.get_managed_prefix_list,
+        ttl=PREFIX_LIST_TTL,
         filters=[
             ec2.GetManagedPrefixListFilterArgs(
-                name=f"tag:{tag_prefix}service",
+                name=f"tag:{get_tag_prefix()}service",
                 values=[DEFAULT_PREFIX_LIST],
             ),
             ec2.GetManagedPrefixListFilterArgs(
-                name=f"tag:{tag_prefix}role",
+                name=f"tag:{get_tag_prefix()}role",
                 values=[SUPERNET],
             ),
             ec2.GetManagedPrefixListFilterArgs(
-                name=f"tag:{tag_prefix}sysenv",
+                name=f"tag:{get_tag_prefix()}sysenv",
                 values=[get_sysenv()],
             ),
-        ]
+        ],
     )
 
 
@@ -1,19 +1,24 @@
 from pulumi_aws import ec2
 
-from infra_thunder.lib.config import tag_prefix
+from infra_thunder.lib.config import get_tag_prefix
+from infra_thunder.lib.invoke_cache import cached_invoke, NETWORK_TTL
 from infra_thunder.lib.tags import get_sysenv
-from infra_thunder.lib.utils import run_once
+from infra_thunder.lib.profiling import profiled
+from infra_thunder.lib.utils import memoize
 
 
-@run_once
+@memoize
+@profiled("lookup")
 def get_vpc() -> ec2.AwaitableGetVpcResult:
     """
     Get the VPC for the current program
     :return: VPC object
     """
-    return ec2.get_vpc(
+    return cached_invoke(
+        ec2.get_vpc,
+        ttl=NETWORK_TTL,
         filters=[
-            ec2.GetVpcFilterArgs(name=f"tag:{tag_prefix}service", values=["VPC"]),
-            ec2.GetVpcFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[get_sysenv()]),
-        ]
+            ec2.GetVpcFilterArgs(name=f"tag:{get_tag_prefix()}service", values=["VPC"]),
+            ec2.GetVpcFilterArgs(name=f"tag:{get_tag_prefix()}sysenv", values=[get_sysenv()]),
+        ],
     )
@@ -0,0 +1,27 @@
+import argparse
+import json
+import sys
+
+from .module_registry import MODULE_REGISTRY_FILE, generate_module_registry
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate the Thunder module registry")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if the registry is out of date")
+    args = parser.parse_args()
+
+    content = json.dumps(generate_module_registry(), indent=2) + "\n"
+
+    if args.check:
+        if not MODULE_REGISTRY_FILE.is_file() or MODULE_REGISTRY_FILE.read_text() != content:
+            print(f"{MODULE_REGISTRY_FILE} is out of date, run `poe generate-module-registry`")
+            return 1
+        return 0
+
+    MODULE_REGISTRY_FILE.write_text(content)
+    print(f"wrote {MODULE_REGISTRY_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
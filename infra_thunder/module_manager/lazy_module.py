@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 from importlib import import_module
 from types import ModuleType
 from typing import Type, Optional
@@ -7,7 +8,6 @@ from pulumi import log, ResourceOptions
 
 from infra_thunder.lib.base import BaseModule, ExportsType
 from infra_thunder.lib.config import get_stack_config
-from infra_thunder.lib.utils import run_once
 
 
 @dataclass
@@ -24,13 +24,18 @@ class LazyModule:
     name: str
     """Name of the python module"""
 
+    module_path: Optional[str] = None
+    """Absolute import path of the python module. Defaults to ``infra_thunder.modules.{provider}.{name}``"""
+
+    class_name: Optional[str] = None
+    """Name of the module class. If unknown, the python module is scanned for it"""
+
     @property
-    @run_once
-    def path(self):
-        return f".modules.{self.provider}.{self.name}"
+    def path(self) -> str:
+        return self.module_path or f"infra_thunder.modules.{self.provider}.{self.name}"
 
     def _find_module_in_dir(self, module_dir: ModuleType) -> Type[BaseModule]:
-        # very inefficient
+        # only used when the registry doesn't know the class name, see `module_registry`
         for key, value in vars(module_dir).items():
             if not key.startswith("_"):
                 if isinstance(value, type) and issubclass(value, BaseModule):
@@ -40,14 +45,23 @@ class LazyModule:
 
         raise ModuleNotFoundError(f"no subclass of `{BaseModule.__name__}` found in `{self.path}`")
 
-    @property
-    @run_once
+    def _get_module_class(self, module_dir: ModuleType) -> Type[BaseModule]:
+        module_cls = getattr(module_dir, self.class_name, None)
+        if not (isinstance(module_cls, type) and issubclass(module_cls, BaseModule)):
+            raise ModuleNotFoundError(f"`{self.path}.{self.class_name}` is not a subclass of `{BaseModule.__name__}`")
+
+        return module_cls
+
+    @cached_property
     def Module(self) -> Type[BaseModule]:
-        log.debug(f"performing first-time import for module at `thunder{self.path}`")
+        log.debug(f"performing first-time import for module at `{self.path}`")
+
+        module_dir = import_module(self.path)
 
-        module_dir = import_module(self.path, "infra_thunder")
+        if self.class_name is None:
+            return self._find_module_in_dir(module_dir)
 
-        return self._find_module_in_dir(module_dir)
+        return self._get_module_class(module_dir)
 
     def run(self, stack_name: str, opts: Optional[ResourceOptions] = None) -> ExportsType:
         """Invoke a thunder module with the stack configuration
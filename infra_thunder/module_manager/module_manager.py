@@ -2,6 +2,7 @@ from pulumi import log
 
 from .discover_modules import discover_modules
 from .lazy_module import LazyModule
+from .module_registry import load_module_registry
 
 
 class _ModuleManager:
@@ -14,20 +15,30 @@ class _ModuleManager:
 
             {
                 "shared":
-                    "seed": LazyModule(provider='shared', name='seed'),
+                    "seed": LazyModule(provider='shared', name='seed', ...),
                 },
                 "aws": {
-                    "s3": LazyModule(provider='aws', name='s3'),
-                    "ssm": LazyModule(provider='aws', name='ssm'),
+                    "s3": LazyModule(provider='aws', name='s3', ...),
+                    "ssm": LazyModule(provider='aws', name='ssm', ...),
                 },
                 "azure": {
-                    "dns": LazyModule(provider='azure', name='dns'),
+                    "dns": LazyModule(provider='azure', name='dns', ...),
                 }
             }
         """
-        self.modules = discover_modules()
+        self.modules, self._discovered = load_module_registry()
 
-        log.debug(f"discovered modules `{self.modules}`")
+        log.debug(f"loaded modules `{self.modules}`")
+
+    def _discover(self) -> None:
+        """Walk the modules directory, for modules that were added after the registry was generated"""
+        log.debug("module not in the registry, discovering modules")
+
+        for provider, modules in discover_modules().items():
+            for name, lazy_module in modules.items():
+                self.modules.setdefault(provider, {}).setdefault(name, lazy_module)
+
+        self._discovered = True
 
     def get_module(self, provider: str, module_name: str) -> LazyModule:
         """Returns the module's class without calling it.
@@ -36,6 +47,9 @@ class _ModuleManager:
         :param module_name: Module name
         :return: A LazyModule
         """
+        if module_name not in self.modules.get(provider, {}) and not self._discovered:
+            self._discover()
+
         try:
             lazy_module = self.modules[provider][module_name]
 
@@ -0,0 +1,140 @@
+import ast
+import json
+import os
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Optional
+
+from pulumi import log
+
+from infra_thunder.lib.utils import kebab_from_snake
+from .discover_modules import discover_modules, _get_dirs, _get_package_path, _module_container_name, _package_name
+from .lazy_module import LazyModule
+
+MODULE_REGISTRY_FILE = Path(__file__).absolute().parent / "module_registry.json"
+"""Manifest of the modules shipped with Thunder, generated with ``python -m infra_thunder.module_manager``"""
+
+ENTRY_POINT_GROUP = "infra_thunder.modules"
+"""Entry point group for modules from other packages, named ``{provider}.{module-name}``"""
+
+REGISTRY_MODE_VARIABLE = "THUNDER_MODULE_REGISTRY"
+"""Set to ``discover`` to ignore the manifest and walk ``infra_thunder/modules`` instead"""
+
+RegistryType = dict[str, dict[str, LazyModule]]
+
+
+def _get_module_class(package_dir: Path) -> Optional[str]:
+    """Find the class that a module package re-exports from one of its files
+
+    :param package_dir: Path to the module package
+    :return: The name of the class, or None if it can't be found without importing the package
+    """
+    init_file = package_dir / "__init__.py"
+    if not init_file.is_file():
+        return None
+
+    for node in ast.parse(init_file.read_text()).body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            classes = _get_classes(package_dir / f"{node.module.replace('.', '/')}.py")
+            for alias in node.names:
+                if alias.name in classes:
+                    return alias.asname or alias.name
+
+    return None
+
+
+def _get_classes(source_file: Path) -> set[str]:
+    """Get the names of the classes defined at the top level of a file
+
+    :param source_file: Path to the file
+    :return: Names of the classes, empty if the file doesn't exist
+    """
+    if not source_file.is_file():
+        return set()
+
+    return {node.name for node in ast.parse(source_file.read_text()).body if isinstance(node, ast.ClassDef)}
+
+
+def generate_module_registry() -> dict[str, dict[str, dict[str, Optional[str]]]]:
+    """Build the module manifest from the modules in the package, without importing any of them
+
+    :return: A mapping of providers to mappings of module names to their import path and class name
+    """
+    providers_path = _get_package_path() / _module_container_name
+
+    return {
+        provider: {
+            kebab_from_snake(module_name): {
+                "module": f"{_package_name}.{_module_container_name}.{provider}.{module_name}",
+                "class": _get_module_class(providers_path / provider / module_name),
+            }
+            for module_name in sorted(_get_dirs(providers_path / provider))
+        }
+        for provider in sorted(_get_dirs(providers_path))
+    }
+
+
+def _read_module_registry() -> Optional[RegistryType]:
+    """Read the module manifest
+
+    :return: A mapping of providers to mappings of module names to lazy modules, or None if there is no manifest
+    """
+    if os.getenv(REGISTRY_MODE_VARIABLE) == "discover" or not MODULE_REGISTRY_FILE.is_file():
+        return None
+
+    manifest = json.loads(MODULE_REGISTRY_FILE.read_text())
+
+    return {
+        provider: {
+            name: LazyModule(provider, entry["module"].rpartition(".")[2], entry["module"], entry["class"])
+            for name, entry in modules.items()
+        }
+        for provider, modules in manifest.items()
+    }
+
+
+def _get_entry_points() -> list:
+    eps = entry_points()
+
+    # `entry_points()` returns a dict of groups before Python 3.10
+    return list(eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, []))
+
+
+def _add_entry_point_modules(registry: RegistryType) -> None:
+    """Add the modules that other packages register under the ``infra_thunder.modules`` entry point group
+
+    :param registry: The registry to add the modules to
+    """
+    for entry_point in _get_entry_points():
+        provider, _, name = entry_point.name.partition(".")
+        if not name or not entry_point.attr:
+            log.warn(
+                f"ignoring module entry point `{entry_point.name} = {entry_point.value}`: expected `provider.name = package.module:Class`"
+            )
+            continue
+
+        if name in registry.get(provider, {}):
+            log.warn(
+                f"ignoring module entry point `{entry_point.name}`: module `{name}` already exists for `{provider}`"
+            )
+            continue
+
+        registry.setdefault(provider, {})[name] = LazyModule(provider, name, entry_point.module, entry_point.attr)
+
+
+def load_module_registry() -> tuple[RegistryType, bool]:
+    """Load the module registry
+
+    Modules come from the manifest shipped with the package, or from walking ``infra_thunder/modules`` when there is
+    no manifest (or ``THUNDER_MODULE_REGISTRY=discover``), plus the modules registered by other packages' entry points.
+
+    :return: The registry, and whether it was built by walking the modules directory
+    """
+    registry = _read_module_registry()
+    discovered = registry is None
+    if discovered:
+        registry = discover_modules()
+
+    _add_entry_point_modules(registry)
+
+    return registry, discovered
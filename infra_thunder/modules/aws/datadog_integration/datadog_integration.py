@@ -4,7 +4,7 @@ from pulumi_aws import cloudformation, iam, ssm, secretsmanager
 
 from infra_thunder.lib.aws.base import AWSModule
 from infra_thunder.lib.config import get_stack
-from infra_thunder.lib.ssm import PARAMETER_STORE_COMMON
+from infra_thunder.lib.ssm import get_parameter_store_common
 from .config import DatadogConfig, DatadogExports
 
 
@@ -27,19 +27,19 @@ class DatadogIntegration(AWSModule):
             self.datadog_api_key = config.api_key
         else:
             self.datadog_api_key = Output.secret(
-                ssm.get_parameter(f"{PARAMETER_STORE_COMMON}/DD_API_KEY", with_decryption=True).value
+                ssm.get_parameter(f"{get_parameter_store_common()}/DD_API_KEY", with_decryption=True).value
             )
         if config.app_key:
             self.datadog_app_key = config.app_key
         else:
             self.datadog_app_key = Output.secret(
-                ssm.get_parameter(f"{PARAMETER_STORE_COMMON}/DD_APP_KEY", with_decryption=True).value
+                ssm.get_parameter(f"{get_parameter_store_common()}/DD_APP_KEY", with_decryption=True).value
             )
         if config.datadog_site:
             self.datadog_site = config.datadog_site
         else:
             self.datadog_site = Output.secret(
-                ssm.get_parameter(f"{PARAMETER_STORE_COMMON}/DD_SITE", with_decryption=True).value
+                ssm.get_parameter(f"{get_parameter_store_common()}/DD_SITE", with_decryption=True).value
             )
         self.datadog_api_url = Output.concat("https://api.", self.datadog_site, "/")
 
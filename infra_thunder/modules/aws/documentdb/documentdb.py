@@ -131,7 +131,7 @@ class DocumentDB(AWSModule):
                 "@",
                 cluster.endpoint,
                 ":",
-                cluster.port,
+                cluster.port.apply(lambda v: str(v)),
                 "/",
             ),
             opts=ResourceOptions(parent=cluster),
@@ -2,10 +2,10 @@ from pulumi import ResourceOptions, Output
 from pulumi_aws import iam
 
 from infra_thunder.lib.aws.base import AWSModule
-from infra_thunder.lib.aws.kinesis import get_stream
-from infra_thunder.lib.aws.sqs import get_queue
-from infra_thunder.lib.s3 import get_bucket
-from infra_thunder.lib.iam import create_policy
+from infra_thunder.lib.aws.kinesis import get_streams
+from infra_thunder.lib.aws.sqs import get_queues
+from infra_thunder.lib.s3 import get_buckets
+from infra_thunder.lib.iam import create_packed_policies, generate_statements
 from infra_thunder.lib.iam.generators import assumable_roles
 from .config import RoleConfig, Role, RoleExports
 
@@ -17,6 +17,11 @@ class IAMRoles(AWSModule):
 
         path = f"{assumable_roles.ASSUMABLE_ROLES_PATH}/"
 
+        # Resolve every referenced bucket, stream and queue in one pass over each stack output
+        self.buckets = get_buckets({bucket for role in config.roles for bucket in role.buckets})
+        self.streams = get_streams({stream for role in config.roles for stream in role.kinesis})
+        self.queues = get_queues({queue for role in config.roles for queue in role.sqs})
+
         # Create the roles themselves
         roles = [self._create_role(path, definition) for definition in config.roles]
 
@@ -51,118 +56,96 @@ class IAMRoles(AWSModule):
             opts=ResourceOptions(parent=self),
         )
 
-        for bucket in role_definition.buckets:
-            self._create_bucket_policy(bucket, role, role_definition.name)
-
-        for stream in role_definition.kinesis:
-            self._create_kinesis_policy(stream, role, role_definition.name)
-
-        for queue in role_definition.sqs:
-            self._create_sqs_policy(queue, role, role_definition.name)
-
-        for policy in role_definition.policies:
-            create_policy(self, policy, role)
+        # Grant every bucket, stream, queue and custom policy with as few policies as the IAM size limits allow
+        create_packed_policies(
+            f"{role_definition.name}-policy",
+            role,
+            [
+                *(self._get_bucket_statements(bucket) for bucket in role_definition.buckets),
+                *(self._get_kinesis_statements(stream) for stream in role_definition.kinesis),
+                *(self._get_sqs_statements(queue) for queue in role_definition.sqs),
+                *(generate_statements(self, policy) for policy in role_definition.policies),
+            ],
+        )
 
         return role
 
-    def _create_bucket_policy(self, bucket: str, role: iam.Role, role_name: str) -> iam.RolePolicy:
+    def _get_bucket_statements(self, bucket: str) -> list[dict]:
         """
-        Create an inline policy for a given S3 bucket
+        Get the policy statements for a given S3 bucket
         :param bucket:
         :return:
         """
-        bucket_name = get_bucket(bucket)["bucket"]
-        bucket_policy_name = bucket.replace("/", "_").replace("*", "star")
-        return iam.RolePolicy(
-            f"{role_name}-s3-{bucket_policy_name}",
-            policy={
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": ["s3:ListBucket"],
-                        "Resource": Output.concat(f"arn:{self.partition}:s3:::", bucket_name),
-                    },
-                    {
-                        "Effect": "Allow",
-                        "Action": ["s3:Put*", "s3:Get*", "s3:DeleteObject"],
-                        "Resource": Output.concat(f"arn:{self.partition}:s3:::", bucket_name, "/*"),
-                    },
-                ]
+        bucket_name = self.buckets[bucket]["bucket"]
+        return [
+            {
+                "Effect": "Allow",
+                "Action": ["s3:ListBucket"],
+                "Resource": Output.concat(f"arn:{self.partition}:s3:::", bucket_name),
             },
-            role=role.id,
-            opts=ResourceOptions(parent=role),
-        )
+            {
+                "Effect": "Allow",
+                "Action": ["s3:Put*", "s3:Get*", "s3:DeleteObject"],
+                "Resource": Output.concat(f"arn:{self.partition}:s3:::", bucket_name, "/*"),
+            },
+        ]
 
-    def _create_kinesis_policy(self, name: str, role: iam.Role, role_name: str) -> iam.RolePolicy:
+    def _get_kinesis_statements(self, name: str) -> list[dict]:
         """
-        Create an inline policy for a given kinesis stream
+        Get the policy statements for a given kinesis stream
         """
-        arn = get_stream(name)["arn"]
-
-        return iam.RolePolicy(
-            f"{role_name}-kinesis-{name}",
-            policy={
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            f"kinesis:{a}"
-                            for a in (
-                                # https://docs.aws.amazon.com/service-authorization/latest/reference/list_amazonkinesis.html
-                                "Describe*",
-                                "Get*",
-                                "List*",
-                                "Put*",
-                                "RegisterStreamConsumer",
-                                "DeregisterStreamConsumer",
-                                "SubscribeToShard",
-                                "SplitShard",
-                                "MergeShards",
-                                "UpdateShardCount",
-                            )
-                        ],
-                        "Resource": [
-                            arn,
-                            Output.concat(arn, "/*"),
-                        ],
-                    },
-                ]
+        arn = self.streams[name]["arn"]
+
+        return [
+            {
+                "Effect": "Allow",
+                "Action": [
+                    f"kinesis:{a}"
+                    for a in (
+                        # https://docs.aws.amazon.com/service-authorization/latest/reference/list_amazonkinesis.html
+                        "Describe*",
+                        "Get*",
+                        "List*",
+                        "Put*",
+                        "RegisterStreamConsumer",
+                        "DeregisterStreamConsumer",
+                        "SubscribeToShard",
+                        "SplitShard",
+                        "MergeShards",
+                        "UpdateShardCount",
+                    )
+                ],
+                "Resource": [
+                    arn,
+                    Output.concat(arn, "/*"),
+                ],
             },
-            role=role.id,
-            opts=ResourceOptions(parent=role),
-        )
+        ]
 
-    def _create_sqs_policy(self, name: str, role: iam.Role, role_name: str) -> iam.RolePolicy:
+    def _get_sqs_statements(self, name: str) -> list[dict]:
         """
-        Create an inline policy for a given sqs queue
+        Get the policy statements for a given sqs queue
         """
-        arn = get_queue(name)["arn"]
-
-        return iam.RolePolicy(
-            f"{role_name}-sqs-{name}",
-            policy={
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Action": [
-                            f"sqs:{a}"
-                            for a in (
-                                # https://docs.aws.amazon.com/service-authorization/latest/reference/list_amazonsqs.html
-                                "Get*",
-                                "List*",
-                                "Send*",
-                                "ReceiveMessage",
-                                "ChangeMessageVisibility",
-                                "ChangeMessageVisibilityBatch",
-                                "DeleteMessage",
-                                "DeleteMessageBatch",
-                                "PurgeQueue",
-                            )
-                        ],
-                        "Resource": [arn],
-                    },
-                ]
+        arn = self.queues[name]["arn"]
+
+        return [
+            {
+                "Effect": "Allow",
+                "Action": [
+                    f"sqs:{a}"
+                    for a in (
+                        # https://docs.aws.amazon.com/service-authorization/latest/reference/list_amazonsqs.html
+                        "Get*",
+                        "List*",
+                        "Send*",
+                        "ReceiveMessage",
+                        "ChangeMessageVisibility",
+                        "ChangeMessageVisibilityBatch",
+                        "DeleteMessage",
+                        "DeleteMessageBatch",
+                        "PurgeQueue",
+                    )
+                ],
+                "Resource": [arn],
             },
-            role=role.id,
-            opts=ResourceOptions(parent=role),
-        )
+        ]
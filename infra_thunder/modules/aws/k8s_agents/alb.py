@@ -2,6 +2,7 @@ from pulumi import ResourceOptions, ComponentResource, Output
 from pulumi_aws import athena, ec2, glue, lb, route53, s3, acm
 
 from infra_thunder.lib.config import get_stack, get_public_sysenv_domain, get_sysenv
+from infra_thunder.lib.route53 import get_zone
 from infra_thunder.lib.security_groups import (
     get_default_security_groups,
     ANY_IPV4_ADDRESS,
@@ -27,7 +28,7 @@ def create_alb(
     short_resource_name = generate_lb_name(cluster_name, tg_config.name)
 
     sysenv_domain = get_public_sysenv_domain()
-    zone_id = route53.get_zone(name=sysenv_domain).id
+    zone_id = get_zone(name=sysenv_domain).id
 
     tg = lb.TargetGroup(
         # taget groups max out at 32 chars, shorten it to fit
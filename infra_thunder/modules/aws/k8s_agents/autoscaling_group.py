@@ -3,7 +3,7 @@ from pulumi_aws import ec2, autoscaling, lb, iam, GetAmiResult
 
 from infra_thunder.lib.aws.kubernetes import get_ssm_path
 from infra_thunder.lib.config import get_stack
-from infra_thunder.lib.config import tag_prefix, tag_namespace
+from infra_thunder.lib.config import get_tag_prefix, get_tag_namespace
 from infra_thunder.lib.keypairs import get_keypair
 from infra_thunder.lib.kubernetes.constants import (
     MONITORING_SECRET_NAME,
@@ -38,7 +38,7 @@ def create_autoscaling_group(
     asg_tags = [
         *get_asg_tags(get_stack(), agent_config.cluster, nodegroup.name),
         {
-            "key": f"{tag_prefix}{NODEGROUP_TAG_KEY}",
+            "key": f"{get_tag_prefix()}{NODEGROUP_TAG_KEY}",
             "propagateAtLaunch": True,
             "value": NODEGROUP_TAG_VALUE,
         },
@@ -47,21 +47,21 @@ def create_autoscaling_group(
     lt_tags = get_tags(get_stack(), agent_config.cluster, nodegroup.name)
     taints = []
     if nodegroup.spot_instances:
-        taints.append(f"{tag_namespace}/{SPOT_TAG_KEY}={SPOT_TAG_VALUE}:NoSchedule")
-        lt_tags[f"{tag_prefix}{SPOT_TAG_KEY}"] = SPOT_TAG_VALUE
+        taints.append(f"{get_tag_namespace()}/{SPOT_TAG_KEY}={SPOT_TAG_VALUE}:NoSchedule")
+        lt_tags[f"{get_tag_prefix()}{SPOT_TAG_KEY}"] = SPOT_TAG_VALUE
         asg_tags.append(
             {
-                "key": f"{tag_prefix}{SPOT_TAG_KEY}",
+                "key": f"{get_tag_prefix()}{SPOT_TAG_KEY}",
                 "propagateAtLaunch": True,
                 "value": SPOT_TAG_VALUE,
             }
         )
     if nodegroup.dedicated:
-        taints.append(f"{tag_namespace}/{DEDICATED_TAG_KEY}={nodegroup.name}:NoSchedule")
-        lt_tags[f"{tag_prefix}{DEDICATED_TAG_KEY}"] = DEDICATED_TAG_VALUE
+        taints.append(f"{get_tag_namespace()}/{DEDICATED_TAG_KEY}={nodegroup.name}:NoSchedule")
+        lt_tags[f"{get_tag_prefix()}{DEDICATED_TAG_KEY}"] = DEDICATED_TAG_VALUE
         asg_tags.append(
             {
-                "key": f"{tag_prefix}{DEDICATED_TAG_KEY}",
+                "key": f"{get_tag_prefix()}{DEDICATED_TAG_KEY}",
                 "propagateAtLaunch": True,
                 "value": DEDICATED_TAG_VALUE,
             }
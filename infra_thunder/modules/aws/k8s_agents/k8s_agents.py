@@ -6,7 +6,7 @@ from pulumi_aws import s3, elb, athena, GetAmiResult
 from infra_thunder.lib.ami import get_ami
 from infra_thunder.lib.aws.base import AWSModule
 from infra_thunder.lib.config import get_stack, get_sysenv, get_public_sysenv_domain
-from infra_thunder.lib.iam import create_policy
+from infra_thunder.lib.iam import create_packed_policies, generate_statements
 from infra_thunder.lib.kubernetes import get_cluster
 from infra_thunder.lib.s3 import generate_bucket_name
 from infra_thunder.lib.tags import get_tags
@@ -104,9 +104,13 @@ class K8sAgents(AWSModule):
             self, cluster_component, agent_config.cluster, controller_config
         )
 
-        # Create custom policies and attach them to instance_role
-        for policy in agent_config.custom_iam_policies:
-            create_policy(self, policy, instance_role)
+        # Create custom policies and attach them to instance_role, packed into as few managed policies as possible: the
+        # role's inline policy quota is already used by the policies of the instance profile
+        create_packed_policies(
+            f"{agent_config.cluster}-custom-iam-policies",
+            instance_role,
+            [generate_statements(self, policy) for policy in agent_config.custom_iam_policies],
+        )
 
         # Create security group for the nodegroups
         security_group = create_nodegroup_securitygroup(cluster_component, agent_config.cluster)
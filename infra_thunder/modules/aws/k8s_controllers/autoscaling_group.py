@@ -1,7 +1,7 @@
 import ipaddress
 
 from pulumi import ComponentResource, ResourceOptions, Output
-from pulumi_aws import GetAmiResult, iam, ec2, ssm, autoscaling
+from pulumi_aws import GetAmiResult, iam, ec2, autoscaling
 
 from infra_thunder.lib.keypairs import get_keypair
 from infra_thunder.lib.security_groups import get_default_security_groups
@@ -18,7 +18,7 @@ def create_autoscaling_group(
     controller_profile: iam.InstanceProfile,
     controller_security_group: ec2.SecurityGroup,
     endpoint_name: str,
-    ssm_params: list[tuple[str, ssm.Parameter]],
+    ssm_params: list[tuple[str, Output[str]]],
     coredns_clusterip: str,
     backups_bucket: str,
     cluster_config: K8sControllerArgs,
@@ -64,7 +64,7 @@ def create_autoscaling_group(
                 # ssm parameters will be a space separated list of on-disk name and full SSM path
                 # "ssm_param_paths": [Output.concat(name, " ", param.name) for name, param in ssm_params],
                 # ssm parameters will be a tuple of on-disk name and full ssm path
-                "ssm_params": [Output.all(name, param.name) for name, param in ssm_params],
+                "ssm_params": [Output.all(name, path) for name, path in ssm_params],
                 "service_cidr": cluster_config.service_cidr,
                 "api_service_ip": ipaddress.ip_network(cluster_config.service_cidr)[1],
                 "cluster_domain": cluster_config.cluster_domain,
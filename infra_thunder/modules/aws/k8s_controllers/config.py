@@ -117,6 +117,11 @@ class K8sControllerConfig:
     e2d_snapshot_retention_time: int = 3
     """Days to keep e2d snapshots for"""
 
+    batch_ssm_parameters: bool = False
+    """Write the PKI parameters of each cluster with a single ``SSMParameters`` resource, at a rate that avoids
+    throttling, instead of one ``ssm.Parameter`` resource per parameter. On an existing stack, remove the
+    ``ssm.Parameter`` resources from the state first, or switching deletes the parameters: see the README."""
+
 
 @dataclass
 class K8sControllerExports:
@@ -1,15 +1,17 @@
 import ipaddress
 
-from pulumi import ComponentResource, ResourceOptions
-from pulumi_aws import ssm, route53, s3, sqs
+from pulumi import ComponentResource, Output, ResourceOptions
+from pulumi_aws import route53, s3, sqs
 
 from infra_thunder.lib.ami import get_ami
 from infra_thunder.lib.aws.base import AWSModule
-from infra_thunder.lib.config import tag_namespace, get_public_sysenv_domain
+from infra_thunder.lib.config import get_tag_namespace, get_public_sysenv_domain
+from infra_thunder.lib.kubernetes.common.kube_wait import KubeWaiter
 from infra_thunder.lib.kubernetes.kubeconfig import (
     generate_admin_kubeconfig,
     generate_iam_kubeconfig,
 )
+from infra_thunder.lib.route53 import get_zone
 from infra_thunder.lib.s3 import generate_bucket_name
 from infra_thunder.lib.subnets import get_subnets_attributes
 from infra_thunder.lib.tags import get_tags, get_sysenv, get_stack
@@ -36,7 +38,7 @@ from .pki import (
     create_service_account_keypair,
 )
 from .security_group import create_controller_security_group, create_pod_security_group
-from .ssm import create_ssm_parameter
+from .ssm import create_ssm_parameters
 from .sqs import create_node_termination_sqs_queue
 
 
@@ -47,6 +49,7 @@ class K8sControllers(AWSModule):
         self.backups_bucket = config.backups_bucket or generate_bucket_name(f"{get_stack()}-backups")
 
         self.e2d_snapshot_retention_time = config.e2d_snapshot_retention_time
+        self.batch_ssm_parameters = config.batch_ssm_parameters
         self.vpc = get_vpc()
 
     def build(self, config: K8sControllerConfig) -> list[K8sControllerExports]:
@@ -60,7 +63,7 @@ class K8sControllers(AWSModule):
         if cluster_config.name is None:
             cluster_config.name = get_sysenv()
         if cluster_config.cluster_domain is None:
-            cluster_config.cluster_domain = f"{cluster_config.name}.{tag_namespace}"
+            cluster_config.cluster_domain = f"{cluster_config.name}.{get_tag_namespace()}"
 
         # Create component resource to group things together
         cluster_component = ComponentResource(
@@ -92,14 +95,7 @@ class K8sControllers(AWSModule):
             ("pki/service_account.key", True, sa_key.private_key_pem),
             ("pki/service_account.pem", False, sa_key.public_key_pem),
         ]
-        ssm_params = []
-        for name, is_secret, value in ssm_vars:
-            ssm_params.append(
-                (
-                    name,
-                    create_ssm_parameter(self, cluster_component, name, value, is_secret, cluster_config),
-                )
-            )
+        ssm_params = create_ssm_parameters(self, cluster_component, ssm_vars, self.batch_ssm_parameters, cluster_config)
 
         # Create SQS queue for AWS node termination handler
         node_termination_handler_queue = create_node_termination_sqs_queue(self, cluster_component, cluster_config)
@@ -147,8 +143,13 @@ class K8sControllers(AWSModule):
         # Create pod security group
         pod_security_group = create_pod_security_group(self, cluster_component, cluster_config)
 
-        # TODO: create cluster health component to prevent personalize_cluster from entering parallel retry loop
-        # (This component would make a curl to /healthz of one of the k8s controllers and return success when that page is available)
+        # wait for a quorum of controllers to be healthy, so personalize_cluster doesn't enter a parallel retry loop
+        kube_waiter = KubeWaiter(
+            "kube-waiter",
+            kubeconfig,
+            endpoints,
+            opts=ResourceOptions(parent=cluster_component, depends_on=controller_asgs),
+        )
 
         # use the admin kubeconfig to personalize the cluster via helm charts and fetch some values we want to export
         personalize_cluster(
@@ -164,7 +165,7 @@ class K8sControllers(AWSModule):
             cluster_autoscaler_role,
             node_termination_handler_role,
             node_termination_handler_queue,
-            kubeconfig,
+            kube_waiter.kubeconfig,
             cluster_config,
         )
 
@@ -216,7 +217,7 @@ class K8sControllers(AWSModule):
         dependency: ComponentResource,
         coredns_clusterip: str,
         cluster_config: K8sControllerArgs,
-        ssm_params: list[tuple[str, ssm.Parameter]],
+        ssm_params: list[tuple[str, Output[str]]],
         e2d_snapshot_retention_time: int,
     ):
         # Find our AMI
@@ -233,7 +234,7 @@ class K8sControllers(AWSModule):
 
         # Route53 variables
         sysenv_domain = get_public_sysenv_domain()
-        zone_id = route53.get_zone(name=sysenv_domain).id
+        zone_id = get_zone(name=sysenv_domain).id
         if cluster_config.name == get_sysenv():
             endpoint_name = f"controller.{sysenv_domain}"
         else:
@@ -267,7 +268,7 @@ class K8sControllers(AWSModule):
 
             # Make per-controller endpoint DNS records
             controller_endpoint = f"{subnet.availability_zone}.{endpoint_name}"
-            route53.Record(
+            controller_record = route53.Record(
                 f"endpoint-{subnet.availability_zone}",
                 name=controller_endpoint,
                 type="A",
@@ -277,7 +278,7 @@ class K8sControllers(AWSModule):
                 opts=ResourceOptions(parent=dependency),
             )
             controller_asgs.append(controller_asg)
-            endpoints.append(controller_endpoint)
+            endpoints.append(controller_record.name)
             controller_ips.append(controller_eni.private_ip)
 
         # Create the cluster round robin endpoint
@@ -2,24 +2,23 @@ from pulumi import ResourceOptions, Output, ComponentResource, CustomTimeouts
 from pulumi_aws import ec2, iam, autoscaling, sqs
 from pulumi_kubernetes import provider as kubernetes_provider
 
+from infra_thunder.lib.kubernetes.personalizers import Personalizer, PersonalizerRegistry
+from infra_thunder.lib.kubernetes.personalizers.datadog_cluster_agent import configure_datadog_cluster_agent
+from infra_thunder.lib.kubernetes.personalizers.kube_metrics import configure_kube_metrics
+from infra_thunder.lib.kubernetes.personalizers.kubelet_rolebinding import configure_kubelet_rolebinding
+from infra_thunder.lib.kubernetes.personalizers.monitoring_roles import configure_monitoring_roles
 from .aws_ebs_csi import configure_aws_ebs_csi
 from .aws_iam_authenticator import configure_iam_authenticator
 from .aws_node_termination_handler import configure_aws_node_termination_handler
 from .cluster_autoscaler import configure_cluster_autoscaler
 from .cni import configure_cni
 from .coredns import configure_coredns
-from .coredns import configure_coredns
 from .cross_cluster_access_serviceaccount import (
     configure_cross_cluster_access_serviceaccount,
 )
-from .datadog_cluster_agent import configure_datadog_cluster_agent
-from .datadog_cluster_agent import configure_datadog_cluster_agent
 from .deployments import configure_deployments
 from .extra_secrets import configure_extra_secrets
-from .kube_metrics import configure_kube_metrics
 from .kubelet_csr_renewal import configure_csr_renewal
-from .kubelet_rolebinding import configure_kubelet_rolebinding
-from .monitoring_roles import configure_monitoring_roles
 from .namespaces import configure_namespaces
 from .node_secrets_role import configure_node_secrets_role
 from .node_feature_discovery import configure_node_feature_discovery
@@ -28,6 +27,79 @@ from .traefik import configure_traefik
 from ..config import K8sControllerArgs
 from ..types import IamAuthenticatorRole
 
+personalizers = PersonalizerRegistry(
+    [
+        # Configure apiserver -> kubelet ClusterRoleBinding
+        Personalizer("kubelet-rolebinding", configure_kubelet_rolebinding, inputs=("parent", "provider")),
+        # Configure rolebinding to allow kubelets to renew their serving certificates
+        Personalizer("kubelet-csr-renewal", configure_csr_renewal, inputs=("provider",)),
+        # Configure rolebinding to allow kubelets to read node secrets
+        Personalizer("node-secrets-role", configure_node_secrets_role, inputs=("provider",)),
+        # Configure monitoring roles
+        Personalizer("monitoring-roles", configure_monitoring_roles, inputs=("parent", "provider")),
+        # configure a cross-cluster admin account (used by ArgoCD)
+        Personalizer(
+            "cross-cluster-serviceaccount", configure_cross_cluster_access_serviceaccount, inputs=("provider",)
+        ),
+        # Configure Kubernetes Metrics Server
+        Personalizer("kube-metrics", configure_kube_metrics, inputs=("parent", "provider")),
+        # Configure the IAM authenticator
+        Personalizer(
+            "iam-authenticator",
+            configure_iam_authenticator,
+            inputs=("bootstrap_role", "user_roles", "cluster_config", "provider"),
+            flag="enable_iam_authenticator",
+        ),
+        # Configure the CNI
+        Personalizer(
+            "cni",
+            configure_cni,
+            inputs=("cls", "endpoint", "pod_security_groups", "provider", "cluster_config"),
+        ),
+        # Configure DNS
+        Personalizer(
+            "coredns",
+            configure_coredns,
+            inputs=("coredns_clusterip", "provider", "cluster_config"),
+            flag="enable_coredns",
+            depends_on=("cni",),
+        ),
+        Personalizer("traefik", configure_traefik, inputs=("provider", "cluster_config")),
+        Personalizer(
+            "aws-ebs-csi", configure_aws_ebs_csi, inputs=("provider", "ebs_controller_role", "cluster_config")
+        ),
+        # Configure namespaces (default namespaces are gated in the function)
+        Personalizer("namespaces", configure_namespaces, inputs=("cluster_config", "provider")),
+        # Configure extra secrets
+        Personalizer("extra-secrets", configure_extra_secrets, inputs=("cluster_config", "provider")),
+        # Configure default deployments
+        Personalizer("deployments", configure_deployments, inputs=("provider", "cluster_config")),
+        Personalizer(
+            "datadog-cluster-agent", configure_datadog_cluster_agent, inputs=("parent", "cluster_name", "provider")
+        ),
+        # Configure sealed-secrets
+        Personalizer(
+            "sealed-secrets",
+            configure_sealed_secrets,
+            inputs=("provider", "cluster_config"),
+            flag="enable_sealed_secrets",
+        ),
+        Personalizer("node-feature-discovery", configure_node_feature_discovery, inputs=("provider", "cluster_config")),
+        # Configure AWS Node Termination Handler
+        Personalizer(
+            "aws-node-termination-handler",
+            configure_aws_node_termination_handler,
+            inputs=("provider", "node_termination_handler_role", "node_termination_handler_queue", "cluster_config"),
+        ),
+        Personalizer(
+            "cluster-autoscaler",
+            configure_cluster_autoscaler,
+            inputs=("provider", "cluster_autoscaler_role", "cluster_config", "region"),
+        ),
+    ]
+)
+"""Personalizers of AWS clusters. Those without dependencies between them are created concurrently."""
+
 
 def personalize_cluster(
     cls,
@@ -57,59 +129,24 @@ def personalize_cluster(
         ),
     )
 
-    # Configure apiserver -> kubelet ClusterRoleBinding
-    configure_kubelet_rolebinding(k8s_provider)
-
-    # Configure rolebinding to allow kubelets to renew their serving certificates
-    configure_csr_renewal(k8s_provider)
-
-    # Configure rolebinding to allow kubelets to read node secrets
-    configure_node_secrets_role(k8s_provider)
-
-    # Configure monitoring roles
-    configure_monitoring_roles(k8s_provider)
-
-    # configure a cross-cluster admin account (used by ArgoCD)
-    configure_cross_cluster_access_serviceaccount(k8s_provider)
-
-    # Configure Kubernetes Metrics Server
-    configure_kube_metrics(k8s_provider)
-
-    # Configure the IAM authenticator
-    if cluster_config.enable_iam_authenticator:
-        configure_iam_authenticator(bootstrap_role, user_roles, cluster_config, k8s_provider)
-
-    # Configure the CNI
-    configure_cni(cls, endpoint, pod_security_groups, k8s_provider, cluster_config)
-
-    # Configure DNS
-    if cluster_config.enable_coredns:
-        configure_coredns(coredns_clusterip, k8s_provider, cluster_config)
-
-    configure_traefik(k8s_provider, cluster_config)
-
-    configure_aws_ebs_csi(k8s_provider, ebs_controller_role, cluster_config)
-
-    # Configure namespaces (default namespaces are gated in the function)
-    configure_namespaces(cluster_config, k8s_provider)
-
-    # Configure extra secrets
-    configure_extra_secrets(cluster_config, k8s_provider)
-
-    # Configure default deployments
-    configure_deployments(k8s_provider, cluster_config)
-
-    configure_datadog_cluster_agent(k8s_provider, cluster_config)
-
-    # Configure sealed-secrets
-    if cluster_config.enable_sealed_secrets:
-        configure_sealed_secrets(k8s_provider, cluster_config)
-
-    configure_node_feature_discovery(k8s_provider, cluster_config)
-
-    # Configure AWS Node Termination Handler
-    configure_aws_node_termination_handler(
-        k8s_provider, node_termination_handler_role, node_termination_handler_queue, cluster_config
+    personalizers.run(
+        {
+            # the resources are parented to the provider, so clusters in the same stack get distinct URNs
+            "parent": k8s_provider,
+            "provider": k8s_provider,
+            "cls": cls,
+            "endpoint": endpoint,
+            "bootstrap_role": bootstrap_role,
+            "user_roles": user_roles,
+            "pod_security_groups": pod_security_groups,
+            "coredns_clusterip": coredns_clusterip,
+            "ebs_controller_role": ebs_controller_role,
+            "cluster_autoscaler_role": cluster_autoscaler_role,
+            "node_termination_handler_role": node_termination_handler_role,
+            "node_termination_handler_queue": node_termination_handler_queue,
+            "cluster_config": cluster_config,
+            "cluster_name": cluster_config.name,
+            "region": cls.region,
+        },
+        graph_name=cluster_config.name,
     )
-
-    configure_cluster_autoscaler(k8s_provider, cluster_autoscaler_role, cluster_config, cls.region)
@@ -3,7 +3,7 @@ from pulumi import ResourceOptions
 from pulumi_aws import iam, sqs
 from pulumi_kubernetes import provider as kubernetes_provider
 
-from infra_thunder.lib.config import tag_prefix
+from infra_thunder.lib.config import get_tag_prefix
 from infra_thunder.lib.kubernetes.common.annotations.monitoring_annotations import (
     get_datadog_annotations,
 )
@@ -100,7 +100,7 @@ def configure_aws_node_termination_handler(
                     ),
                 },
                 "queueURL": node_termination_handler_queue.id,
-                "managedAsgTag": f"{tag_prefix}{NODEGROUP_TAG_KEY}",
+                "managedAsgTag": f"{get_tag_prefix()}{NODEGROUP_TAG_KEY}",
                 "webhookURL": cluster_config.node_termination_webhook_url,
                 "webhookTemplate": cluster_config.node_termination_webhook_template or slack_webhook_template,
                 "useProviderId": True,
@@ -4,7 +4,7 @@ from yaml import safe_dump
 from pulumi_kubernetes import meta, core
 from pulumi_kubernetes import provider as kubernetes_provider
 
-from infra_thunder.lib.config import tag_prefix
+from infra_thunder.lib.config import get_tag_prefix
 from infra_thunder.lib.kubernetes.common.annotations.monitoring_annotations import (
     get_datadog_annotations,
 )
@@ -50,8 +50,8 @@ def configure_cluster_autoscaler(
                 },
                 "autoDiscovery": {
                     "tags": [
-                        f"{tag_prefix}service=k8s-agents",
-                        f"{tag_prefix}role={cluster_config.name}",
+                        f"{get_tag_prefix()}service=k8s-agents",
+                        f"{get_tag_prefix()}role={cluster_config.name}",
                     ],
                     # honestly just seems to be used as a boolean, https://github.com/kubernetes/autoscaler/blob/49118e2edc8c59bf8ba6e69fedf271a51b68fc23/charts/cluster-autoscaler/templates/deployment.yaml#L56
                     "clusterName": cluster_config.name,
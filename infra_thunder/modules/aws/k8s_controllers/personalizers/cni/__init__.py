@@ -14,19 +14,19 @@ def configure_cni(
     cls,
     endpoint: Output[str],
     pod_security_groups: list[ec2.SecurityGroup],
-    k8s_provider: kubernetes_provider.Provider,
+    provider: kubernetes_provider.Provider,
     cluster_config: K8sControllerArgs,
 ):
     """
     Configure the selected CNI against the Kubernetes cluster
     :param cls: Parent class
     :param pod_security_groups: Pod security groups
-    :param k8s_provider: Kubernetes provider
+    :param provider: Kubernetes provider
     :param cluster_config: Kubernetes Cluster Configuration
-    :return:
+    :return: What CoreDNS waits for before it is installed
     """
     cni_funcs = {CNIProviders.aws_cni.value: configure_aws_cni}
     cni_func = cni_funcs[cluster_config.cni_provider]
 
     # Launch the configure func
-    cni_func(cls, endpoint, pod_security_groups, k8s_provider, cluster_config)
+    return cni_func(cls, endpoint, pod_security_groups, provider, cluster_config)
@@ -1,6 +1,6 @@
 import json
 
-from pulumi import ResourceOptions, Output, ComponentResource
+from pulumi import ResourceOptions, Output
 from pulumi_aws import ec2
 from pulumi_kubernetes import (
     provider as kubernetes_provider,
@@ -14,7 +14,7 @@ from pulumi_kubernetes import (
 from infra_thunder.lib.kubernetes.common.annotations.monitoring_annotations import (
     get_datadog_annotations,
 )
-from infra_thunder.lib.kubernetes.helm import HelmChartStack
+from infra_thunder.lib.kubernetes.helm import HelmChartStack, depend_on_chart
 from infra_thunder.lib.kubernetes.helm.config import HelmChart
 from infra_thunder.lib.security_groups import get_default_security_groups
 from infra_thunder.lib.subnets import get_subnets_attributes
@@ -34,6 +34,7 @@ def configure_cni(
     # install the cni, and add the eniconfigs after the chart finishes installing
     cni_stack = _install_cni(cls, k8s_provider, cluster_config)
     _create_eniconfigs(cls, cni_stack, pod_security_groups, k8s_provider)
+    return cni_stack
 
 
 def _install_cni(cls, provider: kubernetes_provider.Provider, cluster_config: K8sControllerArgs):
@@ -75,7 +76,7 @@ def _install_cni(cls, provider: kubernetes_provider.Provider, cluster_config: K8
 
 def _create_eniconfigs(
     cls,
-    dependency: ComponentResource,
+    dependency: HelmChartStack,
     pod_security_groups: list[ec2.SecurityGroup],
     provider: kubernetes_provider.Provider,
 ):
@@ -99,8 +100,8 @@ def _create_eniconfigs(
                 "securityGroups": [sg.id for sg in pod_security_groups] + get_default_security_groups(cls.vpc.id).ids,
                 "subnet": subnet.id,
             },
-            # TODO: this doesn't wait for the CNI stack to complete?
-            opts=ResourceOptions(parent=dependency, depends_on=[dependency], provider=provider),
+            # the ENIConfig CRD comes with the chart
+            opts=ResourceOptions(parent=dependency, depends_on=[depend_on_chart(dependency)], provider=provider),
         )
 
 
@@ -1,7 +1,7 @@
-from pulumi import ResourceOptions
+from pulumi import Input, Resource, ResourceOptions
 from pulumi_kubernetes import provider as kubernetes_provider
 
-from infra_thunder.lib.config import tag_namespace
+from infra_thunder.lib.config import get_tag_namespace
 from infra_thunder.lib.kubernetes.common.annotations.monitoring_annotations import (
     get_datadog_annotations,
 )
@@ -24,6 +24,7 @@ def configure_coredns(
     coredns_clusterip: str,
     provider: kubernetes_provider.Provider,
     cluster_config: K8sControllerArgs,
+    depends_on: list[Input[Resource]],
 ):
     """
     Configure CoreDNS in the cluster as a ClusterIP service, and pick the IP address to use for the DNS ClusterIP.
@@ -32,6 +33,7 @@ def configure_coredns(
     :param coredns_clusterip:
     :param provider:
     :param cluster_config:
+    :param depends_on: The CNI, which CoreDNS pods need to start
     :return:
     """
     HelmChartStack(
@@ -104,7 +106,7 @@ def configure_coredns(
                     },
                     *[
                         {
-                            "zones": [{"zone": f"{i.sysenv}.{tag_namespace}"}],
+                            "zones": [{"zone": f"{i.sysenv}.{get_tag_namespace()}"}],
                             "port": 53,
                             "plugins": [
                                 {
@@ -127,7 +129,7 @@ def configure_coredns(
                                 {
                                     "matchExpressions": [
                                         {
-                                            "key": f"{tag_namespace}/{DEDICATED_TAG_KEY}",
+                                            "key": f"{get_tag_namespace()}/{DEDICATED_TAG_KEY}",
                                             "operator": "DoesNotExist",
                                             "values": [],
                                         }
@@ -151,5 +153,5 @@ def configure_coredns(
                 ),
             },
         ),
-        opts=ResourceOptions(parent=provider, provider=provider),
+        opts=ResourceOptions(parent=provider, provider=provider, depends_on=depends_on),
     )
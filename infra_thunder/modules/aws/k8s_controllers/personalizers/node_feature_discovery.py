@@ -1,7 +1,7 @@
 from pulumi import ResourceOptions
 from pulumi_kubernetes import provider as kubernetes_provider
 
-from infra_thunder.lib.config import tag_namespace
+from infra_thunder.lib.config import get_tag_namespace
 from infra_thunder.lib.kubernetes.constants import SPOT_TAG_KEY
 from infra_thunder.lib.kubernetes.helm import HelmChartStack
 from infra_thunder.lib.kubernetes.helm.config import HelmChart
@@ -38,7 +38,7 @@ def configure_node_feature_discovery(
                     # Tolerate spot instances
                     "tolerations": [
                         {
-                            "key": f"{tag_namespace}/{SPOT_TAG_KEY}",
+                            "key": f"{get_tag_namespace()}/{SPOT_TAG_KEY}",
                             "operator": "Exists",
                             "effect": "NoSchedule",
                         }
@@ -1,7 +1,7 @@
 from pulumi import ResourceOptions
 from pulumi_kubernetes import provider as kubernetes_provider
 
-from infra_thunder.lib.config import get_sysenv, tag_namespace
+from infra_thunder.lib.config import get_sysenv, get_tag_namespace
 from infra_thunder.lib.kubernetes.constants import SPOT_TAG_KEY, DEDICATED_TAG_KEY
 from infra_thunder.lib.kubernetes.helm import HelmChartStack
 from infra_thunder.lib.kubernetes.helm.config import HelmChart
@@ -39,12 +39,12 @@ def configure_traefik(provider: kubernetes_provider.Provider, cluster_config: K8
                     # that doesn't run traefik, which would lead to alb errors
                     # TODO: change "operator" back to "Exists" once cloud-lifecycle-controller listens on different port on controllers
                     {
-                        "key": f"{tag_namespace}/{SPOT_TAG_KEY}",
+                        "key": f"{get_tag_namespace()}/{SPOT_TAG_KEY}",
                         "operator": "Exists",
                         "effect": "NoSchedule",
                     },
                     {
-                        "key": f"{tag_namespace}/{DEDICATED_TAG_KEY}",
+                        "key": f"{get_tag_namespace()}/{DEDICATED_TAG_KEY}",
                         "operator": "Exists",
                         "effect": "NoSchedule",
                     },
@@ -1,8 +1,8 @@
-from pulumi import ComponentResource, ResourceOptions
+from pulumi import ComponentResource, Config, Input, Output, ResourceOptions
 from pulumi_aws import ssm
 
 from infra_thunder.lib.aws.kubernetes import get_ssm_path
-from infra_thunder.lib.ssm import PARAMETER_STORE_BASE
+from infra_thunder.lib.ssm import PARAMETER_STORE_BASE, SSMParameters
 from infra_thunder.lib.tags import get_tags, get_sysenv, get_stack
 from .config import K8sControllerArgs
 
@@ -18,9 +18,48 @@ def create_ssm_parameter(
     typ = "SecureString" if secret else "String"
     return ssm.Parameter(
         name,
-        name=f"{PARAMETER_STORE_BASE}/{get_sysenv()}/{get_ssm_path(cluster_config.name)}/{name}",
+        name=f"{_get_path(cluster_config)}/{name}",
         value=value,
         type=typ,
         tags=get_tags(service=get_stack(), role="pki", group=cluster_config.name),
         opts=ResourceOptions(parent=dependency),
     )
+
+
+def create_ssm_parameters(
+    cls,
+    dependency: ComponentResource,
+    parameters: list[tuple[str, bool, Input[str]]],
+    batch: bool,
+    cluster_config: K8sControllerArgs,
+) -> list[tuple[str, Output[str]]]:
+    """
+    Save parameters of a cluster to SSM
+
+    :param cls: Calling class object
+    :param dependency: Parent of the parameters
+    :param parameters: Name, whether it is a secret, and value of each parameter
+    :param batch: Write the parameters with a single rate-limited ``SSMParameters`` resource
+    :param cluster_config: Configuration of the cluster
+    :return: Name and full SSM path of each parameter, resolved once it's written
+    """
+    if not batch:
+        return [
+            (name, create_ssm_parameter(cls, dependency, name, value, secret, cluster_config).name)
+            for name, secret, value in parameters
+        ]
+
+    ssm_parameters = SSMParameters(
+        f"{cluster_config.name}-ssm-parameters",
+        path=_get_path(cluster_config),
+        parameters={name: (value, secret) for name, secret, value in parameters},
+        region=cls.region,
+        tags=get_tags(service=get_stack(), role="pki", group=cluster_config.name),
+        profile=Config("aws").get("profile"),
+        opts=ResourceOptions(parent=dependency),
+    )
+    return [(name, ssm_parameters.get_parameter_name(name)) for name, _, _ in parameters]
+
+
+def _get_path(cluster_config: K8sControllerArgs) -> str:
+    return f"{PARAMETER_STORE_BASE}/{get_sysenv()}/{get_ssm_path(cluster_config.name)}"
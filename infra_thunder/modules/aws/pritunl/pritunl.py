@@ -14,7 +14,9 @@ from infra_thunder.lib.iam import (
     generate_eni_policy,
     generate_ebs_policy,
 )
+from infra_thunder.lib.invoke_cache import cached_invoke, AMI_TTL
 from infra_thunder.lib.keypairs import get_keypair
+from infra_thunder.lib.route53 import get_zone
 from infra_thunder.lib.route_tables import get_route_tables
 from infra_thunder.lib.security_groups import (
     ANY_IPV4_ADDRESS,
@@ -32,11 +34,13 @@ from .config import PritunlArgs, PritunlExports
 class Pritunl(AWSModule):
     def build(self, config: PritunlArgs) -> PritunlExports:
         vpc = get_vpc()
-        hosted_zone = route53.get_zone(name=get_public_sysenv_domain(), private_zone=False)
+        hosted_zone = get_zone(name=get_public_sysenv_domain(), private_zone=False)
         public_dns = f"vpn.{get_public_sysenv_domain()}"
 
         # Get the AMI
-        ami = get_ami(
+        ami = cached_invoke(
+            get_ami,
+            ttl=AMI_TTL,
             owners=[thunder_env.get("ami_owner", "self")],
             most_recent=True,
             filters=[
@@ -5,6 +5,11 @@ from dataclasses import dataclass
 class SSMArgs:
     parameters: dict[str, str]
 
+    batch_parameters: bool = False
+    """Write the parameters with a single ``SSMParameters`` resource, at a rate that avoids throttling, instead of
+    one ``ssm.Parameter`` resource per parameter. On an existing stack, remove the ``ssm.Parameter`` resources from the
+    state first with ``pulumi state delete`` (nothing depends on them), or switching deletes the parameters."""
+
 
 @dataclass
 class SSMExports:
@@ -1,24 +1,38 @@
-from pulumi import ResourceOptions
+from pulumi import Config, ResourceOptions
 from pulumi_aws import ssm
 
 from infra_thunder.lib.aws.base import AWSModule
-from infra_thunder.lib.ssm import PARAMETER_STORE_COMMON
+from infra_thunder.lib.ssm import SSMParameters, get_parameter_store_common
 from infra_thunder.lib.tags import get_stack, get_tags
 from .config import SSMArgs, SSMExports
 
 
 class SSM(AWSModule):
     def build(self, config: SSMArgs) -> SSMExports:
-        for param_name, param_value in config.parameters.items():
-            ssm.Parameter(
-                f"{param_name}",
-                name=f"{PARAMETER_STORE_COMMON}/{param_name}",
-                value=param_value,
-                type=ssm.ParameterType.SECURE_STRING,
+        if config.batch_parameters:
+            SSMParameters(
+                "parameters",
+                path=get_parameter_store_common(),
+                parameters={name: (value, True) for name, value in config.parameters.items()},
+                region=self.region,
                 tags=get_tags(service=get_stack(), role="common_params"),
+                profile=Config("aws").get("profile"),
                 opts=ResourceOptions(parent=self),
             )
+        else:
+            self._create_parameters(config.parameters)
 
         return SSMExports(
             parameter_names=list(config.parameters.keys()),
         )
+
+    def _create_parameters(self, parameters: dict[str, str]):
+        for param_name, param_value in parameters.items():
+            ssm.Parameter(
+                f"{param_name}",
+                name=f"{get_parameter_store_common()}/{param_name}",
+                value=param_value,
+                type=ssm.ParameterType.SECURE_STRING,
+                tags=get_tags(service=get_stack(), role="common_params"),
+                opts=ResourceOptions(parent=self),
+            )
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 
 from pulumi import Output
 
+from .types import RoutingMode
+
 
 @dataclass
 class TransitGatewayConnectionConfig:
@@ -19,6 +21,16 @@ class TransitGatewayConnectionConfig:
 class TransitGatewayConfig:
     connections: list[TransitGatewayConnectionConfig]
 
+    routing_mode: RoutingMode = RoutingMode.CIDR_ROUTES
+    """How VPC route tables route to peered SysEnvs. ``prefix_list`` adds a single route per route table, pointing
+    at the peered supernets prefix list, instead of one route per peered SysEnv"""
+
+    batch_prefix_list_entries: bool = False
+    """Write all the entries of each peered supernets prefix list in a single API call, instead of one
+    ``ManagedPrefixListEntry`` at a time. The entries are then owned by one resource per prefix list. On an
+    existing stack, remove the ``ManagedPrefixListEntry`` resources from the state first, or switching removes the
+    peered supernets from the prefix lists: see the README."""
+
 
 @dataclass
 class TransitGatewayConnectionExport:
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+from .types import RoutingMode
+
+
+@dataclass
+class PlanSize:
+    """How many routing resources the TransitGateway module manages"""
+
+    vpc_routes: int
+    """Routes in the route tables of the local and remote VPCs"""
+
+    prefix_list_entries: int
+    """Entries in the peered supernets prefix lists"""
+
+    tgw_routes: int
+    """Routes in the transit gateway route table"""
+
+    @property
+    def total(self) -> int:
+        return self.vpc_routes + self.prefix_list_entries + self.tgw_routes
+
+
+def get_plan_size(
+    routing_mode: RoutingMode, local_route_tables: int, remote_sysenvs: dict[str, tuple[int, int]]
+) -> PlanSize:
+    """
+    Count the routing resources for a set of connections
+
+    :param routing_mode: How the VPC route tables route to peered SysEnvs
+    :param local_route_tables: Number of route tables in the transit VPC
+    :param remote_sysenvs: For every remote SysEnv, the number of route tables in its VPC and of SysEnvs it peers with
+        (the transit SysEnv included)
+    :return: The size of the plan
+    """
+    if routing_mode is RoutingMode.PREFIX_LIST:
+        local_routes = local_route_tables
+        remote_routes = sum(route_tables for route_tables, _ in remote_sysenvs.values())
+    else:
+        local_routes = local_route_tables * len(remote_sysenvs)
+        remote_routes = sum(route_tables * peers for route_tables, peers in remote_sysenvs.values())
+
+    return PlanSize(
+        vpc_routes=local_routes + remote_routes,
+        # an entry for every peer in each remote list, and one for every remote sysenv in the local list
+        prefix_list_entries=sum(peers for _, peers in remote_sysenvs.values()) + len(remote_sysenvs),
+        tgw_routes=len(remote_sysenvs),
+    )
+
+
+def format_plan_size_report(local_route_tables: int, remote_sysenvs: dict[str, tuple[int, int]]) -> str:
+    """
+    Compare the plan size of every routing mode
+
+    :param local_route_tables: Number of route tables in the transit VPC
+    :param remote_sysenvs: For every remote SysEnv, the number of route tables in its VPC and of SysEnvs it peers with
+    :return: One line per routing mode
+    """
+    lines = []
+    for routing_mode in RoutingMode:
+        size = get_plan_size(routing_mode, local_route_tables, remote_sysenvs)
+        lines.append(
+            f"{routing_mode.value}: {size.total} resources ({size.vpc_routes} VPC routes, "
+            f"{size.prefix_list_entries} prefix list entries, {size.tgw_routes} transit gateway routes)"
+        )
+
+    return "\n".join(lines)
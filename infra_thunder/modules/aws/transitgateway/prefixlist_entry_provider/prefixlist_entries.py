@@ -0,0 +1,265 @@
+import ipaddress
+import time
+from typing import Any, Optional
+
+from pulumi import Input, Output, ResourceOptions, dynamic
+
+MAX_ENTRIES_PER_MODIFICATION = 100
+"""``ModifyManagedPrefixList`` accepts at most 100 entries to add (and 100 to remove) per call"""
+
+MAX_ATTEMPTS = 10
+"""How many times a modification is retried after losing a race with another writer"""
+
+MAX_POLLS = 150
+"""How many times to check the prefix list state before giving up on an in-progress modification"""
+
+POLL_INTERVAL = 2
+"""Seconds between two checks of the prefix list state"""
+
+RETRYABLE_ERRORS = ("IncorrectState", "PrefixListVersionMismatch")
+"""The prefix list is being modified, or was modified since it was read"""
+
+
+def _get_client(props: dict):
+    # imported here: this runs in the dynamic provider host, not in the Pulumi program
+    import boto3
+
+    return boto3.session.Session(profile_name=props.get("profile"), region_name=props.get("region")).client("ec2")
+
+
+def _wait_for_prefix_list(client, prefix_list_id: str) -> dict:
+    """
+    Wait until no modification of the prefix list is in progress
+
+    :param client: EC2 client
+    :param prefix_list_id: ID of the prefix list
+    :return: The prefix list
+    """
+    for _ in range(MAX_POLLS):
+        prefix_list = client.describe_managed_prefix_lists(PrefixListIds=[prefix_list_id])["PrefixLists"][0]
+        if prefix_list["State"].endswith("-failed"):
+            raise Exception(f"prefix list `{prefix_list_id}` is in state `{prefix_list['State']}`")
+        if not prefix_list["State"].endswith("-in-progress"):
+            return prefix_list
+
+        time.sleep(POLL_INTERVAL)
+
+    raise TimeoutError(f"prefix list `{prefix_list_id}` is still being modified")
+
+
+def _get_entries(client, prefix_list_id: str, version: int) -> dict[str, str]:
+    """
+    Read the entries of a version of the prefix list
+
+    :param client: EC2 client
+    :param prefix_list_id: ID of the prefix list
+    :param version: Version of the prefix list
+    :return: Description of every CIDR in the prefix list
+    """
+    paginator = client.get_paginator("get_managed_prefix_list_entries")
+    return {
+        entry["Cidr"]: entry.get("Description", "")
+        for page in paginator.paginate(PrefixListId=prefix_list_id, TargetVersion=version)
+        for entry in page.get("Entries", [])
+    }
+
+
+def _get_changes(
+    current: dict[str, str], desired: dict[str, str], owned: set[str], covers: dict[str, str]
+) -> tuple[list[dict], list[dict]]:
+    """
+    Compare the entries of the prefix list to the desired ones, for the next ``ModifyManagedPrefixList`` call
+
+    :param current: Entries in the prefix list
+    :param desired: Entries that should be in the prefix list
+    :param owned: CIDRs that were previously managed, and should be removed if they are no longer desired
+    :param covers: CIDR each cover stands in for (see ``_get_replacements``)
+    :return: Entries to add, entries to remove
+    """
+    add = [{"Cidr": cidr, "Description": description} for cidr, description in desired.items() if cidr not in current]
+    # the entries the covers stand in for are added back first, so that their covers can be removed in the same call
+    add.sort(key=lambda entry: entry["Cidr"] not in covers.values())
+    add = add[:MAX_ENTRIES_PER_MODIFICATION]
+
+    present = set(current) | {entry["Cidr"] for entry in add}
+    remove = [
+        {"Cidr": cidr}
+        for cidr in owned | set(covers)
+        if cidr in current and cidr not in desired and covers.get(cidr, cidr) in present
+    ]
+
+    return add, remove[:MAX_ENTRIES_PER_MODIFICATION]
+
+
+def _get_halves(cidr: str, current: dict[str, str], desired: dict[str, str]) -> list[str]:
+    """
+    :return: The two halves of a CIDR, or nothing if it can't be split or one of them is an entry of its own
+    """
+    network = ipaddress.ip_network(cidr)
+    halves = [str(half) for half in network.subnets()] if network.prefixlen < network.max_prefixlen else []
+    return [] if any(half in current or half in desired for half in halves) else halves
+
+
+def _get_replacements(
+    current: dict[str, str], desired: dict[str, str], room: int
+) -> tuple[list[dict], list[dict], dict[str, str]]:
+    """
+    Replace the entries whose description changed by their covers: the two halves of their CIDR.
+
+    ``ModifyManagedPrefixList`` can't change the description of an entry, nor remove and add the same CIDR in one
+    call. So an entry is swapped for its covers by one call, and swapped back, with its new description, by the
+    next: its addresses are in the prefix list the whole time, for the routes and rules that use it.
+
+    An entry keeps its description if its CIDR can't be split (a single address), if one of its halves is an entry
+    of its own, or if the prefix list has no room for one more entry.
+
+    :param current: Entries in the prefix list
+    :param desired: Entries that should be in the prefix list
+    :param room: How many more entries the prefix list can hold
+    :return: Entries to add, entries to remove, and the CIDR each cover stands in for
+    """
+    # each replacement adds two entries and removes one
+    limit = min(room, MAX_ENTRIES_PER_MODIFICATION // 2)
+    replaced: dict[str, list[str]] = {}
+    for cidr, description in desired.items():
+        halves = _get_halves(cidr, current, desired) if current.get(cidr, description) != description else []
+        if halves and len(replaced) < limit:
+            replaced[cidr] = halves
+
+    add = [{"Cidr": half, "Description": desired[cidr]} for cidr, halves in replaced.items() for half in halves]
+    covers = {half: cidr for cidr, halves in replaced.items() for half in halves}
+    return add, [{"Cidr": cidr} for cidr in replaced], covers
+
+
+def _get_modification(
+    current: dict[str, str], desired: dict[str, str], owned: set[str], covers: dict[str, str], max_entries: int
+) -> tuple[list[dict], list[dict], dict[str, str]]:
+    """
+    :return: Entries to add and to remove by the next call, and the covers it adds. Descriptions are only changed
+        once every other change is made.
+    """
+    add, remove = _get_changes(current, desired, owned, covers)
+    if add or remove:
+        return add, remove, {}
+
+    return _get_replacements(current, desired, max_entries - len(current))
+
+
+def modify_prefix_list_entries(client, prefix_list_id: str, desired: dict[str, str], owned: set[str]) -> int:
+    """
+    Converge the entries of a prefix list, in as few ``ModifyManagedPrefixList`` calls as possible.
+
+    Every call names the version of the prefix list the changes were computed from, so a concurrent writer makes the
+    call fail instead of being overwritten. When it does, or while another modification is in progress, the prefix
+    list is read again and the changes are recomputed. More than one call is only needed for over 100 changes, or
+    to change the description of an existing entry (see ``_get_replacements``).
+
+    :param client: EC2 client
+    :param prefix_list_id: ID of the prefix list
+    :param desired: Description of every CIDR that should be in the prefix list
+    :param owned: CIDRs that were previously managed, and should be removed if they are no longer desired
+    :return: Number of ``ModifyManagedPrefixList`` calls made
+    """
+    from botocore.exceptions import ClientError
+
+    calls = 0
+    conflicts = 0
+    covers: dict[str, str] = {}
+    while conflicts < MAX_ATTEMPTS:
+        prefix_list = _wait_for_prefix_list(client, prefix_list_id)
+        current = _get_entries(client, prefix_list_id, prefix_list["Version"])
+        add, remove, new_covers = _get_modification(current, desired, owned, covers, prefix_list["MaxEntries"])
+        if not add and not remove:
+            return calls
+
+        try:
+            calls += 1
+            client.modify_managed_prefix_list(
+                PrefixListId=prefix_list_id,
+                CurrentVersion=prefix_list["Version"],
+                AddEntries=add,
+                RemoveEntries=remove,
+            )
+            covers |= new_covers
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in RETRYABLE_ERRORS:
+                raise
+            conflicts += 1
+
+    raise TimeoutError(f"unable to modify prefix list `{prefix_list_id}` after {MAX_ATTEMPTS} conflicting writes")
+
+
+def _desired_entries(props: dict) -> dict[str, str]:
+    return {entry["cidr"]: entry.get("description") or "" for entry in props.get("entries") or []}
+
+
+class PrefixListEntriesProvider(dynamic.ResourceProvider):
+    """
+    Dynamic Pulumi provider that owns a set of entries in a managed prefix list.
+
+    ``ec2.ManagedPrefixListEntry`` writes one entry per API call, and a prefix list rejects writes while a
+    modification is in progress, so every entry has to wait for the previous one. This provider writes all the
+    additions and removals for a prefix list in a single ``ModifyManagedPrefixList`` call (per 100 entries), guarded
+    by the prefix list version.
+
+    Entries of the prefix list that this resource never managed are left alone.
+    """
+
+    def create(self, props: dict) -> dynamic.CreateResult:
+        modify_prefix_list_entries(_get_client(props), props["prefix_list_id"], _desired_entries(props), set())
+        return dynamic.CreateResult(props["prefix_list_id"], props)
+
+    def diff(self, _id: str, olds: dict, news: dict) -> dynamic.DiffResult:
+        replaces = [key for key in ("prefix_list_id", "profile", "region") if olds.get(key) != news.get(key)]
+        changes = bool(replaces) or _desired_entries(olds) != _desired_entries(news)
+        return dynamic.DiffResult(changes=changes, replaces=replaces, delete_before_replace=True)
+
+    def update(self, _id: str, olds: dict, news: dict) -> dynamic.UpdateResult:
+        owned = set(_desired_entries(olds))
+        modify_prefix_list_entries(_get_client(news), news["prefix_list_id"], _desired_entries(news), owned)
+        return dynamic.UpdateResult(news)
+
+    def delete(self, _id: str, props: dict) -> None:
+        owned = set(_desired_entries(props))
+        modify_prefix_list_entries(_get_client(props), props["prefix_list_id"], {}, owned)
+
+    def read(self, id_: str, props: dict) -> dynamic.ReadResult:
+        # drop the entries removed out of band from the state, so the next update adds them back
+        client = _get_client(props)
+        prefix_list = _wait_for_prefix_list(client, id_)
+        current = _get_entries(client, id_, prefix_list["Version"])
+        entries = [entry for entry in props.get("entries") or [] if entry["cidr"] in current]
+        return dynamic.ReadResult(id_, {**props, "entries": entries})
+
+
+class PrefixListEntries(dynamic.Resource):
+    prefix_list_id: Output[str]
+    entries: Output[list[dict[str, str]]]
+
+    def __init__(
+        self,
+        resource_name: str,
+        prefix_list_id: Input[str],
+        entries: Input[list[dict[str, Input[str]]]],
+        region: str,
+        profile: Optional[str] = None,
+        opts: Optional[ResourceOptions] = None,
+    ):
+        """
+        Manage a set of entries in a managed prefix list, in as few API calls as possible
+
+        :param resource_name: The name of the resource
+        :param prefix_list_id: ID of the prefix list
+        :param entries: Entries to put in the prefix list, as dictionaries with a ``cidr`` and a ``description``
+        :param region: AWS region of the prefix list
+        :param profile: AWS profile (``~/.aws/config``) of the account owning the prefix list. Uses the default
+            credentials if not set.
+        :param opts: pulumi.ResourceOptions for this resource
+        """
+        props: dict[str, Any] = {
+            "prefix_list_id": prefix_list_id,
+            "entries": entries,
+            "region": region,
+            "profile": profile,
+        }
+        super().__init__(PrefixListEntriesProvider(), resource_name, props, opts)
@@ -21,10 +21,13 @@ use tgw prefix list?
 can't use get_tags for remote resources - must build tags manually (?)
 can't use get_subnets for remote resources - must do it manually
 """
+import time
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from functools import partial
+from typing import Callable, Optional, TypeVar
 
-from pulumi import ResourceOptions, InvokeOptions, log
+from pulumi import Config, ResourceOptions, InvokeOptions, log
 from pulumi_aws import (
     ec2,
     ram,
@@ -34,10 +37,11 @@ from pulumi_aws import (
 )
 
 from infra_thunder.lib.aws.base import AWSModule
-from infra_thunder.lib.config import tag_prefix
+from infra_thunder.lib.config import get_tag_prefix
 from infra_thunder.lib.route_tables import get_route_tables
-from infra_thunder.lib.subnets import get_all_subnets_attributes
+from infra_thunder.lib.subnets import get_subnet_catalogue
 from infra_thunder.lib.tags import get_tags, get_sysenv
+from infra_thunder.lib.utils import run_concurrently
 from infra_thunder.lib.vpc import (
     get_vpc,
     DEFAULT_PREFIX_LIST,
@@ -52,6 +56,22 @@ from .config import (
     TransitGatewayConnectionExport,
     TransitGatewayConfig,
 )
+from .plan_size import format_plan_size_report
+from .prefixlist_entry_provider import PrefixListEntries
+from .types import RoutingMode
+
+T = TypeVar("T")
+
+
+@dataclass
+class RemoteSysenvDiscovery:
+    """What the discovery phase looked up in a remote SysEnv"""
+
+    cidr: str
+    peered_prefixlist: ec2.AwaitableGetManagedPrefixListResult
+    vpc: ec2.AwaitableGetVpcResult
+    primary_subnets: ec2.AwaitableGetSubnetIdsResult
+    route_tables: ec2.AwaitableGetRouteTablesResult
 
 
 @dataclass
@@ -64,6 +84,7 @@ class RemoteAccount:
     peered_prefixlist: Optional[ec2.AwaitableGetManagedPrefixListResult]
     vpc: ec2.AwaitableGetVpcResult
     attachment: Optional[ec2transitgateway.VpcAttachment]
+    route_tables: Optional[ec2.AwaitableGetRouteTablesResult]
 
 
 class TransitGateway(AWSModule):
@@ -79,9 +100,8 @@ class TransitGateway(AWSModule):
         # collect account and account information
         remote_accounts: list[RemoteAccount] = []
 
-        # discover accounts and subnets to be associated with the tgw
-        for connection in config.connections:
-            p = provider.Provider(
+        providers = {
+            connection.sysenv: provider.Provider(
                 f"{connection.sysenv}-provider",
                 profile=connection.profile,
                 # cross-region transit gateways are not supported.
@@ -89,20 +109,20 @@ class TransitGateway(AWSModule):
                 region=self.region,
                 opts=ResourceOptions(parent=tgw),
             )
-            # get the supernet for this sysenv
-            remote_sysenv_cidr = self._get_sysenv_supernet(p, connection)
+            for connection in config.connections
+        }
 
-            # get the peered prefixlist for this sysenv
-            peered_prefixlist = self._get_sysenv_peered_prefixlist(p, connection)
+        # discover accounts and subnets to be associated with the tgw, in every remote sysenv at once
+        discoveries = self._discover_sysenvs(config.connections, providers)
 
-            # fetch the remote vpc
-            remote_vpc = self._get_sysenv_vpc(p, connection)
-
-            # discover the primary private subnets to attach the tgw to
-            primary_subnets = self._get_sysenv_primary_subnet_ids(p, connection, remote_vpc)
+        for connection in config.connections:
+            p = providers[connection.sysenv]
+            discovery = discoveries[connection.sysenv]
+            remote_sysenv_cidr = discovery.cidr
+            remote_vpc = discovery.vpc
 
             # create the transit gateway attachment to the remote vpc's primary private subnets
-            attachment = self._attach_tgw_to_vpc(p, connection, tgw, remote_vpc, primary_subnets, tgw_deps)
+            attachment = self._attach_tgw_to_vpc(p, connection, tgw, remote_vpc, discovery.primary_subnets, tgw_deps)
 
             # add a route to the supernet cidr via this tgw
             ec2transitgateway.Route(
@@ -120,9 +140,10 @@ class TransitGateway(AWSModule):
                     provider=p,
                     profile=connection.profile,
                     cidr=remote_sysenv_cidr,
-                    peered_prefixlist=peered_prefixlist,
+                    peered_prefixlist=discovery.peered_prefixlist,
                     vpc=remote_vpc,
                     attachment=attachment,
+                    route_tables=discovery.route_tables,
                 )
             )
 
@@ -135,9 +156,9 @@ class TransitGateway(AWSModule):
 
         # do we have an any public subnets? if so, use those
         # this allows us to support air-gapped networks (no public subnets, no nat gateways)
-        local_subnets = get_all_subnets_attributes(self.vpc.id)
-        local_public_subnets = list(filter(lambda x: x.tags.get(f"{tag_prefix}role") == "public", local_subnets))
-        local_private_subnets = list(filter(lambda x: x.tags.get(f"{tag_prefix}role") == "private", local_subnets))
+        local_subnets = get_subnet_catalogue(self.vpc.id)
+        local_public_subnets = local_subnets.find(purpose="public")
+        local_private_subnets = local_subnets.find(purpose="private")
         tgw_subnets = local_public_subnets if len(local_public_subnets) > 0 else local_private_subnets
 
         # attach the tgw to the transit account
@@ -150,86 +171,73 @@ class TransitGateway(AWSModule):
             opts=ResourceOptions(parent=self),
         )
 
+        local_route_table_ids = get_route_tables(vpc_id=self.vpc.id).ids
+        local_peered_prefix = get_peered_prefix_list()
+
+        # the local account is a peer of every remote account
+        local_account = RemoteAccount(
+            sysenv=get_sysenv(),
+            connection_config=None,
+            provider=None,
+            profile=None,
+            cidr=local_cidr,
+            peered_prefixlist=local_peered_prefix,
+            vpc=self.vpc,
+            attachment=None,
+            route_tables=None,
+        )
+        peered_accounts_by_sysenv = {
+            account.sysenv: self._get_peered_accounts(account, remote_accounts, local_account)
+            for account in remote_accounts
+        }
+
+        plan_size_report = format_plan_size_report(
+            len(local_route_table_ids),
+            {
+                account.sysenv: (len(account.route_tables.ids), len(peered_accounts_by_sysenv[account.sysenv]))
+                for account in remote_accounts
+            },
+        )
+        log.info(f"routing with `{config.routing_mode.value}`, plan size by routing mode:\n{plan_size_report}", self)
+
         # for every local route table, make routes to every peered CIDR via the transit gateway
-        for route_table_id in get_route_tables(vpc_id=self.vpc.id).ids:
-            for peered_cidr in remote_cidrs:
-                ec2.Route(
-                    f"local-{route_table_id}-tgw-route-{peered_cidr}",
-                    destination_cidr_block=peered_cidr,
-                    transit_gateway_id=tgw.id,
-                    route_table_id=route_table_id,
-                    opts=ResourceOptions(parent=tgw),
-                )
+        self._create_tgw_routes(
+            "local",
+            local_route_table_ids,
+            remote_cidrs,
+            local_peered_prefix,
+            tgw,
+            config.routing_mode,
+            ResourceOptions(parent=tgw),
+        )
 
         # for every remote account, make routes in every remote subnet to all the known peered cidrs
         for account in remote_accounts:
-            # get the list of accounts this account is allowed to peer with, and remove self (don't peer self with self!)
-            peered_accounts = list(
-                filter(
-                    lambda x: x.sysenv in account.connection_config.allowed_sysenvs and x.sysenv != account.sysenv,
-                    remote_accounts,
-                )
-            )
-
-            # add the local account to the list of peered accounts
-            peered_accounts.append(
-                RemoteAccount(
-                    sysenv=get_sysenv(),
-                    connection_config=None,
-                    provider=None,
-                    profile=None,
-                    cidr=local_cidr,
-                    peered_prefixlist=None,
-                    vpc=self.vpc,
-                    attachment=None,
-                )
-            )
+            peered_accounts = peered_accounts_by_sysenv[account.sysenv]
 
             log.warn(
                 f"Allowed sysenvs: [{account.connection_config.allowed_sysenvs}], Peered accounts [{peered_accounts}]",
                 account.provider,
             )
 
-            # Creating a throwaway variable called cidrs for dependency chaining
-            # This is a workaround for error:
-            # IncorrectState: The request cannot be completed while the prefix list (pl-**) is in the current state (modify-in-progress)
-            cidrs = []
-            for peered_account in peered_accounts:
-                cidr = ec2.ManagedPrefixListEntry(
-                    f"{peered_account.sysenv}-{account.sysenv}-peered-prefixlist-entry",
-                    prefix_list_id=account.peered_prefixlist.id,
-                    cidr=peered_account.cidr,
-                    description=f"{peered_account.sysenv} Peered SysEnv",
-                    opts=ResourceOptions(
-                        parent=account.provider,
-                        provider=account.provider,
-                        depends_on=cidrs[-1:],
-                    ),
-                )
-                cidrs.append(cidr)
-
-            local_peered_prefix = get_peered_prefix_list()
-            ec2.ManagedPrefixListEntry(
-                f"{account.sysenv}-local-peered-prefixlist-entry",
-                prefix_list_id=local_peered_prefix.id,
-                cidr=account.cidr,
-                description=f"{account.sysenv} Peered SysEnv",
-                opts=ResourceOptions(parent=self),
+            # add the peered accounts to the remote account's peered prefix list
+            self._create_peered_prefixlist_entries(account, peered_accounts, config.batch_prefix_list_entries)
+
+            # add a route to the transit gateway for the peered accounts in each route table
+            self._create_tgw_routes(
+                account.sysenv,
+                account.route_tables.ids,
+                [peered_account.cidr for peered_account in peered_accounts],
+                account.peered_prefixlist,
+                tgw,
+                config.routing_mode,
+                ResourceOptions(parent=account.provider, provider=account.provider),
             )
 
-            # add a route to the transit gateway for each CIDR in each route table
-            for route_table_id in self._get_sysenv_route_tables(
-                account.provider, account.connection_config, account.vpc
-            ).ids:
-                # add the peered accounts
-                for peered_account in peered_accounts:
-                    ec2.Route(
-                        f"{account.connection_config.sysenv}-{route_table_id}-tgw-route-{peered_account.cidr}",
-                        destination_cidr_block=peered_account.cidr,
-                        transit_gateway_id=tgw.id,
-                        route_table_id=route_table_id,
-                        opts=ResourceOptions(parent=account.provider, provider=account.provider),
-                    )
+        # add the remote accounts to the local peered prefix list
+        self._create_local_peered_prefixlist_entries(
+            remote_accounts, local_peered_prefix, config.batch_prefix_list_entries
+        )
 
         return TransitGatewayExports(
             tgw_id=tgw.id,
@@ -278,20 +286,237 @@ class TransitGateway(AWSModule):
 
         return tgw, [share, ra, pa]
 
+    @staticmethod
+    def _get_peered_accounts(
+        account: RemoteAccount, remote_accounts: list[RemoteAccount], local_account: RemoteAccount
+    ) -> list[RemoteAccount]:
+        # get the list of accounts this account is allowed to peer with, and remove self (don't peer self with self!)
+        peered_accounts = [
+            x
+            for x in remote_accounts
+            if x.sysenv in account.connection_config.allowed_sysenvs and x.sysenv != account.sysenv
+        ]
+
+        # add the local account to the list of peered accounts
+        return peered_accounts + [local_account]
+
+    def _create_peered_prefixlist_entries(
+        self, account: RemoteAccount, peered_accounts: list[RemoteAccount], batch: bool
+    ) -> None:
+        """
+        Add the supernets of the peered accounts to the peered prefix list of a remote account
+
+        :param account: The remote account
+        :param peered_accounts: Accounts the remote account peers with
+        :param batch: Write all the entries at once, with a single resource
+        """
+        if batch:
+            PrefixListEntries(
+                f"{account.sysenv}-peered-prefixlist-entries",
+                prefix_list_id=account.peered_prefixlist.id,
+                entries=[
+                    {"cidr": peered_account.cidr, "description": f"{peered_account.sysenv} Peered SysEnv"}
+                    for peered_account in peered_accounts
+                ],
+                region=self.region,
+                profile=account.profile,
+                opts=ResourceOptions(parent=account.provider),
+            )
+            return
+
+        # Creating a throwaway variable called cidrs for dependency chaining
+        # This is a workaround for error:
+        # IncorrectState: The request cannot be completed while the prefix list (pl-**) is in the current state (modify-in-progress)
+        cidrs = []
+        for peered_account in peered_accounts:
+            cidr = ec2.ManagedPrefixListEntry(
+                f"{peered_account.sysenv}-{account.sysenv}-peered-prefixlist-entry",
+                prefix_list_id=account.peered_prefixlist.id,
+                cidr=peered_account.cidr,
+                description=f"{peered_account.sysenv} Peered SysEnv",
+                opts=ResourceOptions(
+                    parent=account.provider,
+                    provider=account.provider,
+                    depends_on=cidrs[-1:],
+                ),
+            )
+            cidrs.append(cidr)
+
+    def _create_local_peered_prefixlist_entries(
+        self,
+        remote_accounts: list[RemoteAccount],
+        local_peered_prefix: ec2.AwaitableGetManagedPrefixListResult,
+        batch: bool,
+    ) -> None:
+        """
+        Add the supernets of the remote accounts to the local peered prefix list
+
+        :param remote_accounts: The remote accounts
+        :param local_peered_prefix: The local peered prefix list
+        :param batch: Write all the entries at once, with a single resource
+        """
+        if batch:
+            PrefixListEntries(
+                "local-peered-prefixlist-entries",
+                prefix_list_id=local_peered_prefix.id,
+                entries=[
+                    {"cidr": account.cidr, "description": f"{account.sysenv} Peered SysEnv"}
+                    for account in remote_accounts
+                ],
+                region=self.region,
+                profile=Config("aws").get("profile"),
+                opts=ResourceOptions(parent=self),
+            )
+            return
+
+        for account in remote_accounts:
+            ec2.ManagedPrefixListEntry(
+                f"{account.sysenv}-local-peered-prefixlist-entry",
+                prefix_list_id=local_peered_prefix.id,
+                cidr=account.cidr,
+                description=f"{account.sysenv} Peered SysEnv",
+                opts=ResourceOptions(parent=self),
+            )
+
+    @staticmethod
+    def _create_tgw_routes(
+        name: str,
+        route_table_ids: list[str],
+        cidrs: list[str],
+        peered_prefixlist: ec2.AwaitableGetManagedPrefixListResult,
+        tgw: ec2transitgateway.TransitGateway,
+        routing_mode: RoutingMode,
+        opts: ResourceOptions,
+    ) -> None:
+        """
+        Route the peered SysEnvs via the transit gateway in each route table
+
+        :param name: Prefix of the route names
+        :param route_table_ids: Route tables to add the routes to
+        :param cidrs: Supernets of the peered SysEnvs
+        :param peered_prefixlist: Prefix list holding the supernets of the peered SysEnvs
+        :param tgw: The transit gateway
+        :param routing_mode: Route to every supernet, or to the prefix list
+        :param opts: Options for the routes
+        """
+        for route_table_id in route_table_ids:
+            if routing_mode is RoutingMode.PREFIX_LIST:
+                ec2.Route(
+                    f"{name}-{route_table_id}-tgw-route-peered-prefixlist",
+                    destination_prefix_list_id=peered_prefixlist.id,
+                    transit_gateway_id=tgw.id,
+                    route_table_id=route_table_id,
+                    opts=opts,
+                )
+                continue
+
+            for cidr in cidrs:
+                ec2.Route(
+                    f"{name}-{route_table_id}-tgw-route-{cidr}",
+                    destination_cidr_block=cidr,
+                    transit_gateway_id=tgw.id,
+                    route_table_id=route_table_id,
+                    opts=opts,
+                )
+
+    def _discover_sysenvs(
+        self,
+        connections: list[TransitGatewayConnectionConfig],
+        providers: dict[str, provider.Provider],
+    ) -> dict[str, RemoteSysenvDiscovery]:
+        """
+        Look up the supernet, peered prefix list, VPC, primary subnets and route tables of every remote SysEnv.
+
+        The lookups are cross-account round-trips, so they are made concurrently: first everything that only needs
+        the provider, then everything that needs the VPC. Discovery takes about as long as the slowest account.
+
+        Each lookup is timed from its own start. A lookup returns only once the lookups started after it have (see
+        ``run_concurrently``), so the time logged for an account is an upper bound of how long it took.
+
+        :param connections: Remote SysEnvs to discover
+        :param providers: Provider for each remote SysEnv
+        :return: What was discovered, by SysEnv name
+        """
+        start = time.perf_counter()
+        # time of each lookup of each SysEnv and round, from the start of the lookup to its return
+        lookup_times: dict[tuple[str, int], list[float]] = defaultdict(list)
+
+        def timed(sysenv: str, round_: int, call: Callable[[], T]) -> Callable[[], T]:
+            def timed_call() -> T:
+                call_start = time.perf_counter()
+                result = call()
+                lookup_times[(sysenv, round_)].append(time.perf_counter() - call_start)
+                return result
+
+            return timed_call
+
+        found = run_concurrently(
+            {
+                (connection.sysenv, lookup): timed(
+                    connection.sysenv, 0, partial(get, providers[connection.sysenv], connection)
+                )
+                for connection in connections
+                for lookup, get in (
+                    ("cidr", self._get_sysenv_supernet),
+                    ("peered_prefixlist", self._get_sysenv_peered_prefixlist),
+                    ("vpc", self._get_sysenv_vpc),
+                )
+            }
+        )
+        found |= run_concurrently(
+            {
+                (connection.sysenv, lookup): timed(
+                    connection.sysenv,
+                    1,
+                    partial(get, providers[connection.sysenv], connection, found[(connection.sysenv, "vpc")]),
+                )
+                for connection in connections
+                for lookup, get in (
+                    ("primary_subnets", self._get_sysenv_primary_subnet_ids),
+                    ("route_tables", self._get_sysenv_route_tables),
+                )
+            }
+        )
+
+        # the lookups of a round run side by side, and the rounds one after the other
+        elapsed: dict[str, float] = defaultdict(float)
+        for (sysenv, _), times in lookup_times.items():
+            elapsed[sysenv] += max(times)
+
+        for sysenv, seconds in elapsed.items():
+            log.debug(f"discovered remote sysenv `{sysenv}` in {seconds:.2f}s", self)
+        if elapsed:
+            slowest = max(elapsed, key=elapsed.get)
+            log.info(
+                f"discovered {len(elapsed)} remote sysenvs in {time.perf_counter() - start:.2f}s "
+                f"(slowest: `{slowest}`, {elapsed[slowest]:.2f}s)",
+                self,
+            )
+
+        return {
+            connection.sysenv: RemoteSysenvDiscovery(
+                **{
+                    field: found[(connection.sysenv, field)]
+                    for field in ("cidr", "peered_prefixlist", "vpc", "primary_subnets", "route_tables")
+                }
+            )
+            for connection in connections
+        }
+
     def _get_sysenv_supernet(self, provider: provider.Provider, connection: TransitGatewayConnectionConfig) -> str:
         # get the managed prefix list from the resource-shared prefix list
         pl = ec2.get_managed_prefix_list(
             filters=[
                 ec2.GetManagedPrefixListFilterArgs(
-                    name=f"tag:{tag_prefix}service",
+                    name=f"tag:{get_tag_prefix()}service",
                     values=[DEFAULT_PREFIX_LIST],
                 ),
                 ec2.GetManagedPrefixListFilterArgs(
-                    name=f"tag:{tag_prefix}role",
+                    name=f"tag:{get_tag_prefix()}role",
                     values=[SUPERNET],
                 ),
                 ec2.GetManagedPrefixListFilterArgs(
-                    name=f"tag:{tag_prefix}sysenv",
+                    name=f"tag:{get_tag_prefix()}sysenv",
                     values=[connection.sysenv],
                 ),
             ],
@@ -308,15 +533,15 @@ class TransitGateway(AWSModule):
         return ec2.get_managed_prefix_list(
             filters=[
                 ec2.GetManagedPrefixListFilterArgs(
-                    name=f"tag:{tag_prefix}service",
+                    name=f"tag:{get_tag_prefix()}service",
                     values=[PEERED_PREFIX_LIST],
                 ),
                 ec2.GetManagedPrefixListFilterArgs(
-                    name=f"tag:{tag_prefix}role",
+                    name=f"tag:{get_tag_prefix()}role",
                     values=[SUPERNET],
                 ),
                 ec2.GetManagedPrefixListFilterArgs(
-                    name=f"tag:{tag_prefix}sysenv",
+                    name=f"tag:{get_tag_prefix()}sysenv",
                     values=[connection.sysenv],
                 ),
             ],
@@ -330,8 +555,8 @@ class TransitGateway(AWSModule):
         # get the remote sysenv vpc
         return ec2.get_vpc(
             filters=[
-                ec2.GetVpcFilterArgs(name=f"tag:{tag_prefix}service", values=["VPC"]),
-                ec2.GetVpcFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[connection.sysenv]),
+                ec2.GetVpcFilterArgs(name=f"tag:{get_tag_prefix()}service", values=["VPC"]),
+                ec2.GetVpcFilterArgs(name=f"tag:{get_tag_prefix()}sysenv", values=[connection.sysenv]),
             ],
             opts=InvokeOptions(parent=self, provider=provider),
         )
@@ -348,8 +573,8 @@ class TransitGateway(AWSModule):
         return ec2.get_subnet_ids(
             vpc_id=vpc.id,
             filters=[
-                ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[connection.sysenv]),
-                ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}role", values=["private"]),
+                ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}sysenv", values=[connection.sysenv]),
+                ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}role", values=["private"]),
             ],
             opts=InvokeOptions(parent=self, provider=provider),
         )
@@ -363,7 +588,7 @@ class TransitGateway(AWSModule):
         return ec2.get_route_tables(
             vpc_id=vpc.id,
             filters=[
-                ec2.GetSubnetIdsFilterArgs(name=f"tag:{tag_prefix}sysenv", values=[connection.sysenv]),
+                ec2.GetSubnetIdsFilterArgs(name=f"tag:{get_tag_prefix()}sysenv", values=[connection.sysenv]),
             ],
             opts=InvokeOptions(parent=self, provider=provider),
         )
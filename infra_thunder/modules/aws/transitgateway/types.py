@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class RoutingMode(Enum):
+    CIDR_ROUTES = "cidr_routes"
+    """Every route table gets one route per peered SysEnv supernet. Route count grows with route tables × peers"""
+
+    PREFIX_LIST = "prefix_list"
+    """Every route table gets a single route to its SysEnv's peered supernets prefix list, which holds the peered
+    supernets. Route count grows with route tables only"""
@@ -1,11 +1,66 @@
+from functools import partial
+
 from pulumi import ResourceOptions, ComponentResource
 from pulumi_azure_native import managedidentity
 
-from infra_thunder.lib.kubernetes.personalizers import *
+from infra_thunder.lib.kubernetes.personalizers import (
+    Charts,
+    CrossClusterServiceAccount,
+    KubeletCSRRenewal,
+    KubeletRolebinding,
+    KubeMetrics,
+    MonitoringRoles,
+    Namespaces,
+    NodeSecretsRole,
+    Personalizer,
+    PersonalizerRegistry,
+    Traefik,
+)
 from .config import K8sControllerConfig
 from .personalizers import AADNodeBoostrapper
 
 
+def _configure_namespaces(cluster_config: K8sControllerConfig, opts: ResourceOptions):
+    # default namespaces are gated in the component
+    Namespaces("namespaces", extra_namespaces=cluster_config.extra_namespaces, opts=opts)
+
+
+personalizers = PersonalizerRegistry(
+    [
+        # Configure apiserver -> kubelet ClusterRoleBinding
+        Personalizer("kubelet-rolebinding", partial(KubeletRolebinding, "kubelet-rolebinding"), inputs=("opts",)),
+        # Configure rolebinding to allow kubelets to renew their serving certificates
+        Personalizer("kubelet-csr-renewal", partial(KubeletCSRRenewal, "kubelet-csr-renewal"), inputs=("opts",)),
+        # Allow nodes to bootstrap
+        Personalizer(
+            "aad-node-boostrapper",
+            partial(AADNodeBoostrapper, "aad-node-boostrapper"),
+            inputs=("bootstrap_msi", "opts"),
+        ),
+        # Configure rolebinding to allow kubelets to read node secrets
+        Personalizer("node-secrets-role", partial(NodeSecretsRole, "node-secrets-role"), inputs=("opts",)),
+        # Configure monitoring roles
+        Personalizer("monitoring-roles", partial(MonitoringRoles, "monitoring-roles"), inputs=("opts",)),
+        # configure a cross-cluster admin account (used by ArgoCD)
+        Personalizer(
+            "cross-cluster-serviceaccount",
+            partial(CrossClusterServiceAccount, "cross-cluster-serviceaccount"),
+            inputs=("opts",),
+        ),
+        # Configure Kubernetes Metrics Server
+        Personalizer("kube-metrics", partial(KubeMetrics, "kube-metrics"), inputs=("opts",)),
+        # TODO: install Cilium as the CNI, then CoreDNS - which must be done AFTER the CNI
+        # Install Traefik as the Ingress provider
+        Personalizer("traefik", partial(Traefik, "traefik"), inputs=("opts",)),
+        Personalizer("namespaces", _configure_namespaces, inputs=("cluster_config", "opts")),
+        # Configure default deployments
+        Personalizer("charts", partial(Charts, "charts", extra_charts=[]), inputs=("opts",)),
+        # TODO: install the DD cluster agent
+    ]
+)
+"""Personalizers of Azure clusters. Those without dependencies between them are created concurrently."""
+
+
 class AzureClusterPersonalizer(ComponentResource):
     def __init__(
         self,
@@ -22,76 +77,15 @@ class AzureClusterPersonalizer(ComponentResource):
     ):
         super().__init__(f"pkg:thunder:azure:{self.__class__.__name__.lower()}", name, None, opts)
 
-        common_opts = ResourceOptions(parent=self)
-
-        # Configure apiserver -> kubelet ClusterRoleBinding
-        KubeletRolebinding("kubelet-rolebinding", opts=common_opts)
-
-        # Configure rolebinding to allow kubelets to renew their serving certificates
-        KubeletCSRRenewal("kubelet-csr-renewal", opts=common_opts)
-
-        # Allow nodes to bootstrap
-        AADNodeBoostrapper("aad-node-boostrapper", bootstrap_msi=bootstrap_msi, opts=common_opts)
-
-        # Configure rolebinding to allow kubelets to read node secrets
-        NodeSecretsRole("node-secrets-role", opts=common_opts)
-
-        # Configure monitoring roles
-        MonitoringRoles("monitoring-roles", opts=common_opts)
-
-        # configure a cross-cluster admin account (used by ArgoCD)
-        CrossClusterServiceAccount("cross-cluster-serviceaccount", opts=common_opts)
-
-        # AzureAADRoles(
-        #     "azure-aad-roles",
-        #     bootstrap_role=bootstrap_role,
-        #     user_roles=user_roles,
-        #     opts=common_opts
-        # )
-
-        # Configure Kubernetes Metrics Server
-        KubeMetrics("kube-metrics", opts=common_opts)
-
-        # Install Cilium as the CNI
-        # TODO: support different CNIs?
-        # AzureCiliumCNI(
-        #     "azure-cilium-cni",
-        #     endpoint=endpoint_name,
-        #     opts=common_opts
-        # )
-
-        # Install CoreDNS - this must be done AFTER the CNI
-        # CoreDNS(
-        #     "coredns",
-        #     cluster_domain=cluster_domain,
-        #     coredns_clusterip=coredns_clusterip,
-        #     opts=common_opts
-        # )
-
-        # Install Traefik as the Ingress provider
-        Traefik("traefik", opts=common_opts)
-
-        # Enable Azure Disk CSI
-        # AzureDiskCSI(**common_args)
-
-        # Configure namespaces (default namespaces are gated in the function)
-        Namespaces(
-            "namespaces",
-            extra_namespaces=cluster_config.extra_namespaces,
-            opts=common_opts,
+        personalizers.run(
+            {
+                "opts": ResourceOptions(parent=self),
+                "cluster_config": cluster_config,
+                "cluster_name": cluster_name,
+                "cluster_domain": cluster_domain,
+                "endpoint_name": endpoint_name,
+                "coredns_clusterip": coredns_clusterip,
+                "bootstrap_msi": bootstrap_msi,
+            },
+            graph_name=cluster_name,
         )
-
-        # Configure default deployments
-        Charts(
-            "charts",
-            # extra_charts=cluster_config.extra_charts,
-            extra_charts=[],
-            opts=common_opts,
-        )
-
-        # Install the DD cluster agent
-        # DatadogClusterAgent(
-        #     "datadog-cluster-agent",
-        #     cluster_name=cluster_name,
-        #     opts=common_opts
-        # )
@@ -14,7 +14,7 @@ from infra_thunder.lib.config import (
     get_sysenv,
     get_stack,
     get_public_sysenv_domain,
-    tag_namespace,
+    get_tag_namespace,
 )
 from infra_thunder.lib.kubernetes.kubeconfig import generate_admin_kubeconfig
 from infra_thunder.lib.tags import get_tags
@@ -41,7 +41,7 @@ from .vmss import create_vmss
 class K8sControllers(AzureModule):
     def build(self, config: K8sControllerConfig) -> K8sControllerExports:
         cluster_name = get_sysenv()
-        cluster_domain = f"{cluster_name}.{tag_namespace}"
+        cluster_domain = f"{cluster_name}.{get_tag_namespace()}"
 
         # Create component resource to group things together
         cluster_component = ComponentResource(
@@ -0,0 +1,144 @@
+import ipaddress
+
+import pytest
+from moto import mock_aws
+
+from infra_thunder.modules.aws.transitgateway.prefixlist_entry_provider import PrefixListEntriesProvider
+from infra_thunder.modules.aws.transitgateway.prefixlist_entry_provider.prefixlist_entries import (
+    MAX_ENTRIES_PER_MODIFICATION,
+    _get_client,
+    _get_entries,
+    _wait_for_prefix_list,
+    modify_prefix_list_entries,
+)
+
+REGION = "us-east-1"
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    for variable in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SECURITY_TOKEN", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(variable, "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+
+
+@pytest.fixture
+def client():
+    with mock_aws():
+        yield _get_client({"region": REGION})
+
+
+@pytest.fixture
+def prefix_list_id(client) -> str:
+    prefix_list = client.create_managed_prefix_list(
+        PrefixListName="supernets",
+        AddressFamily="IPv4",
+        MaxEntries=1000,
+        Entries=[{"Cidr": "192.168.0.0/16", "Description": "not managed"}],
+    )
+    return prefix_list["PrefixList"]["PrefixListId"]
+
+
+def _props(prefix_list_id: str, entries: dict[str, str]) -> dict:
+    return {
+        "prefix_list_id": prefix_list_id,
+        "entries": [{"cidr": cidr, "description": description} for cidr, description in entries.items()],
+        "region": REGION,
+        "profile": None,
+    }
+
+
+def _read(client, prefix_list_id: str) -> dict[str, str]:
+    return _get_entries(client, prefix_list_id, _wait_for_prefix_list(client, prefix_list_id)["Version"])
+
+
+def _is_covered(client, prefix_list_id: str, version: int, cidr: str) -> bool:
+    entries = _get_entries(client, prefix_list_id, version)
+    covering = ipaddress.collapse_addresses(ipaddress.ip_network(entry) for entry in entries)
+    return any(ipaddress.ip_network(cidr).subnet_of(network) for network in covering)
+
+
+def _cidrs(count: int) -> dict[str, str]:
+    return {f"10.{i // 256}.{i % 256}.0/24": f"sysenv-{i}" for i in range(count)}
+
+
+def test_create(client, prefix_list_id):
+    entries = {"10.0.0.0/16": "sysenv-a", "10.1.0.0/16": "sysenv-b"}
+
+    result = PrefixListEntriesProvider().create(_props(prefix_list_id, entries))
+
+    assert result.id == prefix_list_id
+    assert _read(client, prefix_list_id) == {"192.168.0.0/16": "not managed", **entries}
+
+
+def test_update(client, prefix_list_id):
+    provider = PrefixListEntriesProvider()
+    olds = _props(prefix_list_id, {"10.0.0.0/16": "sysenv-a", "10.1.0.0/16": "sysenv-b"})
+    provider.create(olds)
+    news = _props(prefix_list_id, {"10.1.0.0/16": "sysenv-b renamed", "10.2.0.0/16": "sysenv-c"})
+
+    assert provider.diff(prefix_list_id, olds, news).changes
+    provider.update(prefix_list_id, olds, news)
+
+    assert _read(client, prefix_list_id) == {
+        "192.168.0.0/16": "not managed",
+        "10.1.0.0/16": "sysenv-b renamed",
+        "10.2.0.0/16": "sysenv-c",
+    }
+
+
+def test_delete(client, prefix_list_id):
+    provider = PrefixListEntriesProvider()
+    props = _props(prefix_list_id, {"10.0.0.0/16": "sysenv-a", "10.1.0.0/16": "sysenv-b"})
+    provider.create(props)
+
+    provider.delete(prefix_list_id, props)
+
+    assert _read(client, prefix_list_id) == {"192.168.0.0/16": "not managed"}
+
+
+def test_diff_over_max_entries_per_modification(client, prefix_list_id):
+    provider = PrefixListEntriesProvider()
+    olds = _props(prefix_list_id, _cidrs(MAX_ENTRIES_PER_MODIFICATION))
+    provider.create(olds)
+    entries = _cidrs(2 * MAX_ENTRIES_PER_MODIFICATION + 1)
+
+    assert provider.diff(prefix_list_id, olds, _props(prefix_list_id, entries)).changes
+    calls = modify_prefix_list_entries(client, prefix_list_id, entries, set(_cidrs(MAX_ENTRIES_PER_MODIFICATION)))
+
+    # the 101 entries to add take two calls
+    assert calls == 2
+    assert _read(client, prefix_list_id) == {"192.168.0.0/16": "not managed", **entries}
+
+
+def test_description_change_keeps_cidr_in_prefix_list(client, prefix_list_id):
+    provider = PrefixListEntriesProvider()
+    olds = _props(prefix_list_id, {"10.0.0.0/16": "sysenv-a", "10.1.0.0/16": "sysenv-b"})
+    provider.create(olds)
+    first_version = _wait_for_prefix_list(client, prefix_list_id)["Version"]
+
+    calls = modify_prefix_list_entries(
+        client, prefix_list_id, {"10.0.0.0/16": "sysenv-a", "10.1.0.0/16": "sysenv-b renamed"}, {"10.1.0.0/16"}
+    )
+
+    # swapped for its halves, then back
+    assert calls == 2
+    last_version = _wait_for_prefix_list(client, prefix_list_id)["Version"]
+    for version in range(first_version, last_version + 1):
+        assert _is_covered(client, prefix_list_id, version, "10.1.0.0/16")
+    assert _read(client, prefix_list_id) == {
+        "192.168.0.0/16": "not managed",
+        "10.0.0.0/16": "sysenv-a",
+        "10.1.0.0/16": "sysenv-b renamed",
+    }
+
+
+def test_description_change_without_room_keeps_description(client):
+    prefix_list_id = client.create_managed_prefix_list(
+        PrefixListName="full", AddressFamily="IPv4", MaxEntries=1, Entries=[{"Cidr": "10.0.0.0/16", "Description": "a"}]
+    )["PrefixList"]["PrefixListId"]
+
+    calls = modify_prefix_list_entries(client, prefix_list_id, {"10.0.0.0/16": "b"}, {"10.0.0.0/16"})
+
+    assert calls == 0
+    assert _read(client, prefix_list_id) == {"10.0.0.0/16": "a"}
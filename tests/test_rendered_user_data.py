@@ -0,0 +1,34 @@
+import os
+
+import pulumi
+import pytest
+
+from infra_thunder.lib.config import get_provider_and_region
+from infra_thunder.lib.user_data.rendered_user_data import (
+    AZURE_CUSTOM_DATA_LIMIT,
+    RenderedUserData,
+    UserDataTooLargeException,
+)
+
+
+@pytest.fixture
+def azure_config():
+    pulumi.runtime.set_all_config({"azure-native:location": "eastus"})
+    yield
+    pulumi.runtime.set_all_config({})
+
+
+def test_oversized_azure_payload_is_rejected(azure_config):
+    provider, _ = get_provider_and_region()
+    # random bytes don't compress, so the gzipped archive is over the limit too
+    rendered = RenderedUserData(os.urandom(AZURE_CUSTOM_DATA_LIMIT).hex(), {"user_data.sh": AZURE_CUSTOM_DATA_LIMIT})
+
+    for compressed in (False, True):
+        with pytest.raises(UserDataTooLargeException, match="over the az limit"):
+            rendered.check_size("nodegroup", provider, compressed)
+
+
+def test_azure_payload_within_limit_is_accepted(azure_config):
+    provider, _ = get_provider_and_region()
+
+    RenderedUserData("x" * AZURE_CUSTOM_DATA_LIMIT).check_size("nodegroup", provider, compressed=False)
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from infra_thunder.lib.security_groups import SecurityGroupIngressRule
+from infra_thunder.lib.security_groups import rule_compiler
+from infra_thunder.lib.security_groups.rule_compiler import compile_ingress_rules
+
+VPC_SUPERNET = "10.1.0.0/16"
+
+
+@pytest.fixture(autouse=True)
+def prefix_lists(monkeypatch):
+    def get_prefix_list(pl_id: str, *cidrs: str):
+        prefix_list = SimpleNamespace(id=pl_id, entries=[SimpleNamespace(cidr=cidr) for cidr in cidrs], max_entries=1)
+        return lambda: prefix_list
+
+    monkeypatch.setattr(rule_compiler, "get_prefix_list", get_prefix_list("pl-vpc", VPC_SUPERNET))
+    monkeypatch.setattr(rule_compiler, "get_peered_prefix_list", get_prefix_list("pl-peered", "10.2.0.0/16"))
+
+
+def test_subsuming_rule_keeps_its_index():
+    rules = [
+        SecurityGroupIngressRule("https", 443, 443, "tcp", cidr_blocks=["10.3.0.0/16"]),
+        SecurityGroupIngressRule("all ports", 0, 65535, "tcp", cidr_blocks=["10.3.0.0/16"]),
+    ]
+
+    compiled = compile_ingress_rules(rules)
+
+    assert list(compiled) == [1]
+    assert (compiled[1].from_port, compiled[1].to_port, compiled[1].cidr_blocks) == (0, 65535, ["10.3.0.0/16"])
+
+
+def test_collapsed_rule_keeps_index_of_prefix_list_rule():
+    rules = [
+        SecurityGroupIngressRule("https from cidr", 443, 443, "tcp", cidr_blocks=[VPC_SUPERNET]),
+        SecurityGroupIngressRule("https from vpc", 443, 443, "tcp", allow_vpc_supernet=True),
+    ]
+
+    compiled = compile_ingress_rules(rules)
+
+    assert list(compiled) == [1]
+    assert compiled[1].allow_vpc_supernet and not compiled[1].cidr_blocks
+
+
+def test_merged_rule_without_equal_rule_takes_first_index():
+    rules = [
+        SecurityGroupIngressRule("dns", 53, 53, "udp", cidr_blocks=["10.3.0.0/16"]),
+        SecurityGroupIngressRule("http", 80, 80, "tcp", cidr_blocks=["10.3.0.0/16"]),
+        SecurityGroupIngressRule("http-alt", 81, 81, "tcp", cidr_blocks=["10.3.0.0/16"]),
+    ]
+
+    compiled = compile_ingress_rules(rules)
+
+    assert list(compiled) == [0, 1]
+    assert (compiled[1].from_port, compiled[1].to_port) == (80, 81)
+
+
+def test_peered_supernets_are_not_collapsed():
+    rules = [SecurityGroupIngressRule("https from peers", 443, 443, "tcp", cidr_blocks=["10.2.0.0/16"])]
+
+    compiled = compile_ingress_rules(rules)
+
+    assert compiled[0].cidr_blocks == ["10.2.0.0/16"]
+    assert not compiled[0].allow_peered_supernets